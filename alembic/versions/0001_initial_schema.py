@@ -0,0 +1,121 @@
+"""initial schema
+
+Matches the tables previously created by Base.metadata.create_all at import.
+Databases created that way should be stamped with `alembic stamp 0001`
+before running `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 18:40:44.978677
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('ADMIN', 'USER', name='userrole'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('properties',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('slug', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('property_type', sa.Enum('BUY', 'SELL', 'RENT', name='propertytype'), nullable=False),
+    sa.Column('status', sa.Enum('AVAILABLE', 'SOLD', 'RENTED', 'PENDING', name='propertystatus'), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('zip_code', sa.String(length=10), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('bedrooms', sa.Integer(), nullable=True),
+    sa.Column('bathrooms', sa.Integer(), nullable=True),
+    sa.Column('area', sa.Integer(), nullable=True),
+    sa.Column('parking', sa.Boolean(), nullable=True),
+    sa.Column('furnished', sa.Boolean(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_special_offer', sa.Boolean(), nullable=True),
+    sa.Column('offer_text', sa.String(length=200), nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_properties_city'), 'properties', ['city'], unique=False)
+    op.create_index(op.f('ix_properties_id'), 'properties', ['id'], unique=False)
+    op.create_index(op.f('ix_properties_is_featured'), 'properties', ['is_featured'], unique=False)
+    op.create_index(op.f('ix_properties_property_type'), 'properties', ['property_type'], unique=False)
+    op.create_index(op.f('ix_properties_slug'), 'properties', ['slug'], unique=True)
+    op.create_index(op.f('ix_properties_status'), 'properties', ['status'], unique=False)
+    op.create_index(op.f('ix_properties_title'), 'properties', ['title'], unique=False)
+    op.create_table('contact_inquiries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contact_inquiries_id'), 'contact_inquiries', ['id'], unique=False)
+    op.create_table('property_images',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('public_id', sa.String(length=255), nullable=True),
+    sa.Column('caption', sa.String(length=200), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_property_images_id'), 'property_images', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_property_images_id'), table_name='property_images')
+    op.drop_table('property_images')
+    op.drop_index(op.f('ix_contact_inquiries_id'), table_name='contact_inquiries')
+    op.drop_table('contact_inquiries')
+    op.drop_index(op.f('ix_properties_title'), table_name='properties')
+    op.drop_index(op.f('ix_properties_status'), table_name='properties')
+    op.drop_index(op.f('ix_properties_slug'), table_name='properties')
+    op.drop_index(op.f('ix_properties_property_type'), table_name='properties')
+    op.drop_index(op.f('ix_properties_is_featured'), table_name='properties')
+    op.drop_index(op.f('ix_properties_id'), table_name='properties')
+    op.drop_index(op.f('ix_properties_city'), table_name='properties')
+    op.drop_table('properties')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    bind = op.get_bind()
+    for enum_name in ('propertystatus', 'propertytype', 'userrole'):
+        sa.Enum(name=enum_name).drop(bind, checkfirst=True)
@@ -0,0 +1,32 @@
+"""inquiry inbox indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 18:41:02.114530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contact_inquiries_created_at', 'contact_inquiries', ['created_at'], unique=False)
+    op.create_index('ix_contact_inquiries_is_read_created_at', 'contact_inquiries', ['is_read', 'created_at'], unique=False)
+    op.create_index('ix_contact_inquiries_property_id_created_at', 'contact_inquiries', ['property_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_inquiries_property_id_created_at', table_name='contact_inquiries')
+    op.drop_index('ix_contact_inquiries_is_read_created_at', table_name='contact_inquiries')
+    op.drop_index('ix_contact_inquiries_created_at', table_name='contact_inquiries')
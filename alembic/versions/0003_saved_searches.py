@@ -0,0 +1,65 @@
+"""saved searches
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 19:03:58.796201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('saved_searches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    # The propertytype enum already exists (0001)
+    sa.Column('property_type', postgresql.ENUM('BUY', 'SELL', 'RENT', name='propertytype', create_type=False), nullable=True),
+    sa.Column('min_price', sa.Float(), nullable=True),
+    sa.Column('max_price', sa.Float(), nullable=True),
+    sa.Column('min_bedrooms', sa.Integer(), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('search', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_saved_searches_id'), 'saved_searches', ['id'], unique=False)
+    op.create_index(op.f('ix_saved_searches_user_id'), 'saved_searches', ['user_id'], unique=False)
+    op.create_table('search_notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('saved_search_id', 'property_id', name='uq_search_notifications_search_property')
+    )
+    op.create_index(op.f('ix_search_notifications_id'), 'search_notifications', ['id'], unique=False)
+    op.create_index('ix_search_notifications_user_id_is_read_id', 'search_notifications', ['user_id', 'is_read', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_search_notifications_user_id_is_read_id', table_name='search_notifications')
+    op.drop_index(op.f('ix_search_notifications_id'), table_name='search_notifications')
+    op.drop_table('search_notifications')
+    op.drop_index(op.f('ix_saved_searches_user_id'), table_name='saved_searches')
+    op.drop_index(op.f('ix_saved_searches_id'), table_name='saved_searches')
+    op.drop_table('saved_searches')
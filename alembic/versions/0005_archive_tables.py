@@ -0,0 +1,95 @@
+"""archive tables
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 19:21:08.120306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_properties',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('slug', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    # The propertytype and propertystatus enums already exist (0001)
+    sa.Column('property_type', postgresql.ENUM('BUY', 'SELL', 'RENT', name='propertytype', create_type=False), nullable=False),
+    sa.Column('status', postgresql.ENUM('AVAILABLE', 'SOLD', 'RENTED', 'PENDING', name='propertystatus', create_type=False), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('zip_code', sa.String(length=10), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('bedrooms', sa.Integer(), nullable=True),
+    sa.Column('bathrooms', sa.Integer(), nullable=True),
+    sa.Column('area', sa.Integer(), nullable=True),
+    sa.Column('parking', sa.Boolean(), nullable=True),
+    sa.Column('furnished', sa.Boolean(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_special_offer', sa.Boolean(), nullable=True),
+    sa.Column('offer_text', sa.String(length=200), nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_properties_slug'), 'archived_properties', ['slug'], unique=True)
+    op.create_table('archived_contact_inquiries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['archived_properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_contact_inquiries_property_id'), 'archived_contact_inquiries', ['property_id'], unique=False)
+    op.create_table('archived_property_images',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('public_id', sa.String(length=255), nullable=True),
+    sa.Column('caption', sa.String(length=200), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['archived_properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_property_images_property_id'), 'archived_property_images', ['property_id'], unique=False)
+    # Archiving deletes properties in bulk; their children are found through these
+    op.create_index(op.f('ix_property_images_property_id'), 'property_images', ['property_id'], unique=False)
+    op.create_index('ix_search_notifications_property_id', 'search_notifications', ['property_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_search_notifications_property_id', table_name='search_notifications')
+    op.drop_index(op.f('ix_property_images_property_id'), table_name='property_images')
+    op.drop_index(op.f('ix_archived_property_images_property_id'), table_name='archived_property_images')
+    op.drop_table('archived_property_images')
+    op.drop_index(op.f('ix_archived_contact_inquiries_property_id'), table_name='archived_contact_inquiries')
+    op.drop_table('archived_contact_inquiries')
+    op.drop_index(op.f('ix_archived_properties_slug'), table_name='archived_properties')
+    op.drop_table('archived_properties')
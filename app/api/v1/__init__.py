@@ -4,10 +4,16 @@ from .properties import router as properties_router
 from .auth import router as auth_router
 from .upload import router as upload_router
 from .inquiries import router as inquiries_router
+from .admin import router as admin_router
+from .stats import router as stats_router
+from .saved_searches import router as saved_searches_router
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router)
 api_router.include_router(properties_router)
 api_router.include_router(upload_router)
-api_router.include_router(inquiries_router)
\ No newline at end of file
+api_router.include_router(inquiries_router)
+api_router.include_router(admin_router)
+api_router.include_router(stats_router)
+api_router.include_router(saved_searches_router)
\ No newline at end of file
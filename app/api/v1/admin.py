@@ -0,0 +1,27 @@
+# app/api/v1/admin.py
+from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+from ...dependencies import get_current_admin_user
+from ...models.user import User
+from ...core.archival import listing_archiver
+from ...core.slow_query import slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/slow-queries")
+def list_slow_queries(current_user: User = Depends(get_current_admin_user)):
+    """Recent slow statements with redacted parameters and query plans, newest first"""
+    return slow_query_log.snapshot()
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: User = Depends(get_current_admin_user)):
+    """Empty the slow-query ring buffer"""
+    slow_query_log.clear()
+
+@router.post("/archive")
+def archive_listings(
+    after_days: Optional[int] = Query(None, ge=0, description="Defaults to ARCHIVE_AFTER_DAYS"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Move sold and rented listings unchanged for `after_days` into the archive tables now"""
+    return listing_archiver.run(after_days=after_days)
@@ -1,35 +1,66 @@
 # app/api/v1/inquiries.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
-from ...database import get_db
-from ...schemas.inquiry import InquiryCreate, InquiryResponse
-from ...models.inquiry import ContactInquiry
+from typing import List, Optional
+from ...database import get_db, get_read_db
+from ...schemas.inquiry import InquiryCreate, InquiryResponse, InquiryBulkRead, UnreadCount
+from ...crud import inquiry as crud_inquiry
+from ...core.inquiry_buffer import inquiry_buffer
 from ...dependencies import get_current_active_user, get_current_admin_user
 
 router = APIRouter(prefix="/inquiries", tags=["Inquiries"])
 
-@router.post("/", response_model=InquiryResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=InquiryResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"description": "Inquiry queued for buffered insert"}}
+)
 def create_inquiry(inquiry: InquiryCreate, db: Session = Depends(get_db)):
     """Create contact inquiry (public endpoint)"""
-    db_inquiry = ContactInquiry(**inquiry.model_dump())
-    db.add(db_inquiry)
-    db.commit()
-    db.refresh(db_inquiry)
-    return db_inquiry
+    if inquiry_buffer.enabled and inquiry_buffer.submit(inquiry.model_dump()):
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"message": "Inquiry received"}
+        )
+    return crud_inquiry.create_inquiry(db, inquiry)
 
 @router.get("/", response_model=List[InquiryResponse])
 def list_inquiries(
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    is_read: Optional[bool] = None,
+    property_id: Optional[int] = None,
+    current_user = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get all inquiries, newest first (Admin only)"""
+    return crud_inquiry.get_inquiries(
+        db,
+        skip=skip,
+        limit=limit,
+        is_read=is_read,
+        property_id=property_id
+    )
+
+@router.get("/unread-count", response_model=UnreadCount)
+def get_unread_count(
+    current_user = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Number of unread inquiries (Admin only)"""
+    return {"unread": crud_inquiry.get_unread_count(db)}
+
+@router.patch("/read")
+def mark_inquiries_as_read(
+    selection: InquiryBulkRead,
     current_user = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get all inquiries (Admin only)"""
-    inquiries = db.query(ContactInquiry).order_by(
-        ContactInquiry.created_at.desc()
-    ).offset(skip).limit(limit).all()
-    return inquiries
+    """Mark many inquiries as read in a single statement (Admin only)"""
+    updated = crud_inquiry.mark_as_read(db, ids=selection.ids, before=selection.before)
+    return {"message": "Inquiries marked as read", "updated": updated}
 
 @router.patch("/{inquiry_id}/read")
 def mark_inquiry_as_read(
@@ -38,15 +69,12 @@ def mark_inquiry_as_read(
     db: Session = Depends(get_db)
 ):
     """Mark inquiry as read (Admin only)"""
-    inquiry = db.query(ContactInquiry).filter(ContactInquiry.id == inquiry_id).first()
-    if not inquiry:
+    updated = crud_inquiry.mark_as_read(db, ids=[inquiry_id])
+    if not updated and not crud_inquiry.inquiry_exists(db, inquiry_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Inquiry not found"
         )
-    
-    inquiry.is_read = True
-    db.commit()
     return {"message": "Inquiry marked as read"}
 
 
@@ -1,24 +1,67 @@
 # app/api/v1/properties.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...database import get_db
+from ...database import get_db, get_read_db
 from ...schemas.property import (
     PropertyCreate,
     PropertyUpdate,
     PropertyResponse,
     PropertyListResponse,
+    HomeSnapshotResponse,
+    PropertyBatchResponse,
+    PropertyBulkAction,
+    PropertyBulkResult,
+    PropertyPatch,
+    PropertyPatchResponse,
     PropertyType,
     PropertyStatus
 )
-from ...crud import property as crud_property
+from ...crud import archive as crud_archive, property as crud_property
 from ...dependencies import get_current_active_user, get_current_admin_user
 from ...models.user import User
+from ...models.property import Property
+from ...config import settings
+from ...core.response_cache import response_cache
+from ...core.home_snapshot import home_snapshot
+from ...core.listing_index import listing_index
+from ...core.listing_stream import StreamFilter, listing_broker
+from ...core.similar import COLUMNS as SIMILARITY_COLUMNS, similarity_index
+from ...core.http_cache import (
+    cache_headers, detail_keys, detail_policy, if_match_version, listing_keys, listing_policy, property_etag
+)
+from ...utils.serializers import (
+    LIST_FIELDS, serialize_archived_property, serialize_list_fields, serialize_property,
+    serialize_property_list_item, serialize_property_row
+)
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
+# What a listing reads by default: the `PropertyListResponse` columns, never description and the like
+LIST_COLUMNS = [getattr(Property, field) for field in LIST_FIELDS if field != "thumbnail"]
+
+def _listing_projection(fields: Optional[str]):
+    """Requested listing fields (all when None) and the columns to read; id and city always, for cache tags"""
+    if fields is None:
+        return LIST_FIELDS, LIST_COLUMNS
+    requested = set(_split_values([fields])) | {"id"}
+    unknown = requested - set(LIST_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}; available: {', '.join(LIST_FIELDS)}"
+        )
+    selected = tuple(field for field in LIST_FIELDS if field in requested)
+    columns = [getattr(Property, field) for field in selected if field != "thumbnail"]
+    if "city" not in requested:
+        columns.append(Property.city)
+    return selected, columns
+
 @router.get("/", response_model=List[PropertyListResponse])
 def list_properties(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     property_type: Optional[PropertyType] = None,
@@ -28,11 +71,21 @@ def list_properties(
     city: Optional[str] = None,
     search: Optional[str] = None,
     is_featured: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    is_special_offer: Optional[bool] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated subset of the listing fields to return; `id` is always included"
+    ),
+    db: Session = Depends(get_read_db)
 ):
     """Get list of properties with filters"""
-    properties = crud_property.get_properties(
-        db=db,
+    cached = response_cache.lookup(request)
+    if cached:
+        return cached.response(request)
+
+    selected, columns = _listing_projection(fields)
+    with_images = "thumbnail" in selected
+
+    filters = dict(
         skip=skip,
         limit=limit,
         property_type=property_type,
@@ -40,49 +93,215 @@ def list_properties(
         max_price=max_price,
         min_bedrooms=min_bedrooms,
         city=city,
-        search=search,
-        is_featured=is_featured
+        is_featured=is_featured,
+        is_special_offer=is_special_offer
     )
+    if listing_index.enabled and not search:
+        properties = listing_index.get_properties(db, columns=columns, with_images=with_images, **filters)
+    else:
+        properties = crud_property.get_properties(
+            db=db, search=search, columns=columns, with_images=with_images, **filters
+        )
     
     # Add thumbnail to each property
-    result = []
-    for prop in properties:
-        prop_dict = PropertyListResponse.model_validate(prop).model_dump()
-        if prop.images:
-            prop_dict['thumbnail'] = prop.images[0].url
-        result.append(PropertyListResponse(**prop_dict))
+    if fields is None:
+        result = [
+            serialize_property_list_item(prop, thumbnail=prop.images[0].url if prop.images else None)
+            for prop in properties
+        ]
+    else:
+        result = [
+            serialize_list_fields(
+                prop, selected, thumbnail=prop.images[0].url if with_images and prop.images else None
+            )
+            for prop in properties
+        ]
     
-    return result
+    keys = listing_keys({"id": prop.id, "city": prop.city} for prop in properties)
+    return response_cache.respond(
+        request, result, headers=cache_headers(request, listing_policy(), keys)
+    )
+
+def _split_values(values: Optional[List[str]]) -> List[str]:
+    """`?ids=1,2&ids=3` style query values, comma-separated or repeated, deduplicated in order"""
+    seen = {}
+    for value in values or []:
+        for part in value.split(","):
+            part = part.strip()
+            if part:
+                seen[part] = None
+    return list(seen)
+
+@router.get("/batch", response_model=PropertyBatchResponse)
+def get_properties_batch(
+    request: Request,
+    ids: Optional[List[str]] = Query(None, description="Property ids, comma-separated or repeated"),
+    slugs: Optional[List[str]] = Query(None, description="Property slugs, comma-separated or repeated"),
+    db: Session = Depends(get_read_db)
+):
+    """Several properties with their images in request order, e.g. for favorites and compare views"""
+    keys = _split_values(ids) or _split_values(slugs)
+    if bool(ids) == bool(slugs) or not keys:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either 'ids' or 'slugs'"
+        )
+    if len(keys) > settings.PROPERTY_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PROPERTY_BATCH_MAX_SIZE} properties per batch"
+        )
+
+    cached = response_cache.lookup(request)
+    if cached:
+        return cached.response(request)
+
+    if ids:
+        if not all(key.isdigit() for key in keys):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'ids' must be integers"
+            )
+        keys = [int(key) for key in keys]
+        properties = crud_property.get_properties_by_ids(db, keys)
+        found = {prop.id for prop in properties}
+    else:
+        properties = crud_property.get_properties_by_slugs(db, keys)
+        found = {prop.slug for prop in properties}
+
+    items = [serialize_property(prop) for prop in properties]
+    result = {"properties": items, "missing": [key for key in keys if key not in found]}
+    surrogate_keys = list(dict.fromkeys(key for item in items for key in detail_keys(item)))
+    return response_cache.respond(
+        request, result, headers=cache_headers(request, detail_policy(), surrogate_keys)
+    )
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Server-sent listing events"}}
+)
+async def stream_properties(
+    property_type: Optional[PropertyType] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_bedrooms: Optional[int] = Query(None, ge=1),
+    city: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-sent events for listings: `created`, `updated`, `status` (status
+    changed) and `deleted`, optionally filtered. Reconnects resume from
+    Last-Event-ID; a `reset` event means events were missed and the
+    listing should be refetched.
+    """
+    if listing_broker.count >= settings.STREAM_MAX_SUBSCRIBERS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many listing streams open"
+        )
+    stream_filter = StreamFilter(
+        property_type=property_type,
+        min_price=min_price,
+        max_price=max_price,
+        min_bedrooms=min_bedrooms,
+        city=city
+    )
+    return StreamingResponse(
+        listing_broker.stream(stream_filter, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/home", response_model=HomeSnapshotResponse)
+def get_home(request: Request, db: Session = Depends(get_read_db)):
+    """Featured, special-offer and newest listings for the homepage, from an in-memory snapshot"""
+    home_snapshot.get(db)
+    return home_snapshot.response(request)
+
+def _detail_headers(request: Request, item: dict) -> dict:
+    return {
+        **cache_headers(request, detail_policy(), detail_keys(item)),
+        "ETag": property_etag(item["id"], item["version"]),
+    }
 
 @router.get("/{property_id}", response_model=PropertyResponse)
-def get_property(property_id: int, db: Session = Depends(get_db)):
+def get_property(property_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Get single property by ID"""
+    cached = response_cache.lookup(request)
+    if cached:
+        return cached.response(request)
+
     db_property = crud_property.get_property(db, property_id)
     if not db_property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found"
         )
-    return PropertyResponse(
-        **db_property.__dict__,
-        gmap_url=db_property.gmap_url,
-        directions_url=db_property.directions_url
+    result = serialize_property(db_property)
+    return response_cache.respond(request, result, headers=_detail_headers(request, result))
+
+@router.get("/{property_id}/similar", response_model=List[PropertyListResponse])
+def get_similar_properties(
+    property_id: int,
+    request: Request,
+    limit: int = Query(6, ge=1, le=24),
+    db: Session = Depends(get_read_db)
+):
+    """Available properties of the same type closest in price, size, layout, features and location"""
+    cached = response_cache.lookup(request)
+    if cached:
+        return cached.response(request)
+
+    similarity_index.refresh(db)
+    query_row = None
+    if property_id not in similarity_index.rows:
+        query_row = db.execute(select(*SIMILARITY_COLUMNS).where(Property.id == property_id)).first()
+        if query_row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+
+    for _ in range(2):
+        ids = similarity_index.similar(property_id, limit, query_row)
+        found = crud_property.get_properties_by_ids(db, ids, columns=LIST_COLUMNS)
+        properties = [prop for prop in found if prop.status == PropertyStatus.AVAILABLE]
+        # Deleted, sold or rented by another worker since the last refresh: drop them and rank once more
+        stale = set(ids) - {prop.id for prop in properties}
+        for stale_id in stale:
+            similarity_index.remove(stale_id)
+        if not stale:
+            break
+
+    result = [
+        serialize_property_list_item(prop, thumbnail=prop.images[0].url if prop.images else None)
+        for prop in properties
+    ]
+    return response_cache.respond(
+        request, result, headers=cache_headers(request, listing_policy(), listing_keys(result))
     )
 
 @router.get("/slug/{slug}", response_model=PropertyResponse)
-def get_property_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_property_by_slug(slug: str, request: Request, db: Session = Depends(get_read_db)):
     """Get single property by slug"""
+    cached = response_cache.lookup(request)
+    if cached:
+        return cached.response(request)
+
     db_property = crud_property.get_property_by_slug(db, slug)
-    if not db_property:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found"
-        )
-    return PropertyResponse(
-        **db_property.__dict__,
-        gmap_url=db_property.gmap_url,
-        directions_url=db_property.directions_url
-    )
+    if db_property:
+        result = serialize_property(db_property)
+    else:
+        # Old links to sold and rented listings moved to the archive
+        archived = crud_archive.get_archived_property_by_slug(db, slug)
+        if not archived:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+        result = serialize_archived_property(archived)
+    return response_cache.respond(request, result, headers=_detail_headers(request, result))
 
 @router.post("/", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
 def create_property(
@@ -91,7 +310,30 @@ def create_property(
     db: Session = Depends(get_db)
 ):
     """Create new property (Admin only)"""
-    return crud_property.create_property(db=db, property=property, user_id=current_user.id)
+    db_property = crud_property.create_property(db=db, property=property, user_id=current_user.id)
+    return ORJSONResponse(serialize_property(db_property), status_code=status.HTTP_201_CREATED)
+
+@router.post("/bulk", response_model=PropertyBulkResult)
+def bulk_update_properties(
+    bulk: PropertyBulkAction,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Change the status or featured flag of, or delete, many properties at
+    once (Admin only): one UPDATE or DELETE for the whole selection.
+    """
+    if bulk.ids is not None:
+        criteria = [Property.id.in_(bulk.ids)]
+    else:
+        criteria = crud_property.property_criteria(**bulk.filter.model_dump())
+
+    if bulk.action == "delete":
+        ids = crud_property.bulk_delete_properties(db, criteria)
+    else:
+        values = {"status": bulk.status} if bulk.action == "status" else {"is_featured": bulk.is_featured}
+        ids = [row["id"] for row in crud_property.bulk_update_properties(db, criteria, values)]
+    return {"action": bulk.action, "affected": len(ids), "ids": sorted(ids)}
 
 @router.put("/{property_id}", response_model=PropertyResponse)
 def update_property(
@@ -107,7 +349,58 @@ def update_property(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found"
         )
-    return db_property
+    result = serialize_property(db_property)
+    return ORJSONResponse(result, headers={"ETag": property_etag(result["id"], result["version"])})
+
+@router.patch(
+    "/{property_id}",
+    response_model=PropertyPatchResponse,
+    responses={
+        status.HTTP_409_CONFLICT: {"description": "The property changed since the given version"},
+        status.HTTP_428_PRECONDITION_REQUIRED: {"description": "Neither If-Match nor version given"},
+    }
+)
+def patch_property(
+    property_id: int,
+    patch: PropertyPatch,
+    if_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update some fields of a property, only if it is still at the version
+    the client read: the ETag in If-Match, or `version` in the body
+    (Admin only). One UPDATE ... RETURNING; the images are not returned.
+    """
+    if if_match is not None:
+        matched, expected_version = if_match_version(if_match, property_id)
+        if not matched:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="If-Match does not name a version of this property"
+            )
+    elif patch.version is not None:
+        expected_version = patch.version
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="Send the ETag in If-Match or the version you read"
+        )
+
+    row = crud_property.patch_property(db, property_id, patch, expected_version)
+    if row is None:
+        current_version = crud_property.get_property_version(db, property_id)
+        if current_version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Property not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Property was modified: now at version {current_version}",
+            headers={"ETag": property_etag(property_id, current_version)}
+        )
+    return ORJSONResponse(serialize_property_row(row), headers={"ETag": property_etag(property_id, row["version"])})
 
 @router.delete("/{property_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_property(
@@ -0,0 +1,85 @@
+# app/api/v1/saved_searches.py
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ...config import settings
+from ...database import get_db
+from ...dependencies import get_current_active_user
+from ...models.user import User
+from ...schemas.saved_search import (
+    SavedSearchCreate, SavedSearchResponse, SearchNotificationResponse, SearchNotificationRead
+)
+from ...crud import saved_search as crud_saved_search
+from ...core import search_alerts  # noqa: F401  (matches listing writes against saved searches)
+from ...utils.serializers import serialize_property_list_item
+
+router = APIRouter(prefix="/saved-searches", tags=["Saved searches"])
+
+@router.post("/", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
+def create_saved_search(
+    saved_search: SavedSearchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Save listing filters; new and changed listings matching them are queued as notifications"""
+    if crud_saved_search.count_saved_searches(db, current_user.id) >= settings.SAVED_SEARCHES_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SAVED_SEARCHES_PER_USER} saved searches per user"
+        )
+    return crud_saved_search.create_saved_search(db, saved_search, current_user.id)
+
+@router.get("/", response_model=List[SavedSearchResponse])
+def list_saved_searches(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """The current user's saved searches"""
+    return crud_saved_search.get_saved_searches(db, current_user.id)
+
+@router.get("/notifications", response_model=List[SearchNotificationResponse])
+def list_notifications(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    is_read: Optional[bool] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Listings that matched the current user's saved searches, newest first"""
+    notifications = crud_saved_search.get_notifications(db, current_user.id, skip=skip, limit=limit, is_read=is_read)
+    return [
+        {
+            "id": notification.id,
+            "saved_search_id": notification.saved_search_id,
+            "is_read": notification.is_read,
+            "created_at": notification.created_at,
+            "property": serialize_property_list_item(
+                notification.property,
+                thumbnail=notification.property.images[0].url if notification.property.images else None
+            ),
+        }
+        for notification in notifications
+    ]
+
+@router.patch("/notifications/read")
+def mark_notifications_read(
+    selection: SearchNotificationRead,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Mark the listed notifications, or all of them, as read"""
+    updated = crud_saved_search.mark_notifications_read(db, current_user.id, ids=selection.ids)
+    return {"message": "Notifications marked as read", "updated": updated}
+
+@router.delete("/{saved_search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    saved_search_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a saved search and its queued notifications"""
+    if not crud_saved_search.delete_saved_search(db, saved_search_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved search not found"
+        )
@@ -0,0 +1,25 @@
+# app/api/v1/stats.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from ...database import get_db, get_read_db
+from ...dependencies import get_current_admin_user
+from ...models.user import User
+from ...schemas.stats import MarketStatsResponse, MarketStatsCheck
+from ...core.market_stats import market_stats
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+@router.get("/market", response_model=MarketStatsResponse)
+def get_market_stats(db: Session = Depends(get_read_db)):
+    """Available inventory by city, type and bedrooms, from incrementally maintained aggregates"""
+    return Response(market_stats.body(db), media_type="application/json")
+
+@router.get("/market/check", response_model=MarketStatsCheck)
+def check_market_stats(
+    repair: bool = False,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Recompute the aggregates from scratch and report drift, optionally replacing them (Admin only)"""
+    return market_stats.check(db, repair=repair)
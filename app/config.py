@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     # App
@@ -9,6 +10,11 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    READ_REPLICA_URLS: list = []  # JSON list in the environment
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    READ_REPLICA_CHECK_SECONDS: float = 5.0  # how often each replica's health and lag are probed
+    READ_REPLICA_RETRY_SECONDS: float = 30.0  # how long a failed replica is skipped
+    READ_YOUR_WRITES_SECONDS: int = 10  # reads stay on the primary this long after a write
     
     # Security
     SECRET_KEY: str
@@ -20,6 +26,102 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET: str
     
+    # Rate limiting (public write endpoints)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0 for multi-worker
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_LOGIN_BURST: int = 5
+    RATE_LIMIT_INQUIRY_PER_MINUTE: int = 6
+    RATE_LIMIT_INQUIRY_BURST: int = 3
+    RATE_LIMIT_ROUTE_PER_SECOND: float = 50.0
+    RATE_LIMIT_ROUTE_BURST: int = 100
+    
+    # Buffered (write-behind) inquiry ingestion
+    INQUIRY_BUFFER_ENABLED: bool = False
+    INQUIRY_BUFFER_MAX_BATCH: int = 200
+    INQUIRY_BUFFER_FLUSH_SECONDS: float = 1.0
+    INQUIRY_BUFFER_MAX_PENDING: int = 10000
+    INQUIRY_BUFFER_SPOOL_PATH: Optional[str] = None  # per-worker append-only spool file for crash safety
+    INQUIRY_UNREAD_RESYNC_SECONDS: float = 30.0
+    
+    # Batch detail fetch (GET /properties/batch)
+    PROPERTY_BATCH_MAX_SIZE: int = 50
+    
+    # Archival of sold and rented listings into the archive tables
+    ARCHIVE_ENABLED: bool = False  # run the job periodically in each worker (runs never overlap on Postgres)
+    ARCHIVE_AFTER_DAYS: int = 180  # days since the listing last changed
+    ARCHIVE_BATCH_SIZE: int = 500  # listings moved per transaction
+    ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    
+    # Saved searches
+    SAVED_SEARCHES_PER_USER: int = 20
+    SEARCH_ALERTS_MAX_PENDING: int = 10000  # listings waiting to be matched; further writes are not announced
+    
+    # Server-sent listing events (GET /properties/stream)
+    STREAM_MAX_SUBSCRIBERS: int = 10000
+    STREAM_QUEUE_SIZE: int = 256  # undelivered events before a subscriber is dropped
+    STREAM_RETAINED_EVENTS: int = 1000  # recent events kept for Last-Event-ID resume
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    STREAM_RETRY_MS: int = 3000
+    
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    
+    # Single-flight: identical concurrent GETs share one handler run and its response bytes
+    COALESCING_ENABLED: bool = True
+    COALESCING_MAX_BODY_BYTES: int = 4 * 1024 * 1024  # larger responses are not shared
+    
+    # In-process cache of serialized read responses. Each worker clears only on its own
+    # writes, so with several workers reads may be up to the TTL stale: opt in.
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Homepage snapshot
+    HOME_SECTION_SIZE: int = 12  # featured and special-offer listings
+    HOME_NEWEST_PER_TYPE: int = 8
+    HOME_REFRESH_SECONDS: float = 5.0  # how often changes made by other workers are checked for
+    
+    # In-memory columnar index for listing filters (text search always uses SQL)
+    LISTING_INDEX_ENABLED: bool = False
+    LISTING_INDEX_REFRESH_SECONDS: float = 5.0  # how often rows changed by other workers are picked up
+    
+    # Similar listings
+    SIMILAR_REFRESH_SECONDS: float = 30.0  # how often rows changed by other workers are picked up
+    
+    # Market statistics
+    MARKET_STATS_REFRESH_SECONDS: float = 5.0  # how often rows changed by other workers are picked up
+    
+    # Sitemap
+    SITE_URL: str = "http://localhost:5173"  # public frontend; property pages live at /properties/<slug>
+    SITEMAP_BASE_URL: str = "http://localhost:8000/"  # public URL of this API, where sitemap shards are served
+    SITEMAP_SHARD_SIZE: int = 50000  # property ids per shard (the protocol allows 50k URLs per sitemap)
+    SITEMAP_FETCH_SIZE: int = 2000  # rows per server-side cursor fetch
+    SITEMAP_REFRESH_SECONDS: float = 5.0  # how often changes made by other workers are checked for
+    
+    # HTTP caching by a CDN / reverse proxy in front of the API
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_LISTING_MAX_AGE: int = 60  # seconds
+    HTTP_CACHE_DETAIL_MAX_AGE: int = 300
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 600
+    CDN_PURGE_URL: Optional[str] = None  # e.g. https://api.fastly.com/service/<id>/purge; unset logs purges instead
+    CDN_PURGE_TOKEN: Optional[str] = None
+    CDN_PURGE_TOKEN_HEADER: str = "Fastly-Key"
+    
+    # Observability
+    METRICS_ENABLED: bool = True
+    # Debug only: X-Query-Count / X-DB-Time headers and N+1 warnings per request
+    QUERY_DEBUG: bool = False
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_MAX_SAMPLES: int = 100
+    SLOW_QUERY_SAMPLES_PER_MINUTE: float = 30.0
+    SLOW_QUERY_EXPLAIN: bool = True  # EXPLAIN QUERY PLAN on SQLite, EXPLAIN (ANALYZE, BUFFERS) for Postgres SELECTs
+    
     # CORS
     ALLOWED_ORIGINS: list = ["http://localhost:3000", "http://localhost:3001", "http://localhost:5173", "http://127.0.0.1:3000", "http://127.0.0.1:3001"]
     
@@ -31,4 +133,10 @@ class Settings(BaseSettings):
 def get_settings():
     return Settings()
 
-settings = get_settings()
\ No newline at end of file
+class _LazySettings:
+    """Stand-in for the Settings instance that reads the environment on first use"""
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+settings = _LazySettings()
\ No newline at end of file
@@ -0,0 +1,102 @@
+# app/core/archival.py
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from ..crud.archive import archive_candidates, archive_properties
+from .events import PropertyEvent, property_events
+
+logger = logging.getLogger(__name__)
+
+
+class ListingArchiver:
+    """
+    Moves sold and rented listings older than `after_days` out of the hot
+    `properties` table into the archive tables.
+
+    Each batch of `batch_size` listings is its own transaction, so a run
+    never holds long locks and an interrupted run loses nothing: the next
+    one picks up where it stopped. Once a batch commits, a `deleted` event
+    per listing lets caches, indexes and streams drop it. Started from the
+    app's lifespan it runs every `interval_seconds` in a background thread;
+    `run()` archives everything due once, as the admin endpoint does.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.session_factory: Optional[Callable] = None
+        self.after_days = 180
+        self.batch_size = 500
+        self.interval_seconds = 3600.0
+        self.archived = 0
+        self.batches = 0
+        self.failed_runs = 0
+
+    def configure(self, session_factory: Callable, after_days: int = 180, batch_size: int = 500,
+                  interval_seconds: float = 3600.0):
+        self.session_factory = session_factory
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="listing-archiver", daemon=True)
+        self._thread.start()
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stopping.set()
+        self._thread.join()
+
+    def run(self, after_days: Optional[int] = None, max_batches: Optional[int] = None) -> dict:
+        """Archive every listing due now, batch by batch; one run at a time per process"""
+        if after_days is None:
+            after_days = self.after_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=after_days)
+        archived = batches = 0
+        with self._lock:
+            while max_batches is None or batches < max_batches:
+                if self._stopping.is_set() and threading.current_thread() is self._thread:
+                    break   # shutting down; the next start continues
+                db = self.session_factory()
+                try:
+                    ids = archive_candidates(db, cutoff, self.batch_size)
+                    moved = archive_properties(db, ids)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                finally:
+                    db.close()
+                if not ids:
+                    break
+                for property_id in ids:
+                    property_events.emit(PropertyEvent("deleted", property_id))
+                archived += moved
+                batches += 1
+                self.archived += moved
+                self.batches += 1
+                if len(ids) < self.batch_size:
+                    break
+        if archived:
+            logger.info("Archived %d listings older than %d days in %d batches", archived, after_days, batches)
+        return {"archived": archived, "batches": batches, "cutoff": cutoff}
+
+    def _run(self):
+        while not self._stopping.wait(self.interval_seconds):
+            try:
+                self.run()
+            except Exception:
+                self.failed_runs += 1
+                logger.exception("Listing archival failed; retrying in %.0f s", self.interval_seconds)
+
+
+listing_archiver = ListingArchiver()
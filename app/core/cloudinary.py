@@ -1,17 +1,23 @@
 # app/core/cloudinary.py
-import cloudinary
-import cloudinary.uploader
+from functools import lru_cache
 from ..config import settings
 
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET
-)
+@lru_cache()
+def get_uploader():
+    """Import and configure the Cloudinary SDK on first use"""
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET
+    )
+    return cloudinary.uploader
 
 def upload_image(file_data, folder="tirupur-homes"):
     """Upload image to Cloudinary"""
-    result = cloudinary.uploader.upload(
+    result = get_uploader().upload(
         file_data,
         folder=folder,
         resource_type="auto"
@@ -23,4 +29,4 @@ def upload_image(file_data, folder="tirupur-homes"):
 
 def delete_image(public_id: str):
     """Delete image from Cloudinary"""
-    return cloudinary.uploader.destroy(public_id)
\ No newline at end of file
+    return get_uploader().destroy(public_id)
\ No newline at end of file
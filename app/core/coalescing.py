@@ -0,0 +1,149 @@
+# app/core/coalescing.py
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+from .compression import negotiate_encoding
+from .metrics import route_template
+from .replicas import STICKY_COOKIE
+
+
+class CoalescingStats:
+    """Requests per route template that ran the handler (leaders) or were handed a leader's response"""
+
+    def __init__(self):
+        self.leaders: Dict[str, int] = defaultdict(int)
+        self.followers: Dict[str, int] = defaultdict(int)
+
+    def collapse_ratio(self, route: str) -> float:
+        """Requests served per handler run"""
+        leaders = self.leaders.get(route, 0)
+        return (leaders + self.followers.get(route, 0)) / leaders if leaders else 1.0
+
+
+coalescing_stats = CoalescingStats()
+
+
+def _copy(message: dict) -> dict:
+    # Outer middleware (CORS) edits header lists in place; every client gets its own
+    if "headers" in message:
+        return dict(message, headers=list(message["headers"]))
+    return message
+
+
+class _Flight:
+    """One in-flight handler run; `messages` is its complete response, once shareable"""
+    __slots__ = ("done", "messages", "route")
+
+    def __init__(self):
+        self.done = asyncio.Event()
+        self.messages: Optional[List[dict]] = None
+        self.route = "<unmatched>"
+
+
+class CoalescingMiddleware:
+    """
+    Single-flight for identical concurrent GETs.
+
+    The first request for a key runs the app, streaming its response to its
+    own client while recording the ASGI messages; identical requests that
+    arrive before it finishes wait on the event loop (not in the threadpool,
+    so sync and async handlers alike) and replay the recorded messages: one
+    database round and one serialization however many clients asked.
+
+    The key is the path, raw query string, negotiated content coding,
+    Accept and If-None-Match, so followers get exactly the bytes they would
+    have got themselves (compression runs inside this middleware).
+    Requests with credentials or pinned to the primary after a write are
+    never coalesced. Responses that set cookies, are streamed as server-sent
+    events or exceed `max_body_bytes` are not shared: their followers are
+    released to run the app themselves, as they are when the leader fails.
+    """
+
+    def __init__(self, app, max_body_bytes: Optional[int] = None, stats: Optional[CoalescingStats] = None):
+        self.app = app
+        self.max_body_bytes = settings.COALESCING_MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+        self.stats = stats or coalescing_stats
+        self._flights: Dict[Tuple, _Flight] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        key = self._key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            await flight.done.wait()
+            if flight.messages is not None:
+                self.stats.followers[flight.route] += 1
+                for message in flight.messages:
+                    await send(_copy(message))
+                return
+            # Not shareable: run the handler like any other request
+            await self.app(scope, receive, send)
+            self.stats.leaders[route_template(scope)] += 1
+            return
+
+        flight = self._flights[key] = _Flight()
+        recorded: List[dict] = []
+        size = 0
+        complete = False
+
+        def release():
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.done.set()
+
+        async def send_wrapper(message):
+            nonlocal size, complete
+            if not flight.done.is_set():
+                if message["type"] == "http.response.start":
+                    if not self._shareable(message["headers"]):
+                        release()
+                elif message["type"] == "http.response.body":
+                    size += len(message.get("body", b""))
+                    if size > self.max_body_bytes:
+                        release()
+                    complete = not message.get("more_body", False)
+                if not flight.done.is_set():
+                    recorded.append(_copy(message))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            flight.route = route_template(scope)
+            self.stats.leaders[flight.route] += 1
+            if complete and not flight.done.is_set():
+                flight.messages = recorded
+            release()
+
+    @staticmethod
+    def _key(scope) -> Optional[Tuple]:
+        encoding = accept = etag = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                return None
+            if name == b"cookie" and STICKY_COOKIE.encode() in value:
+                return None
+            if name == b"accept-encoding":
+                encoding = negotiate_encoding(value.decode("latin-1"))
+            elif name == b"accept":
+                accept = value
+            elif name == b"if-none-match":
+                etag = value
+        return (scope["path"], scope["query_string"], encoding, accept, etag)
+
+    @staticmethod
+    def _shareable(headers) -> bool:
+        for name, value in headers:
+            if name == b"set-cookie":
+                return False
+            if name == b"content-type" and value.startswith(b"text/event-stream"):
+                return False
+        return True
@@ -0,0 +1,146 @@
+# app/core/compression.py
+import gzip
+from functools import lru_cache
+from typing import Optional
+
+import brotli
+from starlette.datastructures import MutableHeaders
+
+from ..config import settings
+
+# Preferred first when the client weighs several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported encoding from an Accept-Encoding header value.
+    Browsers send a handful of distinct values, so results are memoized.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name == "*":
+            for encoding in SUPPORTED_ENCODINGS:
+                weights.setdefault(encoding, quality)
+        elif name in SUPPORTED_ENCODINGS:
+            weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, 0.0)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    """
+    Compress `body` for the given content coding. Bodies that are compressed
+    once and then served from cache use denser, slower settings.
+    """
+    if encoding == "br":
+        quality = 9 if cached else settings.BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        level = 9 if cached else settings.GZIP_LEVEL
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encoding(headers) -> Optional[str]:
+    """Negotiated encoding for a request's headers, or None"""
+    accept_encoding = headers.get("accept-encoding")
+    return negotiate_encoding(accept_encoding) if accept_encoding else None
+
+
+class CompressionMiddleware:
+    """
+    Compress complete response bodies with brotli or gzip.
+
+    Responses that already carry a Content-Encoding (for example bodies
+    precompressed by the response cache) and streamed responses pass
+    through untouched, as do bodies under `minimum_size` bytes.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate_encoding(value.decode("latin-1"))
+                break
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        # First body message: only whole bodies are compressed
+        self.passthrough = True
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = compress(body, self.encoding)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        self.start_message["headers"] = headers.raw
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": body})
@@ -0,0 +1,46 @@
+# app/core/events.py
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PropertyEvent:
+    """A committed change to a property"""
+    action: str                   # "created", "updated", "deleted" or "image_added"
+    property_id: int
+    data: Optional[dict] = None   # column values after the change; None for deletes
+    changed: Tuple[str, ...] = () # for updates, the columns whose value changed
+
+
+class EventBus:
+    """
+    In-process, synchronous publish/subscribe for committed changes.
+
+    Handlers run in the thread that made the change, so they must be quick;
+    a failing handler is logged and never breaks the write that emitted it.
+    """
+
+    def __init__(self):
+        self._handlers: List[Callable] = []
+
+    def subscribe(self, handler: Callable) -> Callable:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+        return handler
+
+    def unsubscribe(self, handler: Callable):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def emit(self, event):
+        for handler in list(self._handlers):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler %r failed for %r", handler, event)
+
+
+property_events = EventBus()
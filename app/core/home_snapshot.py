@@ -0,0 +1,223 @@
+# app/core/home_snapshot.py
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import orjson
+from fastapi.responses import Response
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.property import get_changed_since, get_last_change
+from ..database import SessionLocal
+from ..models.property import Property, PropertyImage, PropertyStatus, PropertyType
+from ..utils.serializers import serialize_home_item
+from .events import PropertyEvent, property_events
+from .http_cache import LISTING_KEY, cache_headers, listing_policy
+from .response_cache import CachedBody
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    matches: Callable[[dict], bool]   # on column values, as carried by PropertyEvent.data
+    criteria: Callable[[], object]    # the same test as a SQL expression
+    limit: Callable[[], int]
+
+
+def _available(data: dict) -> bool:
+    return data.get("status") in (PropertyStatus.AVAILABLE, None)
+
+
+SECTIONS = [
+    Section(
+        "featured",
+        lambda d: _available(d) and bool(d.get("is_featured")),
+        lambda: and_(Property.status == PropertyStatus.AVAILABLE, Property.is_featured.is_(True)),
+        lambda: settings.HOME_SECTION_SIZE,
+    ),
+    Section(
+        "special_offers",
+        lambda d: _available(d) and bool(d.get("is_special_offer")),
+        lambda: and_(Property.status == PropertyStatus.AVAILABLE, Property.is_special_offer.is_(True)),
+        lambda: settings.HOME_SECTION_SIZE,
+    ),
+] + [
+    Section(
+        f"newest:{property_type.value}",
+        lambda d, t=property_type: _available(d) and d.get("property_type") == t,
+        lambda t=property_type: and_(Property.status == PropertyStatus.AVAILABLE, Property.property_type == t),
+        lambda: settings.HOME_NEWEST_PER_TYPE,
+    )
+    for property_type in PropertyType
+]
+
+
+# What sections match on and home items show
+COLUMNS = tuple(getattr(Property, name) for name in (
+    "id", "title", "slug", "price", "property_type", "status", "city", "bedrooms", "bathrooms", "area",
+    "is_featured", "is_special_offer", "offer_text", "created_at",
+))
+
+
+def _sort_key(item: dict):
+    return (item["created_at"] or datetime.min, item["id"])
+
+
+class HomeSnapshot:
+    """
+    The homepage (featured, special offers, newest per type) kept in memory
+    as one serialized body with precompressed variants, so a read is a
+    reference copy.
+
+    Property events update it in place where the event carries enough to
+    decide: an edit to a listed property, or a new one that sorts into a
+    section. Only a section that loses an entry (and may need backfill) or
+    gains one that needs its thumbnail is re-queried, with a bounded query.
+
+    Other workers' writes raise no event here: at most every
+    HOME_REFRESH_SECONDS a read fetches the rows changed since the
+    `updated_at`/`created_at` watermark and applies them like events, and
+    treats listed ids that no longer exist as deletes. This worker's own
+    writes come back in that read too and apply as no-ops.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory
+        self.sections: Dict[str, List[dict]] = {}
+        self.entry: Optional[CachedBody] = None
+        self.version = 0
+        self.rebuilds = 0
+        self.watermark: Optional[datetime] = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CachedBody:
+        if self.entry is None or time.monotonic() - self.checked_at >= settings.HOME_REFRESH_SECONDS:
+            with self._lock:
+                self._sync(db)
+        return self.entry
+
+    def _sync(self, db: Session):
+        """Build on first use; afterwards apply what other workers changed since the watermark"""
+        now = time.monotonic()
+        if self.entry is not None and now - self.checked_at < settings.HOME_REFRESH_SECONDS:
+            return  # checked by another thread while this one waited for the lock
+        if self.entry is None:
+            self.watermark = get_last_change(db)
+            self._reload(db, SECTIONS)
+            self._publish()
+        else:
+            rows, self.watermark = get_changed_since(db, COLUMNS, self.watermark)
+            events = [
+                PropertyEvent("updated", row.id, {column.key: value for column, value in zip(COLUMNS, row)})
+                for row in rows
+            ]
+            listed = {item["id"] for items in self.sections.values() for item in items}
+            if listed:
+                existing = set(db.execute(select(Property.id).where(Property.id.in_(listed))).scalars())
+                events += [PropertyEvent("deleted", property_id) for property_id in listed - existing]
+            if events:
+                self._apply(events, db)
+        self.checked_at = now
+
+    def _reload(self, db: Session, sections: List[Section]):
+        rows = {}
+        for section in sections:
+            props = (
+                db.query(Property)
+                .filter(section.criteria())
+                .order_by(Property.created_at.desc(), Property.id.desc())
+                .limit(section.limit())
+                .all()
+            )
+            rows[section.name] = props
+        thumbnails = self._thumbnails(db, {p.id for props in rows.values() for p in props})
+        for name, props in rows.items():
+            self.sections[name] = [serialize_home_item(p, thumbnails.get(p.id)) for p in props]
+        self.rebuilds += 1
+
+    @staticmethod
+    def _thumbnails(db: Session, ids) -> Dict[int, str]:
+        if not ids:
+            return {}
+        thumbnails = {}
+        rows = (
+            db.query(PropertyImage.property_id, PropertyImage.url)
+            .filter(PropertyImage.property_id.in_(ids))
+            .order_by(PropertyImage.property_id, PropertyImage.order, PropertyImage.id)
+        )
+        for property_id, url in rows:
+            thumbnails.setdefault(property_id, url)
+        return thumbnails
+
+    def _publish(self):
+        newest = {t.value: self.sections[f"newest:{t.value}"] for t in PropertyType}
+        sections = orjson.dumps({
+            "featured": self.sections["featured"],
+            "special_offers": self.sections["special_offers"],
+            "newest": newest,
+        })
+        # Derived from content, so every worker agrees on the version of the same data
+        self.version = int.from_bytes(hashlib.blake2b(sections, digest_size=6).digest(), "big")
+        body = b'{"version":%d,' % self.version + sections[1:]
+        self.entry = CachedBody(body, headers={"ETag": f'"home-{self.version:x}"'})
+
+    def handle(self, event: PropertyEvent):
+        if self.entry is None:
+            return  # built on first read
+        with self._lock:
+            self._apply([event])
+
+    def _apply(self, events: List[PropertyEvent], db: Optional[Session] = None):
+        """Update the sections in place, re-query the ones that cannot be, and publish; call with the lock held"""
+        stale: Dict[str, Section] = {}
+        for event in events:
+            for section in SECTIONS:
+                items = self.sections[section.name]
+                index = next((i for i, item in enumerate(items) if item["id"] == event.property_id), None)
+                qualifies = event.data is not None and section.matches(event.data)
+
+                if event.action == "image_added":
+                    if index is not None:
+                        stale[section.name] = section
+                elif qualifies and index is not None:
+                    items[index] = serialize_home_item(Property(**event.data), items[index]["thumbnail"])
+                elif qualifies:
+                    item = serialize_home_item(Property(**event.data))
+                    if len(items) < section.limit() or _sort_key(item) > _sort_key(items[-1]):
+                        if event.action == "created":
+                            # Nothing uploaded yet, so no thumbnail to look up
+                            items.append(item)
+                            items.sort(key=_sort_key, reverse=True)
+                            del items[section.limit():]
+                        else:
+                            stale[section.name] = section
+                elif index is not None:
+                    stale[section.name] = section
+
+        if stale:
+            session = db or self.session_factory()
+            try:
+                self._reload(session, list(stale.values()))
+            finally:
+                if db is None:
+                    session.close()
+        self._publish()
+
+    def response(self, request):
+        """The snapshot, or 304 when the client already holds this version"""
+        entry = self.entry
+        etag = entry.headers["ETag"]
+        headers = cache_headers(request, listing_policy(), [LISTING_KEY, "home"])
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag, **headers})
+        return entry.response(request, headers=headers)
+
+
+home_snapshot = HomeSnapshot(SessionLocal)
+property_events.subscribe(home_snapshot.handle)
@@ -0,0 +1,163 @@
+# app/core/http_cache.py
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from slugify import slugify
+
+from ..config import settings
+from .events import PropertyEvent, property_events
+from .replicas import prefers_primary
+
+logger = logging.getLogger(__name__)
+
+LISTING_KEY = "listing"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    max_age: int
+    stale_while_revalidate: int = 0
+
+    @property
+    def header(self) -> str:
+        value = f"public, max-age={self.max_age}"
+        if self.stale_while_revalidate:
+            value += f", stale-while-revalidate={self.stale_while_revalidate}"
+        return value
+
+
+def listing_policy() -> CachePolicy:
+    return CachePolicy(settings.HTTP_CACHE_LISTING_MAX_AGE, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE)
+
+
+def detail_policy() -> CachePolicy:
+    return CachePolicy(settings.HTTP_CACHE_DETAIL_MAX_AGE, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE)
+
+
+def property_key(property_id: int) -> str:
+    return f"property-{property_id}"
+
+
+def city_key(city: str) -> str:
+    return f"city-{slugify(city)}"
+
+
+def listing_keys(items: Iterable[dict]) -> List[str]:
+    """A listing page is tagged with every property and city it shows"""
+    keys = {LISTING_KEY: None}
+    cities = {}
+    for item in items:
+        keys[property_key(item["id"])] = None
+        cities[city_key(item["city"])] = None
+    return list(keys) + list(cities)
+
+
+def detail_keys(item: dict) -> List[str]:
+    return [property_key(item["id"]), city_key(item["city"])]
+
+
+def property_etag(property_id: int, version: int) -> str:
+    return f'"property-{property_id}-{version}"'
+
+
+def if_match_version(value: Optional[str], property_id: int) -> Tuple[bool, Optional[int]]:
+    """
+    Version named by an If-Match header: (matched, version). `*` matches any
+    version; a tag for another property or of another form matches none.
+    """
+    if value is None:
+        return False, None
+    if value.strip() == "*":
+        return True, None
+    for tag in value.split(","):
+        tag = tag.strip().removeprefix("W/")
+        prefix = f'"property-{property_id}-'
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return True, int(tag[len(prefix):-1])
+    return False, None
+
+
+def cache_headers(request, policy: CachePolicy, keys: List[str]) -> Dict[str, str]:
+    """
+    Headers for a public read. Clients pinned to the primary after a write
+    get a private response so no shared cache keeps what they saw.
+    """
+    if not settings.HTTP_CACHE_ENABLED:
+        return {}
+    if prefers_primary(request):
+        return {"Cache-Control": "private, no-store"}
+    return {"Cache-Control": policy.header, "Surrogate-Key": " ".join(keys)}
+
+
+class Purger:
+    """Removes tagged responses from the CDN or reverse proxy in front of the API"""
+
+    def purge(self, keys: List[str]):
+        raise NotImplementedError
+
+
+class LogPurger(Purger):
+    """Stand-in used when no purge endpoint is configured: logs and remembers recent purges"""
+
+    def __init__(self, history: int = 1000):
+        self.purged: deque = deque(maxlen=history)
+
+    def purge(self, keys: List[str]):
+        self.purged.append(list(keys))
+        logger.info("Purge surrogate keys: %s", " ".join(keys))
+
+
+class HttpPurger(Purger):
+    """
+    Fastly-style purge by surrogate key: POST to `url` with the keys in a
+    `Surrogate-Key` header. Sent from a single background thread so writes
+    never wait on the CDN.
+    """
+
+    def __init__(self, url: str, token: Optional[str] = None, token_header: str = "Fastly-Key", timeout: float = 5.0):
+        self.url = url
+        self.headers = {token_header: token} if token else {}
+        self.timeout = timeout
+        self.failures = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cdn-purge")
+
+    def purge(self, keys: List[str]):
+        self._executor.submit(self._send, list(keys))
+
+    def _send(self, keys: List[str]):
+        import requests
+
+        try:
+            response = requests.post(
+                self.url,
+                headers={**self.headers, "Surrogate-Key": " ".join(keys)},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except Exception:
+            self.failures += 1
+            logger.exception("CDN purge failed for %s", " ".join(keys))
+
+
+@lru_cache()
+def get_purger() -> Purger:
+    if settings.CDN_PURGE_URL:
+        return HttpPurger(settings.CDN_PURGE_URL, settings.CDN_PURGE_TOKEN, settings.CDN_PURGE_TOKEN_HEADER)
+    return LogPurger()
+
+
+def purge_for_event(event: PropertyEvent):
+    """
+    A change invalidates the property's own responses (its detail page and
+    every listing page showing it) and, since filter membership may have
+    changed, all listing pages.
+    """
+    if settings.HTTP_CACHE_ENABLED:
+        get_purger().purge([property_key(event.property_id), LISTING_KEY])
+
+
+property_events.subscribe(purge_for_event)
@@ -0,0 +1,220 @@
+# app/core/inquiry_buffer.py
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from ..crud.inquiry import bulk_create_inquiries
+
+logger = logging.getLogger(__name__)
+
+
+class InquiryBuffer:
+    """
+    Write-behind buffer for contact inquiries.
+
+    Requests enqueue validated inquiries and return immediately; a background
+    thread inserts them in batches once `max_batch` rows are pending or every
+    `flush_seconds`, whichever comes first.
+
+    With a spool path every accepted inquiry is first appended to a local
+    file. On flush the current spool segment is rotated out and only deleted
+    after the batch commits, so a crash loses nothing: pending segments are
+    replayed on the next start. Delivery is at-least-once - a crash between
+    commit and segment removal can insert a batch twice. Each worker process
+    needs its own spool path.
+
+    A batch that violates a constraint (say its property was deleted in the
+    meantime) is retried row by row: the good rows are inserted and the
+    offending ones are logged and kept in `rejected_rows` rather than
+    blocking the buffer. Other failures (database down) keep the batch
+    pending for the next flush.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._pending: List[dict] = []
+        self._thread: Optional[threading.Thread] = None
+        self._spool = None
+        self._segment = 0
+        self._segments: List[str] = []
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.rejected = 0
+        self.rejected_rows: Deque[dict] = deque(maxlen=100)
+
+    def start(
+        self,
+        session_factory: Callable,
+        max_batch: int = 200,
+        flush_seconds: float = 1.0,
+        max_pending: int = 10000,
+        spool_path: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.spool_path = spool_path
+        self._stopping.clear()
+
+        if spool_path:
+            self._recover()
+            self._spool = open(spool_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="inquiry-flusher", daemon=True)
+        self._thread.start()
+        self.enabled = True
+
+    def stop(self, attempts: int = 3, retry_seconds: float = 0.5):
+        """Stop the flusher and write out everything still pending, retrying a failing database"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        for attempt in range(attempts):
+            self.flush()
+            if not self._pending:
+                break
+            if attempt + 1 < attempts:
+                time.sleep(retry_seconds)
+        if self._pending:
+            if self._spool:
+                logger.error("%d buffered inquiries left in the spool for the next start", len(self._pending))
+            else:
+                logger.error("Dropping %d buffered inquiries: the database is unavailable and no spool is set",
+                             len(self._pending))
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+
+    def submit(self, data: dict) -> bool:
+        """Queue one inquiry. Returns False when the buffer is full or stopped."""
+        row = dict(data, created_at=datetime.now(timezone.utc))
+        with self._lock:
+            if not self.enabled or len(self._pending) >= self.max_pending:
+                return False
+            if self._spool:
+                self._spool.write(json.dumps(row, default=datetime.isoformat) + "\n")
+                self._spool.flush()
+            self._pending.append(row)
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wakeup.set()
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            self._rotate_spool()
+            segments, self._segments = self._segments, []
+
+        inserted = done = 0
+        try:
+            db = self.session_factory()
+            try:
+                for start in range(0, len(batch), self.max_batch):
+                    chunk = batch[start:start + self.max_batch]
+                    try:
+                        inserted += bulk_create_inquiries(db, chunk)
+                    except IntegrityError:
+                        db.rollback()
+                        inserted += self._insert_one_by_one(db, chunk)
+                    done = start + len(chunk)
+            finally:
+                db.close()
+        except Exception:
+            self.failed_flushes += 1
+            logger.exception("Failed to flush %d buffered inquiries", len(batch) - done)
+            with self._lock:
+                # Committed chunks are not retried; their spool segments stay until the rest commits
+                self._pending[:0] = batch[done:]
+                self._segments[:0] = segments
+            self.flushed += inserted
+            return inserted
+
+        for segment in segments:
+            os.remove(segment)
+        self.flushed += inserted
+        return inserted
+
+    def _insert_one_by_one(self, db, rows: List[dict]) -> int:
+        """Insert each row on its own, setting aside those the database rejects"""
+        inserted = 0
+        for row in rows:
+            try:
+                inserted += bulk_create_inquiries(db, [row])
+            except IntegrityError as exc:
+                db.rollback()
+                self.rejected += 1
+                self.rejected_rows.append(row)
+                logger.error("Rejected buffered inquiry for property %s: %s", row.get("property_id"), exc.orig)
+        return inserted
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+    def _rotate_spool(self):
+        """Move the live spool aside so rows appended during the flush go to a fresh file"""
+        if not self._spool:
+            return
+        self._spool.close()
+        self._segment += 1
+        segment = f"{self.spool_path}.{os.getpid()}.{self._segment}"
+        os.replace(self.spool_path, segment)
+        self._segments.append(segment)
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+
+    def _recover(self):
+        """Replay spool files left behind by a previous process"""
+        files = sorted(glob.glob(f"{self.spool_path}.*"))
+        if os.path.exists(self.spool_path):
+            files.append(self.spool_path)
+
+        for path in files:
+            rows = []
+            with open(path, encoding="utf-8") as spool:
+                for line in spool:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; it was never acknowledged
+                        continue
+                    row["created_at"] = datetime.fromisoformat(row["created_at"])
+                    rows.append(row)
+            if rows:
+                db = self.session_factory()
+                try:
+                    try:
+                        bulk_create_inquiries(db, rows)
+                    except IntegrityError:
+                        db.rollback()
+                        self._insert_one_by_one(db, rows)
+                finally:
+                    db.close()
+                logger.info("Recovered %d spooled inquiries from %s", len(rows), path)
+            os.remove(path)
+
+
+inquiry_buffer = InquiryBuffer()
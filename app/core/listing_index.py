@@ -0,0 +1,236 @@
+# app/core/listing_index.py
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.property import get_changed_since, get_last_change, get_properties_by_ids
+from ..models.property import Property, PropertyStatus, PropertyType
+from .events import PropertyEvent, property_events
+
+TYPE_CODES = {t: code for code, t in enumerate(PropertyType)}
+
+COLUMNS = (
+    Property.id, Property.status, Property.property_type, Property.price, Property.bedrooms,
+    Property.city, Property.is_featured, Property.is_special_offer, Property.created_at,
+)
+
+_ARRAYS = (
+    ("ids", np.int64), ("created", np.float64), ("price", np.float64), ("bedrooms", np.int16),
+    ("types", np.int8), ("cities", np.int32), ("featured", bool), ("offer", bool), ("active", bool),
+)
+
+
+class ListingIndex:
+    """
+    Available properties as parallel NumPy columns, so the listing filters
+    (type, price range, bedrooms, city, featured, special offer) become
+    boolean masks and the created_at ordering a cached permutation. Only
+    the ids of the requested page go to the database, as a primary-key IN.
+
+    City names are interned to integer codes: the substring match the SQL
+    path does with ILIKE runs once over the distinct names, then as
+    `np.isin` over the codes.
+
+    Synced like the similarity index: property events in this process, and
+    rows changed since the `updated_at`/`created_at` watermark at most every
+    LISTING_INDEX_REFRESH_SECONDS. Text search is not indexed and stays on SQL.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        for name, dtype in _ARRAYS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.rows: Dict[int, int] = {}
+        self.city_codes: Dict[str, int] = {}
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at = 0.0
+        self._order: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LISTING_INDEX_ENABLED
+
+    def load(self, db: Session):
+        rows = db.execute(
+            select(*COLUMNS).where(Property.status == PropertyStatus.AVAILABLE).execution_options(yield_per=10000)
+        ).all()
+        watermark = get_last_change(db)
+        with self._lock:
+            self.size = 0
+            self.rows = {}
+            self.active[:] = False
+            self._upsert(rows)
+            self.watermark = watermark
+            self.refreshed_at = time.monotonic()
+            self.loaded = True
+
+    def refresh(self, db: Session):
+        if not self.loaded:
+            self.load(db)
+            return
+        now = time.monotonic()
+        if now - self.refreshed_at < settings.LISTING_INDEX_REFRESH_SECONDS:
+            return
+        self.refreshed_at = now
+        rows, watermark = get_changed_since(db, COLUMNS, self.watermark)
+        with self._lock:
+            self._upsert(rows)
+            self.watermark = watermark
+
+    def _grow(self, needed: int):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, dtype in _ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def _city_code(self, city: Optional[str]) -> int:
+        city = city or ""
+        code = self.city_codes.get(city)
+        if code is None:
+            code = self.city_codes[city] = len(self.city_codes)
+        return code
+
+    def _upsert(self, rows: Iterable):
+        rows = list(rows)
+        self._grow(self.size + len(rows))
+        reorder = False
+        for row in rows:
+            available = PropertyStatus(row.status) == PropertyStatus.AVAILABLE
+            index = self.rows.get(row.id)
+            if index is None:
+                if not available:
+                    continue
+                index = self.rows[row.id] = self.size
+                self.ids[index] = row.id
+                self.size += 1
+                reorder = True
+            created = row.created_at.timestamp() if row.created_at else 0.0
+            reorder = reorder or self.created[index] != created
+            self.created[index] = created
+            self.price[index] = float(row.price)
+            self.bedrooms[index] = row.bedrooms or 0
+            self.types[index] = TYPE_CODES[PropertyType(row.property_type)]
+            self.cities[index] = self._city_code(row.city)
+            self.featured[index] = bool(row.is_featured)
+            self.offer[index] = bool(row.is_special_offer)
+            self.active[index] = available
+        if reorder:
+            self._order = None
+
+    def remove(self, property_ids: Iterable[int]):
+        with self._lock:
+            for property_id in property_ids:
+                index = self.rows.get(property_id)
+                if index is not None:
+                    self.active[index] = False
+
+    def handle(self, event: PropertyEvent):
+        if not self.loaded or event.action == "image_added":
+            return
+        if event.data is None:
+            self.remove([event.property_id])
+            return
+        row = SimpleNamespace(**event.data)
+        with self._lock:
+            self._upsert([row])
+
+    def _sorted(self) -> np.ndarray:
+        """Row numbers by created_at, then id, newest first"""
+        if self._order is None:
+            n = self.size
+            self._order = np.lexsort((-self.ids[:n], -self.created[:n]))
+        return self._order
+
+    def _mask(
+        self,
+        rows,
+        property_type: Optional[PropertyType] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_bedrooms: Optional[int] = None,
+        city: Optional[str] = None,
+        is_featured: Optional[bool] = None,
+        is_special_offer: Optional[bool] = None,
+    ) -> np.ndarray:
+        """Which of `rows` (a slice or row numbers) match; same truthiness rules for filters as SQL"""
+        mask = self.active[rows].copy()
+        if property_type:
+            mask &= self.types[rows] == TYPE_CODES[PropertyType(property_type)]
+        if min_price:
+            mask &= self.price[rows] >= min_price
+        if max_price:
+            mask &= self.price[rows] <= max_price
+        if min_bedrooms:
+            mask &= self.bedrooms[rows] >= min_bedrooms
+        if city:
+            needle = city.lower()
+            codes = [code for name, code in self.city_codes.items() if needle in name.lower()]
+            mask &= np.isin(self.cities[rows], codes)
+        if is_featured is not None:
+            mask &= self.featured[rows] == is_featured
+        if is_special_offer is not None:
+            mask &= self.offer[rows] == is_special_offer
+        return mask
+
+    def search(self, skip: int = 0, limit: int = 20, **filters) -> List[int]:
+        """Ids of one page of matches, in the SQL path's order"""
+        with self._lock:
+            mask = self._mask(slice(0, self.size), **filters)
+            order = self._sorted()
+            page = order[mask[order]][skip:skip + limit]
+            return self.ids[page].tolist()
+
+    def _recheck(self, ids: List[int], properties: List[Property], filters: dict) -> set:
+        """
+        Write the rows just read back into the index and return the ids of
+        the page that are gone or no longer match `filters`.
+        """
+        with self._lock:
+            for missing in set(ids) - {prop.id for prop in properties}:
+                self.active[self.rows[missing]] = False
+            self._upsert(properties)
+            rows = np.array([self.rows[prop.id] for prop in properties], dtype=np.int64)
+            matching = self._mask(rows, **filters)
+        return set(ids) - {prop.id for prop, match in zip(properties, matching) if match}
+
+    def get_properties(
+        self,
+        db: Session,
+        columns: Optional[Sequence] = None,
+        with_images: bool = True,
+        skip: int = 0,
+        limit: int = 20,
+        **filters
+    ) -> List[Property]:
+        """One page of properties for `filters`, filtered and ordered in memory; loaded as `listing_options`"""
+        self.refresh(db)
+        if columns is not None:
+            # What the index holds, so the rows can be checked against it without lazy loads
+            columns = list(columns) + [column for column in COLUMNS if not any(column is c for c in columns)]
+        for _ in range(2):
+            ids = self.search(skip, limit, **filters)
+            properties = get_properties_by_ids(db, ids, columns, with_images)
+            # Deleted, sold or repriced by another worker since the last refresh: fill the page once more
+            stale = self._recheck(ids, properties, filters)
+            if not stale:
+                break
+            properties = [prop for prop in properties if prop.id not in stale]
+        return properties
+
+listing_index = ListingIndex()
+property_events.subscribe(listing_index.handle)
@@ -0,0 +1,228 @@
+# app/core/listing_stream.py
+import asyncio
+import itertools
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from ..config import settings
+from ..models.property import PropertyType
+from .events import PropertyEvent, property_events
+
+# Listing fields carried in each event; clients fetch the full property if they need it
+FIELDS = (
+    "id", "slug", "title", "price", "property_type", "status", "city", "bedrooms",
+    "is_featured", "is_special_offer", "updated_at",
+)
+
+
+def _default(value):
+    # Decimal prices; enums and datetimes are handled by orjson itself
+    return float(value)
+
+
+@dataclass(frozen=True)
+class StreamFilter:
+    """Subscriber filters, with the listing endpoint's semantics; applied to the listing after the change"""
+    property_type: Optional[PropertyType] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_bedrooms: Optional[int] = None
+    city: Optional[str] = None
+
+    def matches(self, data: Optional[dict]) -> bool:
+        if data is None:
+            return True   # deletes carry no columns: every subscriber gets them
+        if self.property_type and data["property_type"] != self.property_type:
+            return False
+        if self.min_price and data["price"] < self.min_price:
+            return False
+        if self.max_price and data["price"] > self.max_price:
+            return False
+        if self.min_bedrooms and (data.get("bedrooms") or 0) < self.min_bedrooms:
+            return False
+        if self.city and self.city.lower() not in (data.get("city") or "").lower():
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    seq: int
+    data: Optional[dict]
+    frame: bytes   # the encoded SSE message, shared by every subscriber
+
+
+class Subscriber:
+    """One connection: a bounded queue of frames, woken by an asyncio.Event on its loop"""
+    __slots__ = ("filter", "loop", "queue", "wakeup", "last_seq", "dropped")
+
+    def __init__(self, stream_filter: StreamFilter, loop: asyncio.AbstractEventLoop, last_seq: int):
+        self.filter = stream_filter
+        self.loop = loop
+        self.queue: Deque[bytes] = deque()
+        self.wakeup = asyncio.Event()
+        self.last_seq = last_seq
+        self.dropped = False
+
+    def offer(self, event: StreamEvent) -> bool:
+        """Queue an event (on the subscriber's loop); False when the queue is full"""
+        if event.seq <= self.last_seq:
+            return True   # already sent as backlog
+        if len(self.queue) >= settings.STREAM_QUEUE_SIZE:
+            self.dropped = True
+            self.wakeup.set()
+            return False
+        self.queue.append(event.frame)
+        self.last_seq = event.seq
+        self.wakeup.set()
+        return True
+
+    async def next(self, timeout: float) -> Optional[bytes]:
+        """The next frame, or None after `timeout` seconds without one"""
+        if not self.queue and not self.dropped:
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.queue.popleft() if self.queue else None
+
+
+class ListingBroker:
+    """
+    In-process fan-out of property events to server-sent event streams.
+
+    Each event is encoded once, appended to a short retained log and handed
+    to every subscribed event loop with a single `call_soon_threadsafe`;
+    the loop then queues it for each matching subscriber. Idle subscribers
+    just await an `asyncio.Event`, so they cost no CPU between events and
+    heartbeats. A subscriber whose queue reaches STREAM_QUEUE_SIZE is
+    dropped: its stream ends and the client reconnects with Last-Event-ID.
+
+    Event ids are `<epoch>-<seq>`, the epoch being random per process. A
+    Last-Event-ID from another process or older than the retained log gets
+    a `reset` event first, telling the client to refetch the listing.
+    """
+
+    def __init__(self):
+        self.epoch = os.urandom(4).hex()
+        self.log: Deque[StreamEvent] = deque()
+        self.subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscriber]] = {}
+        self.published = 0
+        self.dropped = 0
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    # Publishing (any thread)
+
+    @staticmethod
+    def kind(event: PropertyEvent) -> Optional[str]:
+        if event.action == "updated":
+            return "status" if "status" in event.changed else "updated"
+        if event.action in ("created", "deleted"):
+            return event.action
+        return None
+
+    def handle(self, event: PropertyEvent):
+        kind = self.kind(event)
+        if kind is None:
+            return
+        if event.data is not None:
+            payload = {field: event.data.get(field) for field in FIELDS}
+        else:
+            payload = {"id": event.property_id}
+        with self._lock:
+            seq = next(self._seq)
+            frame = (
+                f"id: {self.epoch}-{seq}\nevent: {kind}\ndata: ".encode()
+                + orjson.dumps(payload, default=_default)
+                + b"\n\n"
+            )
+            entry = StreamEvent(seq, event.data, frame)
+            self.log.append(entry)
+            while len(self.log) > settings.STREAM_RETAINED_EVENTS:
+                self.log.popleft()
+            self._last_seq = seq
+            self.published += 1
+            loops = list(self.subscribers)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, loop, entry)
+            except RuntimeError:
+                # Loop closed without unsubscribing (shutdown)
+                with self._lock:
+                    self.subscribers.pop(loop, None)
+
+    def _fan_out(self, loop: asyncio.AbstractEventLoop, entry: StreamEvent):
+        for subscriber in list(self.subscribers.get(loop, ())):
+            if subscriber.filter.matches(entry.data) and not subscriber.offer(entry):
+                self.dropped += 1
+                self.unsubscribe(subscriber)
+
+    # Subscribing (on the subscriber's event loop)
+
+    def _parse(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence number of a Last-Event-ID from this process, else None"""
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, stream_filter: StreamFilter, last_event_id: Optional[str] = None) -> Tuple[Subscriber, List[bytes]]:
+        """Register a subscriber; returns it with the frames it missed since `last_event_id`"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            backlog = []
+            if last_event_id:
+                seq = self._parse(last_event_id)
+                oldest = self.log[0].seq if self.log else self._last_seq + 1
+                if seq is None or seq > self._last_seq or seq < oldest - 1:
+                    backlog.append(b"event: reset\ndata: {}\n\n")
+                else:
+                    backlog.extend(
+                        entry.frame for entry in self.log
+                        if entry.seq > seq and stream_filter.matches(entry.data)
+                    )
+            subscriber = Subscriber(stream_filter, loop, self._last_seq)
+            self.subscribers.setdefault(loop, set()).add(subscriber)
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            subscribers = self.subscribers.get(subscriber.loop)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[subscriber.loop]
+
+    async def stream(self, stream_filter: StreamFilter, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """SSE body for one client: retry hint, missed events, then live events and heartbeats"""
+        subscriber, backlog = self.subscribe(stream_filter, last_event_id)
+        try:
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n".encode()
+            for frame in backlog:
+                yield frame
+            while True:
+                frame = await subscriber.next(settings.STREAM_HEARTBEAT_SECONDS)
+                if frame is not None:
+                    yield frame
+                elif subscriber.dropped:
+                    return
+                else:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+listing_broker = ListingBroker()
+property_events.subscribe(listing_broker.handle)
@@ -0,0 +1,254 @@
+# app/core/market_stats.py
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.property import get_changed_since, get_last_change
+from ..models.property import Property, PropertyStatus
+from .events import PropertyEvent, property_events
+
+# (city, property_type, bedrooms)
+GroupKey = Tuple[str, str, int]
+
+COLUMNS = (Property.id, Property.status, Property.city, Property.property_type,
+           Property.bedrooms, Property.price, Property.area)
+
+
+class Group:
+    """Running figures for one group; prices are whole paise so sums stay exact"""
+    __slots__ = ("count", "price_sum", "area_sum", "prices")
+
+    def __init__(self):
+        self.count = 0
+        self.price_sum = 0
+        self.area_sum = 0
+        self.prices: List[int] = []   # sorted, for the median
+
+    def add(self, price: int, area: int):
+        self.count += 1
+        self.price_sum += price
+        self.area_sum += area
+        insort(self.prices, price)
+
+    def remove(self, price: int, area: int):
+        self.count -= 1
+        self.price_sum -= price
+        self.area_sum -= area
+        del self.prices[bisect_left(self.prices, price)]
+
+    @property
+    def median(self) -> Optional[float]:
+        n = len(self.prices)
+        if not n:
+            return None
+        mid = n // 2
+        median = self.prices[mid] if n % 2 else (self.prices[mid - 1] + self.prices[mid]) / 2
+        return median / 100
+
+    def summary(self, key: GroupKey) -> dict:
+        city, property_type, bedrooms = key
+        return {
+            "city": city,
+            "property_type": property_type,
+            "bedrooms": bedrooms,
+            "count": self.count,
+            "avg_price": round(self.price_sum / self.count / 100, 2),
+            "median_price": self.median,
+            # Area-weighted: total price over total area of the group
+            "price_per_sqft": round(self.price_sum / self.area_sum / 100, 2) if self.area_sum else None,
+        }
+
+
+def _record(data: dict) -> Optional[Tuple[GroupKey, int, int]]:
+    """Group and measures for one property's column values; None if it is not available inventory"""
+    if data.get("status") != PropertyStatus.AVAILABLE:
+        return None
+    property_type = data["property_type"]
+    key = (data.get("city") or "", getattr(property_type, "value", property_type), data.get("bedrooms") or 0)
+    return key, int(round(data["price"] * 100)), data.get("area") or 0
+
+
+def _apply(groups: Dict[GroupKey, Group], records: dict, property_id: int, record):
+    """Retract the property's previous contribution, if any, and add `record` (None: remove it)"""
+    old = records.pop(property_id, None)
+    if old is not None:
+        key, price, area = old
+        group = groups[key]
+        group.remove(price, area)
+        if not group.count:
+            del groups[key]
+    if record is not None:
+        records[property_id] = record
+        key, price, area = record
+        groups.setdefault(key, Group()).add(price, area)
+
+
+class MarketStats:
+    """
+    Count, average and median price and price per square foot of available
+    inventory by city x type x bedrooms, kept in memory.
+
+    Each property's contribution is remembered by id, so an update or status
+    change retracts the old values before adding the new ones; no event
+    needs a query. The serialized response is rebuilt at most once per
+    change, on the next read.
+
+    Rows changed by other workers are picked up from the `updated_at`
+    watermark at most every MARKET_STATS_REFRESH_SECONDS; if the available
+    count then disagrees (rows deleted elsewhere), everything is reloaded.
+    Events that arrive while a scan runs are replayed over its result, so a
+    scan never has to be repeated and never undoes a newer event.
+    """
+
+    def __init__(self):
+        self.groups: Dict[GroupKey, Group] = {}
+        self.records: Dict[int, Tuple[GroupKey, int, int]] = {}
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at = 0.0
+        self.version = 0
+        self._body: Optional[bytes] = None
+        self._replay: Optional[list] = None  # (property_id, record) seen during the running scan
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+
+    def load(self, db: Session):
+        with self._scan_lock:
+            self._start_scan()
+            watermark = get_last_change(db)
+            groups, records = self._compute(db)
+            with self._lock:
+                self._finish_scan(groups, records)
+                self.groups, self.records = groups, records
+                self.watermark = watermark
+                self.refreshed_at = time.monotonic()
+                self.loaded = True
+                self._changed()
+
+    def refresh(self, db: Session):
+        """Load on first use; afterwards pick up rows changed since the watermark"""
+        if not self.loaded:
+            self.load(db)
+            return
+        now = time.monotonic()
+        if now - self.refreshed_at < settings.MARKET_STATS_REFRESH_SECONDS:
+            return
+        with self._scan_lock:
+            self._start_scan()
+            self.refreshed_at = now
+            rows, watermark = get_changed_since(db, COLUMNS, self.watermark)
+            available = db.execute(
+                select(func.count()).select_from(Property).where(Property.status == PropertyStatus.AVAILABLE)
+            ).scalar()
+            with self._lock:
+                changed = False
+                for row in rows:
+                    record = _record(row._mapping)
+                    if record != self.records.get(row.id):
+                        _apply(self.groups, self.records, row.id, record)
+                        changed = True
+                # A row read before a newer event may have undone it: replay to restore the event's values
+                if self._finish_scan(self.groups, self.records) or changed:
+                    self._changed()
+                self.watermark = watermark
+                deleted_elsewhere = len(self.records) != available
+        if deleted_elsewhere:
+            self.load(db)
+
+    @staticmethod
+    def _compute(db: Session):
+        groups: Dict[GroupKey, Group] = {}
+        records = {}
+        rows = db.execute(
+            select(*COLUMNS)
+            .where(Property.status == PropertyStatus.AVAILABLE)
+            .execution_options(yield_per=5000)
+        ).mappings()
+        for row in rows:
+            record = _record(row)
+            records[row["id"]] = record
+            key, price, area = record
+            groups.setdefault(key, Group()).add(price, area)
+        return groups, records
+
+    def _start_scan(self):
+        with self._lock:
+            self._replay = []
+
+    def _finish_scan(self, groups: Dict[GroupKey, Group], records: dict) -> int:
+        """Apply the events seen since `_start_scan` over a scan's result; call with the lock held"""
+        replay, self._replay = self._replay, None
+        for property_id, record in replay:
+            _apply(groups, records, property_id, record)
+        return len(replay)
+
+    def _changed(self):
+        self.version += 1
+        self._body = None
+
+    def handle(self, event: PropertyEvent):
+        if event.action == "image_added":
+            return
+        record = _record(event.data) if event.data is not None else None
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((event.property_id, record))
+            if not self.loaded:
+                return
+            if record == self.records.get(event.property_id):
+                return
+            _apply(self.groups, self.records, event.property_id, record)
+            self._changed()
+
+    def body(self, db: Session) -> bytes:
+        self.refresh(db)
+        body = self._body
+        if body is None:
+            with self._lock:
+                groups = [
+                    group.summary(key)
+                    for key, group in sorted(self.groups.items(), key=lambda item: item[0])
+                ]
+                body = self._body = orjson.dumps({
+                    "version": self.version,
+                    "total": len(self.records),
+                    "groups": groups,
+                })
+        return body
+
+    def check(self, db: Session, repair: bool = False) -> dict:
+        """Recompute from scratch and report groups whose figures differ from the maintained ones"""
+        if not self.loaded:
+            self.load(db)
+        with self._scan_lock:
+            self._start_scan()
+            fresh, records = self._compute(db)
+            with self._lock:
+                # Events during the scan are applied to both sides, so they never count as drift
+                self._finish_scan(fresh, records)
+                drift = self._drift(fresh)
+                if repair and drift:
+                    self.groups, self.records = fresh, records
+                    self._changed()
+        return {"consistent": not drift, "groups": len(fresh), "drift": drift, "repaired": bool(repair and drift)}
+
+    def _drift(self, fresh: Dict[GroupKey, Group]) -> List[dict]:
+        drift = []
+        for key in sorted(set(fresh) | set(self.groups)):
+            expected, actual = fresh.get(key), self.groups.get(key)
+            expected_summary = expected.summary(key) if expected else None
+            actual_summary = actual.summary(key) if actual else None
+            if expected_summary != actual_summary:
+                drift.append({"group": list(key), "expected": expected_summary, "actual": actual_summary})
+        return drift
+
+
+market_stats = MarketStats()
+property_events.subscribe(market_stats.handle)
@@ -0,0 +1,320 @@
+# app/core/metrics.py
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .query_timing import add_query_listener
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        # Rendered `{a="x",b="y"}` per label tuple, built once per series
+        self._label_text: Dict[tuple, str] = {}
+
+    def _labels(self, key: tuple) -> str:
+        text = self._label_text.get(key)
+        if text is None:
+            pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, key))
+            text = "{" + pairs + "}" if pairs else ""
+            self._label_text[key] = text
+        return text
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, key: tuple = ()):
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{self._labels(k)} {v}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, key: tuple = ()):
+        self._values[key] = value
+
+    def inc(self, amount: float = 1, key: tuple = ()):
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, key: tuple = ()):
+        self._values[key] = self._values.get(key, 0) - amount
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{self._labels(k)} {v}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram. Each series is a flat list of per-bucket counts
+    (plus +Inf), its sum and its count; observing is one bisect and three
+    in-place updates. Buckets are made cumulative only when rendering.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        self._bucket_text = [f'le="{b}"' for b in self.buckets] + ['le="+Inf"']
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, key: tuple = ()):
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total, count) in self._series.items():
+            labels = self._labels(key)
+            prefix = labels[:-1] + "," if labels else "{"
+            cumulative = 0
+            for le, n in zip(self._bucket_text, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{prefix}{le}}} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], Iterable[_Metric]]] = []
+        self.collector_errors = Counter(
+            "metrics_collector_errors_total", "Scrape-time collectors that raised (their metrics were skipped)",
+            ("collector",))
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]):
+        """Register a callable producing metrics at scrape time (e.g. from other modules' stats)"""
+        self.collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        collected = []
+        for collector in self.collectors:
+            # One broken component must not take the whole scrape down with it
+            try:
+                for metric in collector():
+                    collected.extend(metric.render())
+            except Exception:
+                logger.exception("Metrics collector %r failed", collector)
+                self.collector_errors.inc(key=(getattr(collector, "__name__", repr(collector)),))
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        lines.extend(self.collector_errors.render())
+        lines.extend(collected)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.add(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")))
+REQUEST_LATENCY = registry.add(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+RESPONSE_SIZE = registry.add(Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS))
+IN_FLIGHT = registry.add(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"))
+DB_TIME = registry.add(Histogram(
+    "http_request_db_seconds", "Database time spent per request", ("method", "route")))
+DB_QUERIES = registry.add(Histogram(
+    "http_request_db_queries", "Database queries issued per request", ("method", "route"), QUERY_COUNT_BUCKETS))
+
+
+# Counters kept by other modules, read at scrape time; one collector per
+# module, so a failing import or stats object only drops its own metrics
+
+@registry.add_collector
+def _rate_limit_metrics():
+    from .rate_limit import rate_limit_stats
+
+    rejected = Counter("rate_limit_rejected_total", "Requests rejected by the rate limiter", ("rule", "bucket"))
+    for key, count in rate_limit_stats.rejected.items():
+        rejected.inc(count, key)
+    backend_errors = Counter("rate_limit_backend_errors_total", "Rate limiter storage failures (requests allowed)")
+    backend_errors.inc(rate_limit_stats.backend_errors)
+    return rejected, backend_errors
+
+
+@registry.add_collector
+def _response_cache_metrics():
+    from .response_cache import response_cache
+
+    cache = Counter("response_cache_lookups_total", "Response cache lookups", ("result",))
+    cache.inc(response_cache.hits, ("hit",))
+    cache.inc(response_cache.misses, ("miss",))
+    return cache,
+
+
+@registry.add_collector
+def _inquiry_buffer_metrics():
+    from .inquiry_buffer import inquiry_buffer
+
+    pending = Gauge("inquiry_buffer_pending", "Inquiries waiting in the write-behind buffer")
+    pending.set(inquiry_buffer.pending)
+    flushed = Counter("inquiry_buffer_flushed_total", "Inquiries inserted by the write-behind buffer")
+    flushed.inc(inquiry_buffer.flushed)
+    failed = Counter("inquiry_buffer_failed_flushes_total", "Write-behind flushes that failed and were retried")
+    failed.inc(inquiry_buffer.failed_flushes)
+    rejected = Counter("inquiry_buffer_rejected_total", "Buffered inquiries the database refused (logged)")
+    rejected.inc(inquiry_buffer.rejected)
+    return pending, flushed, failed, rejected
+
+
+@registry.add_collector
+def _search_alert_metrics():
+    from .search_alerts import search_alerts
+
+    pending = Gauge("search_alerts_pending", "Listing writes waiting to be matched against saved searches")
+    pending.set(search_alerts.pending)
+    matched = Counter("search_alerts_matched_total", "Listing writes matched against saved searches")
+    matched.inc(search_alerts.matched)
+    dropped = Counter("search_alerts_dropped_total", "Listing writes not matched because the queue was full")
+    dropped.inc(search_alerts.dropped)
+    failed = Counter("search_alerts_failed_batches_total", "Matching batches that failed (logged and skipped)")
+    failed.inc(search_alerts.failed_batches)
+    return pending, matched, dropped, failed
+
+
+@registry.add_collector
+def _slow_query_metrics():
+    from .slow_query import slow_query_log
+
+    slow = Counter("db_slow_queries_total", "Statements slower than the slow-query threshold", ("sampled",))
+    slow.inc(slow_query_log.slow - slow_query_log.suppressed, ("true",))
+    slow.inc(slow_query_log.suppressed, ("false",))
+    return slow,
+
+
+@registry.add_collector
+def _archival_metrics():
+    from .archival import listing_archiver
+
+    archived = Counter("listings_archived_total", "Listings moved to the archive tables")
+    archived.inc(listing_archiver.archived)
+    failed = Counter("listing_archival_failed_runs_total", "Periodic archival runs that failed")
+    failed.inc(listing_archiver.failed_runs)
+    return archived, failed
+
+
+@registry.add_collector
+def _coalescing_metrics():
+    from .coalescing import coalescing_stats
+
+    coalesced = Counter(
+        "request_coalescing_requests_total", "Coalescible GETs that ran the handler or shared a response",
+        ("route", "role"))
+    ratio = Gauge("request_coalescing_collapse_ratio", "Coalescible GETs served per handler run", ("route",))
+    for route, count in list(coalescing_stats.leaders.items()):
+        coalesced.inc(count, (route, "leader"))
+        coalesced.inc(coalescing_stats.followers.get(route, 0), (route, "follower"))
+        ratio.set(coalescing_stats.collapse_ratio(route), (route,))
+    return coalesced, ratio
+
+
+class RequestDBStats:
+    """Database work attributed to the current request"""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Shared with worker threads: anyio copies the context into run_sync, and the
+# stats object itself is mutated in place.
+current_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("current_db_stats", default=None)
+
+
+def _record_db_stats(conn, cursor, statement, parameters, executemany, seconds):
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += seconds
+
+
+def instrument_engines():
+    """Time every statement on every engine; safe to call more than once"""
+    add_query_listener(_record_db_stats)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Record latency, status, size and DB work per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = RequestDBStats()
+        token = current_db_stats.set(stats)
+        response = [500, 0]  # status, body bytes
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                response[1] += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            current_db_stats.reset(token)
+            key = (scope["method"], route_template(scope))
+            REQUESTS.inc(key=key + (response[0],))
+            REQUEST_LATENCY.observe(time.perf_counter() - start, key)
+            RESPONSE_SIZE.observe(response[1], key)
+            DB_TIME.observe(stats.seconds, key)
+            DB_QUERIES.observe(stats.queries, key)
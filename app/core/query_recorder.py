@@ -0,0 +1,189 @@
+# app/core/query_recorder.py
+import logging
+import os
+import traceback
+from collections import Counter
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from . import query_timing
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# This module and the timing hook are on the stack of every recorded statement
+_HOOK_FILES = {os.path.abspath(__file__), os.path.abspath(query_timing.__file__)}
+
+
+@dataclass(frozen=True)
+class RecordedQuery:
+    statement: str
+    seconds: float
+    call_site: Tuple[str, ...]   # innermost application frames, "file:line in function"
+
+
+def _call_site(depth: int = 3) -> Tuple[str, ...]:
+    """The application frames that led to the current statement, innermost first"""
+    frames = []
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_APP_DIR) and filename not in _HOOK_FILES:
+            frames.append(f"{os.path.relpath(filename, os.path.dirname(_APP_DIR))}:{frame.lineno} in {frame.name}")
+            if len(frames) == depth:
+                break
+    return tuple(frames)
+
+
+class QueryRecorder:
+    """
+    Records every SQL statement executed while active.
+
+    Use as a context manager (global: sees statements from every thread,
+    as needed with TestClient) or via `QueryDebugMiddleware`, which scopes
+    a recorder to one request.
+    """
+
+    def __init__(self, capture_call_sites: bool = True):
+        self.capture_call_sites = capture_call_sites
+        self.queries: List[RecordedQuery] = []
+
+    def add(self, statement: str, seconds: float, call_site: Tuple[str, ...]):
+        self.queries.append(RecordedQuery(statement, seconds, call_site))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def seconds(self) -> float:
+        return sum(query.seconds for query in self.queries)
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int, List[Tuple[str, ...]]]]:
+        """Identical statements run `threshold` or more times: the N+1 signature"""
+        counts = Counter(query.statement for query in self.queries)
+        result = []
+        for statement, count in counts.most_common():
+            if count < threshold:
+                break
+            sites = list(dict.fromkeys(q.call_site for q in self.queries if q.statement == statement))
+            result.append((statement, count, sites))
+        return result
+
+    def report(self, threshold: int = 2) -> str:
+        lines = [f"{self.count} queries, {self.seconds * 1000:.1f} ms"]
+        for statement, count, sites in self.repeated(threshold):
+            lines.append(f"  repeated {count}x: {' '.join(statement.split())[:200]}")
+            for site in sites:
+                lines.append("    from " + " <- ".join(site or ("<outside app>",)))
+        return "\n".join(lines)
+
+    def __enter__(self):
+        install_query_recorder()
+        _global_recorders.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _global_recorders.remove(self)
+        return False
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class assert_query_budget(ContextDecorator):
+    """
+    Fail when the wrapped block or function runs more than `max_queries`
+    statements, or (unless `allow_repeats`) repeats an identical statement.
+
+        with assert_query_budget(2):
+            client.get("/api/v1/properties/")
+
+        @assert_query_budget(1)
+        def test_something(): ...
+    """
+
+    def __init__(self, max_queries: int, allow_repeats: bool = False, repeat_threshold: int = 2):
+        self.max_queries = max_queries
+        self.allow_repeats = allow_repeats
+        self.repeat_threshold = repeat_threshold
+        self.recorder: Optional[QueryRecorder] = None
+
+    def __enter__(self):
+        self.recorder = QueryRecorder().__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            return False
+        if self.recorder.count > self.max_queries:
+            raise QueryBudgetExceeded(
+                f"Query budget of {self.max_queries} exceeded\n{self.recorder.report(self.repeat_threshold)}"
+            )
+        if not self.allow_repeats and self.recorder.repeated(self.repeat_threshold):
+            raise QueryBudgetExceeded(
+                f"Repeated identical statements (N+1?)\n{self.recorder.report(self.repeat_threshold)}"
+            )
+        return False
+
+
+_global_recorders: List[QueryRecorder] = []
+_request_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("request_query_recorder", default=None)
+
+
+def _record(conn, cursor, statement, parameters, executemany, seconds):
+    recorders = list(_global_recorders)
+    request_recorder = _request_recorder.get()
+    if request_recorder is not None:
+        recorders.append(request_recorder)
+    if not recorders:
+        return
+    site = _call_site() if any(r.capture_call_sites for r in recorders) else ()
+    for recorder in recorders:
+        recorder.add(statement, seconds, site)
+
+
+def install_query_recorder():
+    """Attach the recording hook to every engine; safe to call more than once"""
+    query_timing.add_query_listener(_record)
+
+
+class QueryDebugMiddleware:
+    """
+    Debug mode: add X-Query-Count and X-DB-Time (ms) to every response and
+    log repeated identical statements with the application call sites.
+    """
+
+    def __init__(self, app, repeat_threshold: int = 2):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        install_query_recorder()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = _request_recorder.set(recorder)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(recorder.count).encode()))
+                headers.append((b"x-db-time", f"{recorder.seconds * 1000:.2f}".encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_recorder.reset(token)
+            if recorder.repeated(self.repeat_threshold):
+                logger.warning(
+                    "Possible N+1 on %s %s: %s",
+                    scope["method"], scope["path"], recorder.report(self.repeat_threshold)
+                )
@@ -0,0 +1,44 @@
+# app/core/query_timing.py
+import time
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# (conn, cursor, statement, parameters, executemany, seconds)
+QueryListener = Callable[..., None]
+
+_listeners: List[QueryListener] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    for listener in list(_listeners):
+        listener(conn, cursor, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def add_query_listener(listener: QueryListener):
+    """
+    Call `listener` with the duration of every statement on every engine.
+    One set of cursor hooks times each statement once for all listeners;
+    safe to call more than once.
+    """
+    for name, fn in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(Engine, name, fn):
+            event.listen(Engine, name, fn)
+    if listener not in _listeners:
+        _listeners.append(listener)
@@ -0,0 +1,251 @@
+# app/core/rate_limit.py
+import json
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..config import settings
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Token-bucket limits for one (method, path) pair.
+
+    Every client IP gets its own bucket, and the route as a whole gets a
+    shared bucket so a botnet spread over many IPs still cannot saturate
+    the database.
+    """
+    name: str
+    method: str
+    path: str
+    ip_rate: float        # tokens per second, per client IP
+    ip_burst: int
+    route_rate: float     # tokens per second, whole route
+    route_burst: int
+
+
+class BucketBackend:
+    """Storage for token buckets. Subclass this for a shared store."""
+
+    def consume(self, key: str, rate: float, burst: int, now: float) -> float:
+        """
+        Take one token from the bucket at `key`.
+        Returns 0 if the request is allowed, otherwise the number of seconds
+        until a token will be available.
+        """
+        raise NotImplementedError
+
+    async def consume_async(self, key: str, rate: float, burst: int, now: float) -> float:
+        """`consume` for the middleware; network-backed stores override it so the event loop never blocks"""
+        return self.consume(key, rate, burst, now)
+
+
+class InMemoryBucketBackend(BucketBackend):
+    """
+    Per-process buckets stored as (tokens, last_refill) tuples.
+
+    There is no lock: the middleware runs on the event loop, and each
+    bucket update is a single dict assignment. The worst a thread race
+    can do is let one extra request through.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def consume(self, key: str, rate: float, burst: int, now: float) -> float:
+        state = self._buckets.get(key)
+        if state is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            self._buckets[key] = (burst - 1.0, now)
+            return 0.0
+
+        tokens, last = state
+        tokens = min(float(burst), tokens + (now - last) * rate)
+        if tokens >= 1.0:
+            self._buckets[key] = (tokens - 1.0, now)
+            return 0.0
+
+        self._buckets[key] = (tokens, now)
+        return (1.0 - tokens) / rate
+
+    def _prune(self, now: float, idle_seconds: float = 60.0):
+        """Drop buckets that have been idle long enough to be full again"""
+        stale = [key for key, (_, last) in self._buckets.items() if now - last > idle_seconds]
+        for key in stale:
+            self._buckets.pop(key, None)
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class RedisBucketBackend(BucketBackend):
+    """
+    Buckets shared by every worker, updated atomically by a Lua script.
+    Uses the asyncio client: the middleware awaits each round trip.
+    """
+
+    _SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local tokens = tonumber(state[1]) or burst
+    local last = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - last) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'last', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RATE_LIMIT_STORAGE_URL points at Redis but the 'redis' package is not installed"
+            ) from exc
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self._SCRIPT)
+
+    async def consume_async(self, key: str, rate: float, burst: int, now: float) -> float:
+        return float(await self._consume(keys=[self.prefix + key], args=[rate, burst, now]))
+
+
+class RateLimitStats:
+    """Counters for rejected requests, keyed by (rule name, bucket scope)"""
+
+    def __init__(self):
+        self.rejected: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.backend_errors = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "rejected": {f"{name}:{scope}": count for (name, scope), count in self.rejected.items()},
+            "backend_errors": self.backend_errors,
+        }
+
+
+rate_limit_stats = RateLimitStats()
+
+
+def default_rules() -> Tuple[RateLimitRule, ...]:
+    prefix = settings.API_V1_PREFIX
+    return (
+        RateLimitRule(
+            name="login",
+            method="POST",
+            path=f"{prefix}/auth/login",
+            ip_rate=settings.RATE_LIMIT_LOGIN_PER_MINUTE / 60.0,
+            ip_burst=settings.RATE_LIMIT_LOGIN_BURST,
+            route_rate=settings.RATE_LIMIT_ROUTE_PER_SECOND,
+            route_burst=settings.RATE_LIMIT_ROUTE_BURST,
+        ),
+        RateLimitRule(
+            name="inquiry_create",
+            method="POST",
+            path=f"{prefix}/inquiries",
+            ip_rate=settings.RATE_LIMIT_INQUIRY_PER_MINUTE / 60.0,
+            ip_burst=settings.RATE_LIMIT_INQUIRY_BURST,
+            route_rate=settings.RATE_LIMIT_ROUTE_PER_SECOND,
+            route_burst=settings.RATE_LIMIT_ROUTE_BURST,
+        ),
+    )
+
+
+def get_backend(storage_url: Optional[str] = None) -> BucketBackend:
+    if storage_url and storage_url.startswith(("redis://", "rediss://")):
+        return RedisBucketBackend(storage_url)
+    return InMemoryBucketBackend()
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying token-bucket limits to selected routes.
+
+    Requests to routes without a rule cost a single dict lookup.
+    """
+
+    def __init__(
+        self,
+        app,
+        rules: Optional[Iterable[RateLimitRule]] = None,
+        backend: Optional[BucketBackend] = None,
+        trust_forwarded: Optional[bool] = None,
+        stats: Optional[RateLimitStats] = None,
+    ):
+        self.app = app
+        self.rules = {
+            (rule.method, rule.path.rstrip("/")): rule
+            for rule in (rules if rules is not None else default_rules())
+        }
+        self.backend = backend or get_backend(settings.RATE_LIMIT_STORAGE_URL)
+        self.trust_forwarded = (
+            settings.RATE_LIMIT_TRUST_FORWARDED if trust_forwarded is None else trust_forwarded
+        )
+        self.stats = stats or rate_limit_stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.rules.get((scope["method"], scope["path"].rstrip("/")))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self._check(rule, self._client_ip(scope))
+        if retry_after:
+            await self._reject(send, retry_after)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _check(self, rule: RateLimitRule, client_ip: str) -> float:
+        now = time.time()
+        try:
+            wait = await self.backend.consume_async(f"{rule.name}:ip:{client_ip}", rule.ip_rate, rule.ip_burst, now)
+            if wait:
+                self.stats.rejected[(rule.name, "ip")] += 1
+                return wait
+
+            wait = await self.backend.consume_async(f"{rule.name}:route", rule.route_rate, rule.route_burst, now)
+            if wait:
+                self.stats.rejected[(rule.name, "route")] += 1
+            return wait
+        except Exception:
+            # Never take the API down because the shared store is unavailable
+            self.stats.backend_errors += 1
+            return 0.0
+
+    def _client_ip(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _reject(self, send, retry_after: float):
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
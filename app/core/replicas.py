@@ -0,0 +1,136 @@
+# app/core/replicas.py
+import itertools
+import logging
+import time
+from typing import Optional, Sequence
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Set after an authenticated write; while present, reads go to the primary
+STICKY_COOKIE = "read_primary"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_POSTGRES_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def replica_lag(conn) -> Optional[float]:
+    """
+    Replication delay in seconds, or None when the backend cannot report it.
+    On Postgres a replica that has replayed everything it received counts as
+    0, so an idle primary does not look like lag.
+    """
+    if conn.dialect.name == "postgresql":
+        lag = conn.execute(_POSTGRES_LAG).scalar()
+        return float(lag) if lag is not None else None
+    conn.execute(text("SELECT 1"))
+    return None
+
+
+class Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.down_until = 0.0
+        self.checked_at = float("-inf")
+        self.lag: Optional[float] = None
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas, skipping any that recently failed or
+    are lagging. Health and lag are probed at most every `check_seconds`
+    per replica, not per request; a replica that errors is skipped for
+    `retry_seconds`, and reads fall back to the primary when none is usable.
+    """
+
+    def __init__(self, engines: Sequence[Engine], max_lag: float, check_seconds: float, retry_seconds: float):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_seconds = check_seconds
+        self.retry_seconds = retry_seconds
+        self.fallbacks = 0
+        self._next = itertools.count()
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: Replica):
+        def handle_error(exception_context):
+            if exception_context.is_disconnect:
+                self.mark_down(replica, exception_context.original_exception)
+        return handle_error
+
+    def mark_down(self, replica: Replica, exc: BaseException):
+        replica.down_until = time.monotonic() + self.retry_seconds
+        replica.failures += 1
+        logger.warning("Read replica %s unavailable, using other sources for %.0f s: %s",
+                       replica.name, self.retry_seconds, exc)
+
+    def _usable(self, replica: Replica, now: float) -> bool:
+        if now < replica.down_until:
+            return False
+        if now - replica.checked_at >= self.check_seconds:
+            replica.checked_at = now
+            try:
+                with replica.engine.connect() as conn:
+                    replica.lag = replica_lag(conn)
+            except Exception as exc:
+                self.mark_down(replica, exc)
+                return False
+        return replica.lag is None or replica.lag <= self.max_lag
+
+    def pick(self) -> Optional[Engine]:
+        """An engine for the next healthy replica, or None to use the primary"""
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self._usable(replica, now):
+                return replica.engine
+        self.fallbacks += 1
+        return None
+
+
+def prefers_primary(request) -> bool:
+    """Did this client write recently enough that a replica might not have caught up?"""
+    return STICKY_COOKIE in request.cookies
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful authenticated write, set a short-lived cookie that
+    pins the client's reads to the primary until replicas have caught up.
+    """
+
+    def __init__(self, app, sticky_seconds: int):
+        self.app = app
+        self.cookie = f"{STICKY_COOKIE}=1; Max-Age={sticky_seconds}; Path=/; HttpOnly; SameSite=Lax".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        if not any(name == b"authorization" for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", self.cookie))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
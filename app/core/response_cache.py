@@ -0,0 +1,125 @@
+# app/core/response_cache.py
+import threading
+import time
+import orjson
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..config import settings
+from .compression import accepted_encoding, compress
+from .events import property_events
+from .replicas import prefers_primary
+
+
+class CachedBody:
+    """
+    A serialized response body plus its compressed variants.
+
+    Each variant is produced on first request for that encoding and reused
+    afterwards, so hot responses are never recompressed. Two threads racing
+    on a new variant may both compress it; the result is identical.
+    """
+    __slots__ = ("body", "media_type", "headers", "variants")
+
+    def __init__(self, body: bytes, media_type: str = "application/json", headers: Optional[dict] = None):
+        self.body = body
+        self.media_type = media_type
+        self.headers = headers or {}
+        self.variants: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self.variants.get(encoding)
+        if variant is None:
+            variant = compress(self.body, encoding, cached=True)
+            self.variants[encoding] = variant
+        return variant
+
+    def response(self, request: Request, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        """Build a response, picking the variant the client accepts"""
+        headers = {**self.headers, **(headers or {})}
+        headers["Vary"] = "Accept-Encoding"
+        content = self.body
+        encoding = accepted_encoding(request.headers)
+        if encoding and len(content) >= settings.COMPRESSION_MINIMUM_SIZE:
+            content = self.encoded(encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content, status_code=status_code, media_type=self.media_type, headers=headers)
+
+
+class ResponseCache:
+    """Bounded, TTL-based LRU of serialized response bodies"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedBody]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_ENABLED
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: str, body: bytes, media_type: str = "application/json", headers: Optional[dict] = None) -> CachedBody:
+        entry = CachedBody(body, media_type, headers)
+        ttl = self.ttl_seconds if self.ttl_seconds is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+        max_entries = self.max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def lookup(self, request: Request) -> Optional[CachedBody]:
+        """
+        Cached body for this request's URL, or None (also when caching is off,
+        and for clients that just wrote and must read from the primary)
+        """
+        if not self.enabled or prefers_primary(request):
+            return None
+        return self.get(cache_key(request))
+
+    def respond(self, request: Request, content, headers: Optional[dict] = None) -> Response:
+        """Serialize `content` once, cache it (with `headers`) under the request's URL and respond"""
+        body = orjson.dumps(content)
+        if not self.enabled or prefers_primary(request):
+            return Response(body, media_type="application/json", headers=headers)
+        return self.set(cache_key(request), body, headers=headers).response(request)
+
+    def clear(self, *args):
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_key(request: Request) -> str:
+    """
+    Path plus query parameters sorted by name, so equivalent URLs share an
+    entry; repeated parameters keep their order, which can be significant.
+    Values are re-encoded, so an escaped `&` or `=` cannot forge another key.
+    """
+    query = urlencode(sorted(request.query_params.multi_items(), key=lambda item: item[0]))
+    return f"{request.url.path}?{query}"
+
+
+response_cache = ResponseCache()
+
+# Any committed property change may alter cached listings and details
+property_events.subscribe(response_cache.clear)
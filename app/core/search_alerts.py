@@ -0,0 +1,275 @@
+# app/core/search_alerts.py
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..crud import saved_search as crud_saved_search
+from ..database import SessionLocal
+from ..models.property import PropertyStatus
+from .events import PropertyEvent, property_events
+
+logger = logging.getLogger(__name__)
+
+INF = float("inf")
+
+# (property type or None, lowercased city needle or None)
+BucketKey = Tuple[Optional[str], Optional[str]]
+
+
+def _value(enum_or_str):
+    return getattr(enum_or_str, "value", enum_or_str)
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A saved search reduced to what matching needs; filters follow `crud.property.get_properties`"""
+    id: int
+    user_id: int
+    property_type: Optional[str]
+    low: float                 # min_price, or -inf when unset
+    high: float                # max_price, or inf when unset
+    min_bedrooms: Optional[int]
+    city: Optional[str]        # lowercased substring
+    search: Optional[str]      # lowercased substring of title, description or address
+
+    @classmethod
+    def from_row(cls, row) -> "Predicate":
+        return cls(
+            id=row.id,
+            user_id=row.user_id,
+            property_type=_value(row.property_type) if row.property_type else None,
+            low=row.min_price if row.min_price else -INF,
+            high=row.max_price if row.max_price else INF,
+            min_bedrooms=row.min_bedrooms or None,
+            city=row.city.lower() if row.city else None,
+            search=row.search.lower() if row.search else None,
+        )
+
+    @property
+    def bucket(self) -> BucketKey:
+        return self.property_type, self.city
+
+    def matches_rest(self, data: dict) -> bool:
+        """The filters not covered by the bucket and the price interval"""
+        if self.min_bedrooms and (data.get("bedrooms") or 0) < self.min_bedrooms:
+            return False
+        if self.search:
+            return any(self.search in (data.get(field) or "").lower() for field in ("title", "description", "address"))
+        return True
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed intervals: every interval
+    containing a point in O(log n + matches).
+    """
+    __slots__ = ("center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[float, float, object]]):
+        endpoints = sorted(point for low, high, _ in intervals for point in (low, high))
+        finite = [point for point in endpoints if abs(point) != INF]
+        self.center = finite[len(finite) // 2] if finite else 0.0
+        here, left, right = [], [], []
+        for interval in intervals:
+            low, high, _ = interval
+            if high < self.center:
+                left.append(interval)
+            elif low > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_low = sorted(here, key=lambda interval: interval[0])
+        self.by_high = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def stab(self, point: float) -> List[object]:
+        found = []
+        node = self
+        while node is not None:
+            if point < node.center:
+                for low, _, item in node.by_low:
+                    if low > point:
+                        break
+                    found.append(item)
+                node = node.left
+            elif point > node.center:
+                for _, high, item in node.by_high:
+                    if high < point:
+                        break
+                    found.append(item)
+                node = node.right
+            else:
+                found.extend(item for _, _, item in node.by_low)
+                break
+        return found
+
+
+class PredicateIndex:
+    """
+    Saved searches bucketed by (type, city), each bucket holding an interval
+    tree over its price ranges. A listing visits at most the buckets for its
+    own type or "any type" crossed with "any city" and the city needles it
+    contains, stabs each tree at its price, and evaluates the remaining
+    filters (bedrooms, text) only on those candidates.
+    """
+
+    def __init__(self, predicates: List[Predicate] = ()):
+        self.buckets: Dict[BucketKey, List[Predicate]] = defaultdict(list)
+        for predicate in predicates:
+            self.buckets[predicate.bucket].append(predicate)
+        self.trees = {
+            key: IntervalTree([(p.low, p.high, p) for p in predicates])
+            for key, predicates in self.buckets.items()
+        }
+        self.cities = sorted({city for _, city in self.buckets if city is not None})
+        self.evaluated = 0   # candidates checked against the remaining filters
+
+    def __len__(self) -> int:
+        return sum(len(predicates) for predicates in self.buckets.values())
+
+    def match(self, data: dict) -> List[Predicate]:
+        property_type = _value(data.get("property_type"))
+        city = (data.get("city") or "").lower()
+        price = float(data["price"])
+        cities = [None] + [needle for needle in self.cities if needle in city]
+        matches = []
+        for key_type in (property_type, None):
+            for needle in cities:
+                tree = self.trees.get((key_type, needle))
+                if tree is None:
+                    continue
+                for predicate in tree.stab(price):
+                    self.evaluated += 1
+                    if predicate.matches_rest(data):
+                        matches.append(predicate)
+        return matches
+
+
+class SearchAlerts:
+    """
+    Matches created and updated listings against all saved searches and
+    queues a notification per match for the search's owner.
+
+    Writes only record the listing's latest values by id; a background
+    thread started from the app's lifespan drains them in batches, each
+    matched in one session with one signature check and one INSERT, so a
+    bulk write costs a batch rather than a query per listing and a failure
+    is logged and counted, never raised into the write. Until started (and
+    after `stop()`) each write is matched inline.
+
+    The predicate index is rebuilt when the saved searches' (count, max id)
+    signature changes, which one cheap query per batch detects for searches
+    created or deleted by any worker (saved searches are never edited in
+    place). Notifications are unique per (search, listing), so a listing
+    edited again is not announced twice.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_pending: int = 10000):
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self.index = PredicateIndex()
+        self.signature = None
+        self.enabled = False
+        self._pending: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.matched = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def start(self, max_pending: int = 10000):
+        self.max_pending = max_pending
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="search-alerts", daemon=True)
+        self._thread.start()
+        self.enabled = True
+
+    def stop(self):
+        """Stop the worker and match whatever is still queued"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def sync(self, db: Session):
+        signature = crud_saved_search.saved_search_signature(db)
+        if signature == self.signature:
+            return
+        index = PredicateIndex([Predicate.from_row(row) for row in crud_saved_search.get_all_saved_searches(db)])
+        with self._lock:
+            self.index, self.signature = index, signature
+
+    def match(self, db: Session, data: dict) -> List[Predicate]:
+        if data.get("status") != PropertyStatus.AVAILABLE:
+            return []
+        self.sync(db)
+        return self.index.match(data)
+
+    def handle(self, event: PropertyEvent):
+        if event.action not in ("created", "updated"):
+            return
+        with self._lock:
+            if event.data.get("status") != PropertyStatus.AVAILABLE:
+                # No longer announceable; an earlier queued write of it is moot too
+                self._pending.pop(event.property_id, None)
+                return
+            if event.property_id not in self._pending and len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                logger.warning("Search alert queue full; property %s not matched", event.property_id)
+                return
+            self._pending[event.property_id] = event.data
+        if self.enabled:
+            self._wakeup.set()
+        else:
+            self.flush()
+
+    def flush(self) -> int:
+        """Match every queued listing in one session; returns how many listings were matched"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            db = self.session_factory()
+            try:
+                self.sync(db)
+                notifications = [
+                    (predicate.id, predicate.user_id, property_id)
+                    for property_id, data in batch.items()
+                    for predicate in self.index.match(data)
+                ]
+                crud_saved_search.queue_notifications(db, notifications)
+            except Exception:
+                self.failed_batches += 1
+                logger.exception("Matching %d listings against saved searches failed", len(batch))
+                return 0
+            finally:
+                db.close()
+            self.matched += len(batch)
+            logger.debug("%d listings matched %d saved searches", len(batch), len(notifications))
+            return len(batch)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+
+search_alerts = SearchAlerts(SessionLocal)
+property_events.subscribe(search_alerts.handle)
@@ -0,0 +1,210 @@
+# app/core/similar.py
+import math
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.property import get_changed_since, get_last_change
+from ..models.property import Property, PropertyStatus, PropertyType
+from .events import PropertyEvent, property_events
+
+TYPE_CODES = {t: code for code, t in enumerate(PropertyType)}
+
+# Weights of the numeric features: price, area, bedrooms, bathrooms, furnished, parking
+FEATURE_WEIGHTS = np.array([3.0, 1.5, 1.0, 0.5, 0.25, 0.25], dtype=np.float32)
+GEO_WEIGHT = 1.0
+NO_GEO_PENALTY = 1.0   # distance term when either side has no coordinates (~10 km)
+KM_PER_DEGREE = 111.0
+GEO_SCALE_KM = 10.0
+
+COLUMNS = (
+    Property.id, Property.status, Property.property_type, Property.price, Property.area,
+    Property.bedrooms, Property.bathrooms, Property.furnished, Property.parking,
+    Property.latitude, Property.longitude,
+)
+
+
+class SimilarityIndex:
+    """
+    Compact feature matrix of available properties for "similar listings".
+
+    One float32 row per property: log price and log area standardized with
+    the statistics of the last full load, bedrooms and bathrooms, and the
+    furnished/parking flags; coordinates are kept separately in units of
+    10 km. Scoring a query masks available rows of the same type, then
+    takes a weighted squared distance over them and `argpartition`s the top
+    k, all vectorized.
+
+    Rows are upserted from property events in this process and, at most
+    every SIMILAR_REFRESH_SECONDS, from rows whose `updated_at` (or
+    `created_at`) moved past the watermark, which catches other workers.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.features = np.zeros((capacity, 6), dtype=np.float32)
+        self.geo = np.zeros((capacity, 2), dtype=np.float32)
+        self.has_geo = np.zeros(capacity, dtype=bool)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.rows: Dict[int, int] = {}
+        self.stats = (0.0, 1.0, 0.0, 1.0)   # mean/std of log price and log area
+        self.cos_lat = 1.0
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    # Loading and updating
+
+    def load(self, db: Session):
+        rows = db.execute(
+            select(*COLUMNS).where(Property.status == PropertyStatus.AVAILABLE).execution_options(yield_per=10000)
+        ).all()
+        watermark = get_last_change(db)
+        with self._lock:
+            self.size = 0
+            self.rows = {}
+            self.active[:] = False
+            self._fit(rows)
+            self._upsert(rows)
+            self.watermark = watermark
+            self.refreshed_at = time.monotonic()
+            self.loaded = True
+
+    def _fit(self, rows):
+        """Scaling statistics from a full load; kept fixed for incremental rows"""
+        prices = np.log1p(np.array([float(r.price) for r in rows], dtype=np.float64))
+        areas = np.log1p(np.array([r.area or 0 for r in rows], dtype=np.float64))
+        if len(rows):
+            self.stats = (prices.mean(), prices.std() or 1.0, areas.mean(), areas.std() or 1.0)
+            lats = [r.latitude for r in rows if r.latitude is not None]
+            if lats:
+                self.cos_lat = math.cos(math.radians(sum(lats) / len(lats)))
+
+    def _vector(self, row):
+        price_mean, price_std, area_mean, area_std = self.stats
+        features = (
+            (math.log1p(float(row.price)) - price_mean) / price_std,
+            (math.log1p(row.area or 0) - area_mean) / area_std,
+            (row.bedrooms or 0) / 2,
+            (row.bathrooms or 0) / 2,
+            1.0 if row.furnished else 0.0,
+            1.0 if row.parking else 0.0,
+        )
+        if row.latitude is None or row.longitude is None:
+            geo = None
+        else:
+            geo = (
+                row.latitude * KM_PER_DEGREE / GEO_SCALE_KM,
+                row.longitude * KM_PER_DEGREE * self.cos_lat / GEO_SCALE_KM,
+            )
+        return features, geo, TYPE_CODES[PropertyType(row.property_type)]
+
+    def _grow(self, needed: int):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("features", "geo", "has_geo", "types", "active", "ids"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def _upsert(self, rows: Iterable):
+        rows = list(rows)
+        self._grow(self.size + len(rows))
+        for row in rows:
+            available = PropertyStatus(row.status) == PropertyStatus.AVAILABLE
+            index = self.rows.get(row.id)
+            if index is None:
+                if not available:
+                    continue
+                index = self.rows[row.id] = self.size
+                self.ids[index] = row.id
+                self.size += 1
+            features, geo, type_code = self._vector(row)
+            self.features[index] = features
+            self.has_geo[index] = geo is not None
+            if geo is not None:
+                self.geo[index] = geo
+            self.types[index] = type_code
+            self.active[index] = available
+
+    def remove(self, property_id: int):
+        with self._lock:
+            index = self.rows.get(property_id)
+            if index is not None:
+                self.active[index] = False
+
+    def refresh(self, db: Session, force: bool = False):
+        """Load on first use; afterwards pick up rows changed since the watermark"""
+        if not self.loaded:
+            self.load(db)
+            return
+        now = time.monotonic()
+        if not force and now - self.refreshed_at < settings.SIMILAR_REFRESH_SECONDS:
+            return
+        self.refreshed_at = now
+        rows, watermark = get_changed_since(db, COLUMNS, self.watermark)
+        with self._lock:
+            self._upsert(rows)
+            self.watermark = watermark
+
+    def handle(self, event: PropertyEvent):
+        if not self.loaded or event.action == "image_added":
+            return
+        if event.data is None:
+            self.remove(event.property_id)
+            return
+        row = SimpleNamespace(**event.data)
+        with self._lock:
+            self._upsert([row])
+
+    # Scoring
+
+    def similar(self, property_id: int, limit: int, query_row=None) -> List[int]:
+        """Ids of the `limit` nearest available properties of the same type, nearest first"""
+        with self._lock:
+            index = self.rows.get(property_id)
+            if index is not None:
+                features, type_code = self.features[index], self.types[index]
+                geo = self.geo[index] if self.has_geo[index] else None
+            elif query_row is not None:
+                vector, geo, type_code = self._vector(query_row)
+                features = np.array(vector, dtype=np.float32)
+            else:
+                return []
+            n = self.size
+            candidates = self.active[:n] & (self.types[:n] == type_code)
+            if index is not None:
+                candidates[index] = False
+            rows = np.flatnonzero(candidates)
+            diff = self.features[rows] - features
+            scores = (diff * diff) @ FEATURE_WEIGHTS
+            if geo is not None:
+                geo_diff = self.geo[rows] - np.asarray(geo, dtype=np.float32)
+                distance = np.einsum("ij,ij->i", geo_diff, geo_diff)
+                scores += np.where(self.has_geo[rows], GEO_WEIGHT * distance, NO_GEO_PENALTY)
+            ids = self.ids[rows]
+
+        k = min(limit, len(rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(scores[top], kind="stable")]
+        return ids[top].tolist()
+
+
+similarity_index = SimilarityIndex()
+property_events.subscribe(similarity_index.handle)
@@ -0,0 +1,189 @@
+# app/core/sitemap.py
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.property import Property, PropertyStatus
+from .events import PropertyEvent, property_events
+from .http_cache import LISTING_KEY, cache_headers, listing_policy
+from .response_cache import CachedBody
+
+MEDIA_TYPE = "application/xml"
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = XML_HEADER + b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = b"</urlset>\n"
+
+
+def _shard_markers(db: Session, shard_size: int, number: Optional[int] = None) -> Dict[int, tuple]:
+    """
+    (row count, sum of versions, latest change) per shard of ids, any status.
+    Every insert, delete and update (versions are bumped by each write)
+    moves its shard's marker, even within one timestamp tick.
+    """
+    shard = ((Property.id - 1) // shard_size).label("shard")
+    query = select(
+        shard, func.count(Property.id), func.sum(Property.version),
+        func.max(func.coalesce(Property.updated_at, Property.created_at)),
+    ).group_by(shard)
+    if number is not None:
+        first_id = number * shard_size + 1
+        query = query.where(Property.id.between(first_id, first_id + shard_size - 1))
+    return {row[0]: tuple(row[1:]) for row in db.execute(query)}
+
+
+def _lastmod(value) -> str:
+    return f"<lastmod>{value.date().isoformat()}</lastmod>" if value else ""
+
+
+class Sitemap:
+    """
+    Sitemap index plus one sitemap per shard of SITEMAP_SHARD_SIZE property
+    ids, so a shard never exceeds the protocol's 50k-URL limit and a
+    property always lives in the same shard.
+
+    A shard is rendered by streaming `slug` and `updated_at` from a
+    server-side cursor, and its bytes are kept once complete. A property
+    event drops only the shard holding that id (and the small index); a
+    render that raced with such an event is not cached. Each cached shard
+    keeps the marker of its id range taken before it was read; at most every
+    SITEMAP_REFRESH_SECONDS one grouped query compares them, so changes made
+    by other workers drop only the shards they touched.
+
+    URLs are built from SITEMAP_BASE_URL and SITE_URL only, never from the
+    request's Host header.
+    """
+
+    def __init__(self):
+        self._shards: Dict[int, CachedBody] = {}
+        self._generations: Dict[int, int] = {}
+        self._markers: Dict[int, tuple] = {}   # per cached shard, as of its render
+        self._index: Optional[Tuple[CachedBody, List[int]]] = None
+        self._index_markers: Optional[Dict[int, tuple]] = None
+        self.renders = 0
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def shard_size(self) -> int:
+        return settings.SITEMAP_SHARD_SIZE
+
+    def shard_of(self, property_id: int) -> int:
+        return (property_id - 1) // self.shard_size
+
+    def index(self, db: Session) -> Tuple[CachedBody, List[int]]:
+        """The sitemap index and the shard numbers it lists"""
+        self._sync(db)
+        cached = self._index
+        if cached is not None:
+            return cached
+        base_url = settings.SITEMAP_BASE_URL.rstrip("/") + "/"
+        markers = _shard_markers(db, self.shard_size)
+        shard = ((Property.id - 1) // self.shard_size).label("shard")
+        rows = db.execute(
+            select(shard, func.max(func.coalesce(Property.updated_at, Property.created_at)))
+            .where(Property.status == PropertyStatus.AVAILABLE)
+            .group_by(shard)
+            .order_by(shard)
+        ).all()
+        parts = [XML_HEADER, b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+        for number, lastmod in rows:
+            parts.append(
+                f"<sitemap><loc>{escape(base_url)}sitemap-{number}.xml</loc>{_lastmod(lastmod)}</sitemap>\n".encode()
+            )
+        parts.append(b"</sitemapindex>\n")
+        cached = (CachedBody(b"".join(parts), MEDIA_TYPE), [number for number, _ in rows])
+        with self._lock:
+            self._index, self._index_markers = cached, markers
+        return cached
+
+    def _sync(self, db: Session):
+        """Drop the cached shards (and the index) whose id range changed in a way this process did not see"""
+        now = time.monotonic()
+        if now - self.checked_at < settings.SITEMAP_REFRESH_SECONDS:
+            return
+        self.checked_at = now
+        markers = _shard_markers(db, self.shard_size)
+        with self._lock:
+            for number, marker in list(self._markers.items()):
+                if markers.get(number) != marker:
+                    self._drop(number)
+            if self._index_markers != markers:
+                self._index = None
+
+    def shard(self, number: int, session_factory: Callable[[], Session]):
+        """Cached bytes for a shard, or a generator streaming (and then caching) it"""
+        cached = self._shards.get(number)
+        if cached is not None:
+            return cached
+        return self._render(number, session_factory)
+
+    def _render(self, number: int, session_factory: Callable[[], Session]) -> Iterator[bytes]:
+        generation = self._generations.get(number, 0)
+        site_url = settings.SITE_URL.rstrip("/")
+        first_id = number * self.shard_size + 1
+        chunks = [URLSET_OPEN]
+        yield URLSET_OPEN
+
+        db = session_factory()
+        try:
+            # Taken before the rows: a change in between leaves the marker behind, never ahead
+            marker = _shard_markers(db, self.shard_size, number).get(number)
+            result = db.execute(
+                select(Property.slug, func.coalesce(Property.updated_at, Property.created_at))
+                .where(Property.id.between(first_id, first_id + self.shard_size - 1))
+                .where(Property.status == PropertyStatus.AVAILABLE)
+                .order_by(Property.id)
+                .execution_options(yield_per=settings.SITEMAP_FETCH_SIZE)
+            )
+            for rows in result.partitions():
+                chunk = "".join(
+                    f"<url><loc>{site_url}/properties/{escape(slug)}</loc>{_lastmod(lastmod)}</url>\n"
+                    for slug, lastmod in rows
+                ).encode()
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            db.close()
+
+        chunks.append(URLSET_CLOSE)
+        yield URLSET_CLOSE
+        with self._lock:
+            if self._generations.get(number, 0) == generation:
+                self._shards[number] = CachedBody(b"".join(chunks), MEDIA_TYPE)
+                self._markers[number] = marker
+        self.renders += 1
+
+    def _drop(self, number: int):
+        """Forget a shard and any render of it in flight; call with the lock held"""
+        self._generations[number] = self._generations.get(number, 0) + 1
+        self._shards.pop(number, None)
+        self._markers.pop(number, None)
+
+    def handle(self, event: PropertyEvent):
+        with self._lock:
+            # The next render records the shard's new marker, so the sync will not drop it again
+            self._drop(self.shard_of(event.property_id))
+            self._index = None
+
+    def clear(self):
+        with self._lock:
+            for number in list(self._shards):
+                self._drop(number)
+            self._index = None
+
+
+def sitemap_response(request, content) -> Response:
+    headers = cache_headers(request, listing_policy(), [LISTING_KEY, "sitemap"])
+    if isinstance(content, CachedBody):
+        return content.response(request, headers=headers)
+    return StreamingResponse(content, media_type=MEDIA_TYPE, headers=headers)
+
+
+sitemap = Sitemap()
+property_events.subscribe(sitemap.handle)
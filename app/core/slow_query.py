@@ -0,0 +1,172 @@
+# app/core/slow_query.py
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from .metrics import route_template
+from .query_timing import add_query_listener
+from .rate_limit import InMemoryBucketBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowQuery:
+    captured_at: str
+    duration_ms: float
+    route: Optional[str]
+    statement: str
+    parameters: Any
+    plan: Optional[List[str]]
+
+
+def redact(parameters):
+    """
+    Keep numbers, booleans, dates and NULLs (they explain plan choices) and
+    replace strings and bytes, which may hold emails, phone numbers or tokens.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)):
+        return f"<redacted {type(parameters).__name__}({len(parameters)})>"
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    return str(parameters)
+
+
+def explain(cursor, dialect_name: str, statement: str, parameters) -> Optional[List[str]]:
+    """
+    Plan for a statement that just ran, on the same DBAPI connection.
+    Only plain Postgres SELECTs are re-run under ANALYZE; anything else,
+    including WITH (which may hold a data-modifying CTE), only gets the
+    estimated plan, so writes are never executed twice.
+    """
+    if dialect_name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect_name == "postgresql":
+        is_select = statement.lstrip().upper().startswith("SELECT")
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    else:
+        return None
+
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        rows = explain_cursor.fetchall()
+    finally:
+        explain_cursor.close()
+    if dialect_name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of statements slower than a threshold, each with redacted
+    parameters, the route that issued it and an EXPLAIN sample.
+
+    Captures go through a token bucket (EXPLAIN costs a round trip, and
+    ANALYZE re-runs the query), so a burst of slow queries cannot turn the
+    log itself into load; the rest are only counted.
+    """
+
+    def __init__(self):
+        self.threshold = 0.2
+        self.explain = True
+        self.samples_per_minute = 30.0
+        self.samples: deque = deque(maxlen=100)
+        self.slow = 0          # every statement over the threshold
+        self.suppressed = 0    # slow statements not sampled because of the rate limit
+        self._bucket = InMemoryBucketBackend(max_keys=1)
+        self._lock = threading.Lock()
+
+    def configure(self, threshold_ms: float, max_samples: int, samples_per_minute: float, explain: bool):
+        self.threshold = threshold_ms / 1000
+        self.samples = deque(self.samples, maxlen=max_samples)
+        self.samples_per_minute = samples_per_minute
+        self.explain = explain
+
+    def _allow(self) -> bool:
+        rate = self.samples_per_minute / 60
+        burst = max(1, int(self.samples_per_minute // 6))
+        with self._lock:
+            return self._bucket.consume("samples", rate, burst, time.monotonic()) == 0
+
+    def record(self, conn, cursor, statement: str, parameters, executemany: bool, seconds: float):
+        self.slow += 1
+        if not self._allow():
+            self.suppressed += 1
+            return
+
+        plan = None
+        if self.explain and not executemany:
+            try:
+                plan = explain(cursor, conn.dialect.name, statement, parameters)
+            except Exception as exc:
+                plan = [f"EXPLAIN failed: {exc}"]
+
+        scope = current_scope.get()
+        sample = SlowQuery(
+            captured_at=datetime.now(timezone.utc).isoformat(),
+            duration_ms=round(seconds * 1000, 2),
+            route=f"{scope['method']} {route_template(scope)}" if scope else None,
+            statement=statement,
+            parameters=redact(parameters),
+            plan=plan,
+        )
+        self.samples.append(sample)
+        logger.warning("Slow query (%.1f ms) on %s: %s", sample.duration_ms, sample.route, " ".join(statement.split()))
+
+    def snapshot(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "slow": self.slow,
+            "suppressed": self.suppressed,
+            "samples": [asdict(sample) for sample in reversed(self.samples)],
+        }
+
+    def clear(self):
+        self.samples.clear()
+        self.slow = 0
+        self.suppressed = 0
+
+
+slow_query_log = SlowQueryLog()
+
+# The ASGI scope of the request being served; the router adds "route" to it in place
+current_scope: ContextVar[Optional[dict]] = ContextVar("slow_query_scope", default=None)
+
+
+def _record_slow_query(conn, cursor, statement, parameters, executemany, seconds):
+    if seconds >= slow_query_log.threshold:
+        slow_query_log.record(conn, cursor, statement, parameters, executemany, seconds)
+
+
+def install_slow_query_log():
+    """Watch every statement on every engine; safe to call more than once"""
+    add_query_listener(_record_slow_query)
+
+
+class SlowQueryContextMiddleware:
+    """Make the current request visible to the slow-query hooks"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
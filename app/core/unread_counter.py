@@ -0,0 +1,60 @@
+# app/core/unread_counter.py
+import threading
+import time
+from typing import Callable, Optional
+
+from ..config import settings
+from .events import property_events
+
+
+class UnreadCounter:
+    """
+    Number of unread contact inquiries, readable in O(1).
+
+    Seeded from a COUNT on first use and adjusted by every write made through
+    `app.crud.inquiry`. Deleting or archiving a property removes its
+    inquiries by cascade, outside that module, so property deletes drop the
+    counter and the next read re-seeds it. Writes from other worker
+    processes are picked up by re-seeding at most every `resync_seconds`.
+    """
+
+    def __init__(self, resync_seconds: Optional[float] = None):
+        self.resync_seconds = resync_seconds
+        self._lock = threading.Lock()
+        self._value: Optional[int] = None
+        self._seeded_at = 0.0
+
+    def get(self, count_unread: Callable[[], int]) -> int:
+        """Return the counter, seeding it with `count_unread()` when missing or stale"""
+        resync_seconds = self.resync_seconds
+        if resync_seconds is None:
+            resync_seconds = settings.INQUIRY_UNREAD_RESYNC_SECONDS
+        if self._value is None or time.monotonic() - self._seeded_at > resync_seconds:
+            value = count_unread()
+            with self._lock:
+                self._value = value
+                self._seeded_at = time.monotonic()
+        return self._value
+
+    def add(self, delta: int):
+        if not delta:
+            return
+        with self._lock:
+            if self._value is not None:
+                self._value = max(0, self._value + delta)
+
+    def reset(self):
+        with self._lock:
+            self._value = None
+
+
+unread_inquiries = UnreadCounter()
+
+
+def _on_property_event(event):
+    # Deletes and archival take the property's inquiries with them
+    if event.action == "deleted":
+        unread_inquiries.reset()
+
+
+property_events.subscribe(_on_property_event)
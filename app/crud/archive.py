@@ -0,0 +1,58 @@
+# app/crud/archive.py
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from ..models.property import Property, PropertyImage, PropertyStatus
+from ..models.inquiry import ContactInquiry
+from ..models.archive import ArchivedProperty, ArchivedPropertyImage, ArchivedInquiry
+
+# Listings that are over and only kept for old links
+ARCHIVED_STATUSES = (PropertyStatus.SOLD, PropertyStatus.RENTED)
+
+def _copy(db: Session, source, target, where):
+    """INSERT INTO target (...) SELECT ... FROM source WHERE ...; columns matched by name"""
+    names = [column.name for column in source.__table__.columns]
+    db.execute(insert(target.__table__).from_select(
+        names, select(*(source.__table__.c[name] for name in names)).where(where)
+    ))
+
+def archive_candidates(db: Session, cutoff: datetime, limit: int) -> List[int]:
+    """
+    Ids of sold or rented listings last changed before `cutoff`, oldest ids
+    first. On Postgres the rows stay locked until commit and rows locked by
+    a concurrent run are skipped, so workers never archive the same batch.
+    """
+    return db.execute(
+        select(Property.id)
+        .where(
+            Property.status.in_(ARCHIVED_STATUSES),
+            func.coalesce(Property.updated_at, Property.created_at) < cutoff
+        )
+        .order_by(Property.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+def archive_properties(db: Session, ids: List[int]) -> int:
+    """
+    Move properties with their images and inquiries into the archive tables:
+    three INSERT ... SELECT and one DELETE (children go through ON DELETE
+    CASCADE), in the caller's transaction. Returns the number moved.
+    """
+    if not ids:
+        return 0
+    _copy(db, Property, ArchivedProperty, Property.id.in_(ids))
+    _copy(db, PropertyImage, ArchivedPropertyImage, PropertyImage.property_id.in_(ids))
+    _copy(db, ContactInquiry, ArchivedInquiry, ContactInquiry.property_id.in_(ids))
+    return db.execute(
+        delete(Property).where(Property.id.in_(ids)).execution_options(synchronize_session=False)
+    ).rowcount
+
+def get_archived_property_by_slug(db: Session, slug: str) -> Optional[ArchivedProperty]:
+    return (
+        db.query(ArchivedProperty)
+        .options(selectinload(ArchivedProperty.images))
+        .filter(ArchivedProperty.slug == slug)
+        .first()
+    )
@@ -0,0 +1,70 @@
+# app/crud/inquiry.py
+from sqlalchemy import insert, update, func, false
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from ..models.inquiry import ContactInquiry
+from ..schemas.inquiry import InquiryCreate
+from ..core.unread_counter import unread_inquiries
+
+def get_inquiries(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    is_read: Optional[bool] = None,
+    property_id: Optional[int] = None
+) -> List[ContactInquiry]:
+    query = db.query(ContactInquiry)
+
+    if is_read is not None:
+        query = query.filter(ContactInquiry.is_read == is_read)
+
+    if property_id is not None:
+        query = query.filter(ContactInquiry.property_id == property_id)
+
+    return query.order_by(ContactInquiry.created_at.desc()).offset(skip).limit(limit).all()
+
+def count_unread(db: Session) -> int:
+    return db.query(func.count(ContactInquiry.id)).filter(ContactInquiry.is_read == false()).scalar()
+
+def get_unread_count(db: Session) -> int:
+    return unread_inquiries.get(lambda: count_unread(db))
+
+def create_inquiry(db: Session, inquiry: InquiryCreate) -> ContactInquiry:
+    db_inquiry = ContactInquiry(**inquiry.model_dump())
+    db.add(db_inquiry)
+    db.commit()
+    db.refresh(db_inquiry)
+    unread_inquiries.add(1)
+    return db_inquiry
+
+def bulk_create_inquiries(db: Session, rows: List[dict]) -> int:
+    """Insert many already-validated inquiries in a single executemany"""
+    if not rows:
+        return 0
+    db.execute(insert(ContactInquiry), rows)
+    db.commit()
+    unread_inquiries.add(len(rows))
+    return len(rows)
+
+def mark_as_read(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    before: Optional[datetime] = None
+) -> int:
+    """Mark inquiries as read in one UPDATE; returns how many were unread"""
+    stmt = update(ContactInquiry).where(ContactInquiry.is_read == false())
+
+    if ids is not None:
+        stmt = stmt.where(ContactInquiry.id.in_(ids))
+
+    if before is not None:
+        stmt = stmt.where(ContactInquiry.created_at <= before)
+
+    result = db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+    db.commit()
+    unread_inquiries.add(-result.rowcount)
+    return result.rowcount
+
+def inquiry_exists(db: Session, inquiry_id: int) -> bool:
+    return db.query(ContactInquiry.id).filter(ContactInquiry.id == inquiry_id).first() is not None
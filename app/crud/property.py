@@ -1,11 +1,18 @@
 # app/crud/property.py
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import or_, and_, delete, func, select, update
+from typing import List, Optional, Sequence, Tuple
 from slugify import slugify
 from ..models.property import Property, PropertyImage, PropertyType, PropertyStatus
+from ..models.archive import ArchivedProperty
 from ..schemas.property import PropertyCreate, PropertyUpdate
 from ..utils.geocode import get_lat_lon_from_address
+from ..core.events import PropertyEvent, property_events
+
+def property_snapshot(db_property: Property) -> dict:
+    """Plain column values, safe to hand to event handlers outside the session"""
+    return {column.key: getattr(db_property, column.key) for column in Property.__table__.columns}
 
 def get_property(db: Session, property_id: int) -> Optional[Property]:
     return db.query(Property).filter(Property.id == property_id).first()
@@ -13,41 +20,59 @@ def get_property(db: Session, property_id: int) -> Optional[Property]:
 def get_property_by_slug(db: Session, slug: str) -> Optional[Property]:
     return db.query(Property).filter(Property.slug == slug).first()
 
-def get_properties(
-    db: Session,
-    skip: int = 0,
-    limit: int = 20,
+def listing_options(columns: Optional[Sequence] = None, with_images: bool = True) -> list:
+    """
+    Loader options for listing rows: only `columns` (all when None) and,
+    when needed, the images in one extra query, reading only their URLs.
+    """
+    options = []
+    if columns is not None:
+        options.append(load_only(*columns))
+    if with_images:
+        images = selectinload(Property.images)
+        options.append(images.load_only(PropertyImage.url, PropertyImage.order) if columns is not None else images)
+    return options
+
+def property_criteria(
     property_type: Optional[PropertyType] = None,
-    status: PropertyStatus = PropertyStatus.AVAILABLE,
+    status: Optional[PropertyStatus] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     min_bedrooms: Optional[int] = None,
     city: Optional[str] = None,
     search: Optional[str] = None,
-    is_featured: Optional[bool] = None
-) -> List[Property]:
-    query = db.query(Property).filter(Property.status == status)
+    is_featured: Optional[bool] = None,
+    is_special_offer: Optional[bool] = None
+) -> list:
+    """WHERE clauses for the listing filters; shared by listings and bulk admin changes"""
+    criteria = []
+    
+    if status is not None:
+        criteria.append(Property.status == status)
     
     if property_type:
-        query = query.filter(Property.property_type == property_type)
+        criteria.append(Property.property_type == property_type)
     
     if min_price:
-        query = query.filter(Property.price >= min_price)
+        criteria.append(Property.price >= min_price)
     
     if max_price:
-        query = query.filter(Property.price <= max_price)
+        criteria.append(Property.price <= max_price)
     
     if min_bedrooms:
-        query = query.filter(Property.bedrooms >= min_bedrooms)
+        criteria.append(Property.bedrooms >= min_bedrooms)
     
     if city:
-        query = query.filter(Property.city.ilike(f"%{city}%"))
+        criteria.append(Property.city.ilike(f"%{city}%"))
     
     if is_featured is not None:
-        query = query.filter(Property.is_featured == is_featured)
+        criteria.append(Property.is_featured == is_featured)
+    
+    if is_special_offer is not None:
+        criteria.append(Property.is_special_offer == is_special_offer)
     
     if search:
-        query = query.filter(
+        criteria.append(
             or_(
                 Property.title.ilike(f"%{search}%"),
                 Property.description.ilike(f"%{search}%"),
@@ -55,16 +80,112 @@ def get_properties(
             )
         )
     
-    return query.order_by(Property.created_at.desc()).offset(skip).limit(limit).all()
+    return criteria
 
-def create_property(db: Session, property: PropertyCreate, user_id: int) -> Property:
-    # Generate unique slug
-    base_slug = slugify(property.title)
+def get_properties(
+    db: Session,
+    skip: int = 0,
+    limit: int = 20,
+    property_type: Optional[PropertyType] = None,
+    status: PropertyStatus = PropertyStatus.AVAILABLE,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_bedrooms: Optional[int] = None,
+    city: Optional[str] = None,
+    search: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    is_special_offer: Optional[bool] = None,
+    columns: Optional[Sequence] = None,
+    with_images: bool = True
+) -> List[Property]:
+    query = db.query(Property).filter(*property_criteria(
+        property_type=property_type,
+        status=status,
+        min_price=min_price,
+        max_price=max_price,
+        min_bedrooms=min_bedrooms,
+        city=city,
+        search=search,
+        is_featured=is_featured,
+        is_special_offer=is_special_offer
+    ))
+    
+    # Images for the whole page in one extra query instead of one per row
+    return (
+        query.options(*listing_options(columns, with_images))
+        .order_by(Property.created_at.desc(), Property.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+def get_properties_by_ids(
+    db: Session,
+    ids: List[int],
+    columns: Optional[Sequence] = None,
+    with_images: bool = True
+) -> List[Property]:
+    """Properties with their images, in the order of `ids`; missing ids are skipped"""
+    if not ids:
+        return []
+    found = {
+        prop.id: prop
+        for prop in db.query(Property).options(*listing_options(columns, with_images)).filter(Property.id.in_(ids))
+    }
+    return [found[i] for i in ids if i in found]
+
+def get_properties_by_slugs(db: Session, slugs: List[str]) -> List[Property]:
+    """Properties with their images, in the order of `slugs`; missing slugs are skipped"""
+    if not slugs:
+        return []
+    found = {
+        prop.slug: prop
+        for prop in db.query(Property).options(selectinload(Property.images)).filter(Property.slug.in_(slugs))
+    }
+    return [found[slug] for slug in slugs if slug in found]
+
+def get_last_change(db: Session) -> Optional[datetime]:
+    return db.execute(select(func.max(func.coalesce(Property.updated_at, Property.created_at)))).scalar()
+
+def get_changed_since(db: Session, columns, watermark: Optional[datetime], overlap_seconds: float = 5.0) -> Tuple[list, Optional[datetime]]:
+    """
+    Rows (of `columns`) created or updated since `watermark`, and the new
+    watermark. The overlap re-reads a few seconds so a transaction that
+    committed late with an earlier timestamp is not missed.
+    """
+    changed_at = func.coalesce(Property.updated_at, Property.created_at)
+    query = select(*columns, changed_at)
+    if watermark is not None:
+        query = query.where(or_(changed_at >= watermark - timedelta(seconds=overlap_seconds), changed_at.is_(None)))
+    rows = db.execute(query).all()
+    stamps = [row[-1] for row in rows if row[-1] is not None]
+    if stamps:
+        watermark = max(stamps) if watermark is None else max(watermark, *stamps)
+    return rows, watermark
+
+def unique_slug(db: Session, title: str) -> str:
+    """
+    Slug for `title`, suffixed with the first free counter; one query however
+    many collide. Archived slugs stay taken so old links keep their listing.
+    """
+    base_slug = slugify(title)
+    taken = set(db.execute(
+        select(Property.slug)
+        .where(or_(Property.slug == base_slug, Property.slug.like(f"{base_slug}-%")))
+        .union_all(
+            select(ArchivedProperty.slug)
+            .where(or_(ArchivedProperty.slug == base_slug, ArchivedProperty.slug.like(f"{base_slug}-%")))
+        )
+    ).scalars())
     slug = base_slug
     counter = 1
-    while db.query(Property).filter(Property.slug == slug).first():
+    while slug in taken:
         slug = f"{base_slug}-{counter}"
         counter += 1
+    return slug
+
+def create_property(db: Session, property: PropertyCreate, user_id: int) -> Property:
+    slug = unique_slug(db, property.title)
     
     lat, lon = get_lat_lon_from_address(property.address, property.city)
 
@@ -78,6 +199,7 @@ def create_property(db: Session, property: PropertyCreate, user_id: int) -> Prop
     db.add(db_property)
     db.commit()
     db.refresh(db_property)
+    property_events.emit(PropertyEvent("created", db_property.id, property_snapshot(db_property)))
     return db_property
 
 def update_property(
@@ -90,22 +212,83 @@ def update_property(
         return None
     
     update_data = property_update.model_dump(exclude_unset=True)
+    changed = tuple(key for key, value in update_data.items() if getattr(db_property, key) != value)
     
     for key, value in update_data.items():
         setattr(db_property, key, value)
+    db_property.version = Property.version + 1
     
     db.commit()
     db.refresh(db_property)
+    property_events.emit(PropertyEvent("updated", db_property.id, property_snapshot(db_property), changed))
     return db_property
 
-def delete_property(db: Session, property_id: int) -> bool:
-    db_property = get_property(db, property_id)
-    if not db_property:
-        return False
-    
-    db.delete(db_property)
+def patch_property(
+    db: Session,
+    property_id: int,
+    property_patch: PropertyUpdate,
+    expected_version: Optional[int]
+) -> Optional[dict]:
+    """
+    Apply a partial update in a single UPDATE ... RETURNING, only if the
+    row is still at `expected_version` (any version when None). Returns
+    the updated columns, or None when no row matched.
+    """
+    values = property_patch.model_dump(exclude_unset=True, exclude={"version"})
+    stmt = update(Property).where(Property.id == property_id)
+    if expected_version is not None:
+        stmt = stmt.where(Property.version == expected_version)
+    stmt = (
+        stmt.values(**values, version=Property.version + 1)
+        .returning(*Property.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(stmt).mappings().first()
+    db.commit()
+    if row is None:
+        return None
+    data = dict(row)
+    property_events.emit(PropertyEvent("updated", property_id, data, tuple(values)))
+    return data
+
+def get_property_version(db: Session, property_id: int) -> Optional[int]:
+    return db.execute(select(Property.version).where(Property.id == property_id)).scalar()
+
+def bulk_update_properties(db: Session, criteria: list, values: dict) -> List[dict]:
+    """
+    Apply `values` to every matching property in one UPDATE ... RETURNING.
+    Rows that already hold the values are left alone (no version bump, no
+    event); returns the rows that changed.
+    """
+    rows = db.execute(
+        update(Property)
+        .where(*criteria, or_(*(getattr(Property, key).is_distinct_from(value) for key, value in values.items())))
+        .values(**values, version=Property.version + 1)
+        .returning(*Property.__table__.columns)
+        .execution_options(synchronize_session=False)
+    ).mappings().all()
+    db.commit()
+    changed = tuple(values)
+    for row in rows:
+        property_events.emit(PropertyEvent("updated", row["id"], dict(row), changed))
+    return [dict(row) for row in rows]
+
+def bulk_delete_properties(db: Session, criteria: list) -> List[int]:
+    """
+    Delete every matching property in one DELETE ... RETURNING. Images,
+    inquiries and search notifications go with them through ON DELETE
+    CASCADE; nothing is loaded.
+    """
+    ids = db.execute(
+        delete(Property).where(*criteria).returning(Property.id).execution_options(synchronize_session=False)
+    ).scalars().all()
     db.commit()
-    return True
+    for property_id in ids:
+        property_events.emit(PropertyEvent("deleted", property_id))
+    return list(ids)
+
+def delete_property(db: Session, property_id: int) -> bool:
+    return bool(bulk_delete_properties(db, [Property.id == property_id]))
 
 def add_property_image(
     db: Session,
@@ -125,4 +308,5 @@ def add_property_image(
     db.add(db_image)
     db.commit()
     db.refresh(db_image)
+    property_events.emit(PropertyEvent("image_added", property_id))
     return db_image
\ No newline at end of file
@@ -0,0 +1,100 @@
+# app/crud/saved_search.py
+from sqlalchemy import func, insert, select, update, false
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Tuple
+from ..models.property import Property
+from ..models.saved_search import SavedSearch, SearchNotification
+from ..schemas.saved_search import SavedSearchCreate
+
+def get_saved_searches(db: Session, user_id: int) -> List[SavedSearch]:
+    return db.query(SavedSearch).filter(SavedSearch.user_id == user_id).order_by(SavedSearch.id).all()
+
+def count_saved_searches(db: Session, user_id: int) -> int:
+    return db.query(func.count(SavedSearch.id)).filter(SavedSearch.user_id == user_id).scalar()
+
+def create_saved_search(db: Session, saved_search: SavedSearchCreate, user_id: int) -> SavedSearch:
+    db_saved_search = SavedSearch(**saved_search.model_dump(), user_id=user_id)
+    db.add(db_saved_search)
+    db.commit()
+    db.refresh(db_saved_search)
+    return db_saved_search
+
+def delete_saved_search(db: Session, saved_search_id: int, user_id: int) -> bool:
+    db_saved_search = db.query(SavedSearch).filter(
+        SavedSearch.id == saved_search_id,
+        SavedSearch.user_id == user_id
+    ).first()
+    if not db_saved_search:
+        return False
+    db.delete(db_saved_search)
+    db.commit()
+    return True
+
+def get_all_saved_searches(db: Session) -> list:
+    """Every saved search's filter columns, for building the match index"""
+    return db.execute(
+        select(SavedSearch.id, SavedSearch.user_id, SavedSearch.property_type, SavedSearch.min_price,
+               SavedSearch.max_price, SavedSearch.min_bedrooms, SavedSearch.city, SavedSearch.search)
+    ).all()
+
+def saved_search_signature(db: Session) -> Tuple[int, Optional[int]]:
+    """(count, max id): changes whenever a saved search is created or deleted"""
+    return tuple(db.execute(select(func.count(SavedSearch.id), func.max(SavedSearch.id))).one())
+
+def _insert_ignoring_duplicates(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(SearchNotification).prefix_with("IGNORE")
+    return dialect_insert(SearchNotification).on_conflict_do_nothing(
+        index_elements=["saved_search_id", "property_id"]
+    )
+
+def queue_notifications(db: Session, notifications: List[Tuple[int, int, int]]):
+    """Queue one notification per (saved search id, user id, property id); already queued pairs are skipped"""
+    if not notifications:
+        return
+    db.execute(
+        _insert_ignoring_duplicates(db),
+        [
+            {"saved_search_id": search_id, "user_id": user_id, "property_id": property_id, "is_read": False}
+            for search_id, user_id, property_id in notifications
+        ]
+    )
+    db.commit()
+
+def get_notifications(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    is_read: Optional[bool] = None
+) -> List[SearchNotification]:
+    # The inner join also hides rows left behind where deletes do not cascade
+    query = db.query(SearchNotification).join(SearchNotification.property).filter(SearchNotification.user_id == user_id)
+
+    if is_read is not None:
+        query = query.filter(SearchNotification.is_read == is_read)
+
+    return (
+        query.options(selectinload(SearchNotification.property).selectinload(Property.images))
+        .order_by(SearchNotification.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+def mark_notifications_read(db: Session, user_id: int, ids: Optional[List[int]] = None) -> int:
+    """Mark the user's notifications (all, or the listed ids) as read in one UPDATE"""
+    stmt = update(SearchNotification).where(
+        SearchNotification.user_id == user_id,
+        SearchNotification.is_read == false()
+    )
+    if ids is not None:
+        stmt = stmt.where(SearchNotification.id.in_(ids))
+    result = db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+    db.commit()
+    return result.rowcount
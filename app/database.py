@@ -1,10 +1,36 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+from typing import Tuple
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
 from .config import settings
+from .core.replicas import ReplicaRouter, prefers_primary
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite enforces foreign keys, and so ON DELETE CASCADE, only when asked on each connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+@lru_cache()
+def get_engine():
+    """Create the engine on first use so importing the app never touches the database"""
+    engine = create_engine(settings.DATABASE_URL)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    return engine
+
+class LazySession(Session):
+    """Session that binds to the application engine when it first needs a connection"""
+
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kw)
+
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
@@ -14,4 +40,44 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@lru_cache()
+def get_replica_router() -> ReplicaRouter:
+    engines = [create_engine(url, pool_pre_ping=True) for url in settings.READ_REPLICA_URLS]
+    return ReplicaRouter(
+        engines,
+        max_lag=settings.READ_REPLICA_MAX_LAG_SECONDS,
+        check_seconds=settings.READ_REPLICA_CHECK_SECONDS,
+        retry_seconds=settings.READ_REPLICA_RETRY_SECONDS,
+    )
+
+def read_session(request: Request) -> Session:
+    """A replica session when one is healthy, the primary otherwise or when the client has just written"""
+    engine = None
+    if settings.READ_REPLICA_URLS and not prefers_primary(request):
+        engine = get_replica_router().pick()
+    return SessionLocal(bind=engine) if engine is not None else SessionLocal()
+
+# Dependency for read-only endpoints
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def check_database() -> Tuple[bool, str]:
+    """Readiness: is a pooled connection available, and does the database answer?"""
+    engine = get_engine()
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        if max_overflow >= 0 and pool.checkedout() >= pool.size() + max_overflow:
+            return False, f"connection pool exhausted ({pool.status()})"
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        return False, f"database unavailable: {exc.__class__.__name__}"
+    return True, pool.status()
\ No newline at end of file
@@ -1,33 +1,53 @@
 # app/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .database import engine, Base
+from sqlalchemy.orm import Session
+from .database import SessionLocal, check_database, get_read_db, read_session
 from .api.v1 import api_router
+from .core.rate_limit import RateLimitMiddleware
+from .core.inquiry_buffer import inquiry_buffer
+from .core.archival import listing_archiver
+from .core.search_alerts import search_alerts
+from .core.coalescing import CoalescingMiddleware
+from .core.compression import CompressionMiddleware
+from .core.metrics import MetricsMiddleware, instrument_engines, registry
+from .core.query_recorder import QueryDebugMiddleware
+from .core.replicas import ReadYourWritesMiddleware
+from .core.sitemap import sitemap, sitemap_response
+from .core.slow_query import SlowQueryContextMiddleware, install_slow_query_log, slow_query_log
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title=settings.APP_NAME,
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API routes
-app.include_router(api_router, prefix=settings.API_V1_PREFIX)
-
-@app.get("/")
+# The schema is managed by Alembic: run `alembic upgrade head` before starting the app.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.INQUIRY_BUFFER_ENABLED:
+        inquiry_buffer.start(
+            session_factory=SessionLocal,
+            max_batch=settings.INQUIRY_BUFFER_MAX_BATCH,
+            flush_seconds=settings.INQUIRY_BUFFER_FLUSH_SECONDS,
+            max_pending=settings.INQUIRY_BUFFER_MAX_PENDING,
+            spool_path=settings.INQUIRY_BUFFER_SPOOL_PATH,
+        )
+    listing_archiver.configure(
+        session_factory=SessionLocal,
+        after_days=settings.ARCHIVE_AFTER_DAYS,
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+        interval_seconds=settings.ARCHIVE_INTERVAL_SECONDS,
+    )
+    if settings.ARCHIVE_ENABLED:
+        listing_archiver.start()
+    search_alerts.start(max_pending=settings.SEARCH_ALERTS_MAX_PENDING)
+    yield
+    listing_archiver.stop()
+    inquiry_buffer.stop()
+    search_alerts.stop()
+
+root_router = APIRouter()
+
+@root_router.get("/")
 def root():
     return {
         "message": "Tirupur Homes API",
@@ -35,10 +55,116 @@ def root():
         "docs": "/docs"
     }
 
-@app.get("/health")
+@root_router.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+@root_router.get("/ready")
+def readiness_check():
+    """Ready only when the database pool can hand out a working connection"""
+    ready, detail = check_database()
+    if not ready:
+        return ORJSONResponse(
+            {"status": "unavailable", "database": detail},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return {"status": "ready", "database": detail}
+
+@root_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus text exposition format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@root_router.get("/sitemap.xml", include_in_schema=False)
+def sitemap_index(request: Request, db: Session = Depends(get_read_db)):
+    """Sitemap index pointing at one sitemap per shard of property ids"""
+    index, _ = sitemap.index(db)
+    return sitemap_response(request, index)
+
+@root_router.get("/sitemap-{shard:int}.xml", include_in_schema=False)
+def sitemap_shard(shard: int, request: Request, db: Session = Depends(get_read_db)):
+    """One shard of available property URLs, streamed on first request and cached afterwards"""
+    _, shards = sitemap.index(db)
+    if shard not in shards:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sitemap not found")
+    return sitemap_response(request, sitemap.shard(shard, lambda: read_session(request)))
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Nothing here connects to the database or to
+    Cloudinary; the engine and SDK are set up on first use.
+    """
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+
+    # Rate limiting for public write endpoints (added first so CORS headers wrap 429s)
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware)
+
+    # Response compression (precompressed cached bodies pass through untouched)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
+    # Identical concurrent GETs share one handler run (outside compression, so the compressed bytes too)
+    if settings.COALESCING_ENABLED:
+        app.add_middleware(CoalescingMiddleware)
+
+    # Pin a client's reads to the primary right after it writes
+    if settings.READ_REPLICA_URLS:
+        app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+    # Debug mode: per-request query count and DB time in response headers
+    if settings.QUERY_DEBUG:
+        app.add_middleware(QueryDebugMiddleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Query-Count", "X-DB-Time"] if settings.QUERY_DEBUG else [],
+    )
+
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        slow_query_log.configure(
+            threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+            max_samples=settings.SLOW_QUERY_MAX_SAMPLES,
+            samples_per_minute=settings.SLOW_QUERY_SAMPLES_PER_MINUTE,
+            explain=settings.SLOW_QUERY_EXPLAIN,
+        )
+        install_slow_query_log()
+        app.add_middleware(SlowQueryContextMiddleware)
+
+    # Outermost, so latency covers every other middleware
+    if settings.METRICS_ENABLED:
+        instrument_engines()
+        app.add_middleware(MetricsMiddleware)
+
+    # Include API routes
+    app.include_router(root_router)
+    app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+
+    return app
+
+_app = None
+
+def __getattr__(name):
+    # `app.main:app` for uvicorn and tests, built on first access rather than at import
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # #### MOCK ####
 
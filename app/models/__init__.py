@@ -1,4 +1,6 @@
 # app/models/__init__.py
 from .property import Property, PropertyImage, PropertyType, PropertyStatus
 from .user import User, UserRole
-from .inquiry import ContactInquiry
\ No newline at end of file
+from .inquiry import ContactInquiry
+from .saved_search import SavedSearch, SearchNotification
+from .archive import ArchivedProperty, ArchivedPropertyImage, ArchivedInquiry
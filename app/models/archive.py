@@ -0,0 +1,74 @@
+# app/models/archive.py
+from sqlalchemy import Column, Integer, String, Text, Boolean, Numeric, DateTime, ForeignKey, Enum, Float
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..database import Base
+from .property import PropertyType, PropertyStatus
+
+# Cold copies of sold and rented listings moved out of `properties` by the
+# archival job. Ids are kept, so old links, ETags and surrogate keys still
+# name the same listing; only the slug is indexed, for resolving old links.
+
+class ArchivedProperty(Base):
+    __tablename__ = "archived_properties"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(200), nullable=False)
+    slug = Column(String(200), unique=True, index=True)
+    description = Column(Text)
+    price = Column(Numeric(10, 2), nullable=False)
+    property_type = Column(Enum(PropertyType), nullable=False)
+    status = Column(Enum(PropertyStatus))
+
+    address = Column(String(255))
+    city = Column(String(100))
+    state = Column(String(100))
+    zip_code = Column(String(10))
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+
+    bedrooms = Column(Integer)
+    bathrooms = Column(Integer)
+    area = Column(Integer)
+    parking = Column(Boolean)
+    furnished = Column(Boolean)
+
+    is_featured = Column(Boolean)
+    is_special_offer = Column(Boolean)
+    offer_text = Column(String(200))
+
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    version = Column(Integer, nullable=False, server_default="1")
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    images = relationship(
+        "ArchivedPropertyImage",
+        passive_deletes=True,
+        order_by="(ArchivedPropertyImage.order, ArchivedPropertyImage.id)"
+    )
+
+class ArchivedPropertyImage(Base):
+    __tablename__ = "archived_property_images"
+
+    id = Column(Integer, primary_key=True)
+    property_id = Column(Integer, ForeignKey("archived_properties.id", ondelete="CASCADE"), index=True)
+    url = Column(String(500), nullable=False)
+    public_id = Column(String(255))
+    caption = Column(String(200))
+    order = Column(Integer)
+    uploaded_at = Column(DateTime(timezone=True))
+
+class ArchivedInquiry(Base):
+    __tablename__ = "archived_contact_inquiries"
+
+    id = Column(Integer, primary_key=True)
+    property_id = Column(Integer, ForeignKey("archived_properties.id", ondelete="CASCADE"), index=True)
+    name = Column(String(100), nullable=False)
+    email = Column(String(255), nullable=False)
+    phone = Column(String(20), nullable=False)
+    message = Column(Text, nullable=False)
+    is_read = Column(Boolean)
+    created_at = Column(DateTime(timezone=True))
@@ -1,11 +1,17 @@
 # app/models/inquiry.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
 
 class ContactInquiry(Base):
     __tablename__ = "contact_inquiries"
+    __table_args__ = (
+        # Admin inbox: newest first, optionally filtered by read state or property
+        Index("ix_contact_inquiries_created_at", "created_at"),
+        Index("ix_contact_inquiries_is_read_created_at", "is_read", "created_at"),
+        Index("ix_contact_inquiries_property_id_created_at", "property_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=True)
@@ -5,6 +5,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 import enum
 from ..database import Base
+from ..utils.helpers import map_urls
 
 class PropertyType(str, enum.Enum):
     BUY = "BUY"
@@ -55,32 +56,42 @@ class Property(Base):
     # Relationships
     created_by_id = Column(Integer, ForeignKey("users.id"))
     created_by = relationship("User", back_populates="properties")
-    images = relationship("PropertyImage", back_populates="property", cascade="all, delete-orphan")
-    inquiries = relationship("ContactInquiry", back_populates="property", cascade="all, delete-orphan")
+    # passive_deletes: deleting a property leaves its children to ON DELETE CASCADE instead of loading them
+    images = relationship(
+        "PropertyImage",
+        back_populates="property",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        # The first image is the thumbnail, however the images were loaded
+        order_by="(PropertyImage.order, PropertyImage.id)"
+    )
+    inquiries = relationship(
+        "ContactInquiry", back_populates="property", cascade="all, delete-orphan", passive_deletes=True
+    )
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Bumped by every update; PATCH only applies against the version the client read
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     @hybrid_property
     def gmap_url(self):
         """Generate a Google Maps location link for this property."""
-        if self.latitude and self.longitude:
-            return f"https://www.google.com/maps?q={self.latitude},{self.longitude}"
-        return None
+        return map_urls(self.latitude, self.longitude)[0]
 
     @hybrid_property
     def directions_url(self):
         """Generate a directions link (user → property). The user's origin is to be filled client-side."""
-        if self.latitude and self.longitude:
-            return f"https://www.google.com/maps/dir/?api=1&destination={self.latitude},{self.longitude}"
-        return None    
+        return map_urls(self.latitude, self.longitude)[1]    
 
 class PropertyImage(Base):
     __tablename__ = "property_images"
     
     id = Column(Integer, primary_key=True, index=True)
-    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"))
+    # Indexed for ON DELETE CASCADE, which otherwise scans the table per deleted property
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), index=True)
     url = Column(String(500), nullable=False)
     public_id = Column(String(255))
     caption = Column(String(200))
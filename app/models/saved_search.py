@@ -0,0 +1,48 @@
+# app/models/saved_search.py
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Float, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..database import Base
+from .property import PropertyType
+
+class SavedSearch(Base):
+    """A user's listing filters, matched against new and changed listings"""
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100))
+
+    # Same fields and semantics as PropertyFilter
+    property_type = Column(Enum(PropertyType), nullable=True)
+    min_price = Column(Float, nullable=True)
+    max_price = Column(Float, nullable=True)
+    min_bedrooms = Column(Integer, nullable=True)
+    city = Column(String(100), nullable=True)
+    search = Column(String(200), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    notifications = relationship("SearchNotification", back_populates="saved_search", cascade="all, delete-orphan")
+
+class SearchNotification(Base):
+    """One listing that matched a saved search, queued for its owner"""
+    __tablename__ = "search_notifications"
+    __table_args__ = (
+        # A listing is announced once per search, however often it is edited
+        UniqueConstraint("saved_search_id", "property_id", name="uq_search_notifications_search_property"),
+        # Per-user queue: unread first, oldest first
+        Index("ix_search_notifications_user_id_is_read_id", "user_id", "is_read", "id"),
+        # ON DELETE CASCADE from properties (deletes and archival)
+        Index("ix_search_notifications_property_id", "property_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False)
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    is_read = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    saved_search = relationship("SavedSearch", back_populates="notifications")
+    property = relationship("Property")
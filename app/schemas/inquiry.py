@@ -1,6 +1,6 @@
 # app/schemas/inquiry.py
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, model_validator
+from typing import List, Optional
 from datetime import datetime
 
 class InquiryBase(BaseModel):
@@ -18,4 +18,18 @@ class InquiryResponse(InquiryBase):
     is_read: bool
     created_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class InquiryBulkRead(BaseModel):
+    """Mark many inquiries as read: by id list, everything up to a timestamp, or both"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
+    before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if self.ids is None and self.before is None:
+            raise ValueError("Provide 'ids' and/or 'before'")
+        return self
+
+class UnreadCount(BaseModel):
+    unread: int
\ No newline at end of file
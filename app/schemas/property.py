@@ -1,6 +1,6 @@
 # app/schemas/property.py
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Dict, Literal, Optional, List, Union
 from datetime import datetime
 from ..models.property import PropertyType, PropertyStatus
 
@@ -57,6 +57,12 @@ class PropertyUpdate(BaseModel):
     parking: Optional[bool] = None
     furnished: Optional[bool] = None
     is_featured: Optional[bool] = None
+    is_special_offer: Optional[bool] = None
+    offer_text: Optional[str] = None
+
+class PropertyPatch(PropertyUpdate):
+    """Partial update; `version` (or an If-Match header) is the version the client last read"""
+    version: Optional[int] = Field(default=None, ge=1)
 
 class PropertyResponse(PropertyBase):
     id: int
@@ -65,6 +71,8 @@ class PropertyResponse(PropertyBase):
     images: List[PropertyImageResponse] = []
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1
+    archived_at: Optional[datetime] = None  # set only for archived listings, resolved by slug
 
     latitude: Optional[float] = None
     longitude: Optional[float] = None
@@ -75,6 +83,22 @@ class PropertyResponse(PropertyBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class PropertyPatchResponse(PropertyBase):
+    """The property's columns after a PATCH, as returned by the UPDATE itself (no images)"""
+    id: int
+    slug: str
+    status: PropertyStatus
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    version: int
+    gmap_url: Optional[str] = None
+    directions_url: Optional[str] = None
+
+class PropertyBatchResponse(BaseModel):
+    """Requested properties in request order, plus the ids or slugs that were not found"""
+    properties: List[PropertyResponse]
+    missing: List[Union[int, str]] = []
+
 class PropertyListResponse(BaseModel):
     id: int
     title: str
@@ -92,10 +116,56 @@ class PropertyListResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class HomeListing(PropertyListResponse):
+    is_special_offer: bool
+    offer_text: Optional[str] = None
+
+class HomeSnapshotResponse(BaseModel):
+    version: int
+    featured: List[HomeListing]
+    special_offers: List[HomeListing]
+    newest: Dict[PropertyType, List[HomeListing]]
+
 class PropertyFilter(BaseModel):
     property_type: Optional[PropertyType] = None
     min_price: Optional[float] = None
     max_price: Optional[float] = None
     min_bedrooms: Optional[int] = None
     city: Optional[str] = None
-    search: Optional[str] = None
\ No newline at end of file
+    search: Optional[str] = None
+
+class PropertyBulkFilter(BaseModel):
+    """Selects properties for a bulk change; same semantics as the listing filters, any status"""
+    property_type: Optional[PropertyType] = None
+    status: Optional[PropertyStatus] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_bedrooms: Optional[int] = None
+    city: Optional[str] = None
+    is_featured: Optional[bool] = None
+    is_special_offer: Optional[bool] = None
+
+class PropertyBulkAction(BaseModel):
+    """One change applied to the properties in `ids`, or to those matching `filter`"""
+    action: Literal["status", "featured", "delete"]
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
+    filter: Optional[PropertyBulkFilter] = None
+    status: Optional[PropertyStatus] = None
+    is_featured: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give exactly one of 'ids' or 'filter'")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("'filter' must set at least one field")
+        if self.action == "status" and self.status is None:
+            raise ValueError("'status' is required for the status action")
+        if self.action == "featured" and self.is_featured is None:
+            raise ValueError("'is_featured' is required for the featured action")
+        return self
+
+class PropertyBulkResult(BaseModel):
+    action: str
+    affected: int
+    ids: List[int]
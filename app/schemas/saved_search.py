@@ -0,0 +1,34 @@
+# app/schemas/saved_search.py
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Optional
+from datetime import datetime
+from .property import PropertyFilter, PropertyListResponse
+
+class SavedSearchCreate(PropertyFilter):
+    name: Optional[str] = Field(default=None, max_length=100)
+    city: Optional[str] = Field(default=None, max_length=100)
+    search: Optional[str] = Field(default=None, max_length=200)
+
+    @model_validator(mode="after")
+    def check_price_range(self):
+        if self.min_price and self.max_price and self.min_price > self.max_price:
+            raise ValueError("'min_price' must not exceed 'max_price'")
+        return self
+
+class SavedSearchResponse(PropertyFilter):
+    id: int
+    name: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SearchNotificationResponse(BaseModel):
+    id: int
+    saved_search_id: int
+    is_read: bool
+    created_at: datetime
+    property: PropertyListResponse
+
+class SearchNotificationRead(BaseModel):
+    """Mark notifications as read: listed ids, or the whole queue when omitted"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
@@ -0,0 +1,29 @@
+# app/schemas/stats.py
+from pydantic import BaseModel
+from typing import List, Optional
+from ..models.property import PropertyType
+
+class MarketGroup(BaseModel):
+    city: str
+    property_type: PropertyType
+    bedrooms: int
+    count: int
+    avg_price: float
+    median_price: float
+    price_per_sqft: Optional[float] = None
+
+class MarketStatsResponse(BaseModel):
+    version: int
+    total: int
+    groups: List[MarketGroup]
+
+class MarketDrift(BaseModel):
+    group: list
+    expected: Optional[MarketGroup] = None
+    actual: Optional[MarketGroup] = None
+
+class MarketStatsCheck(BaseModel):
+    consistent: bool
+    groups: int
+    drift: List[MarketDrift]
+    repaired: bool
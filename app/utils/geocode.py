@@ -1,5 +1,4 @@
 # app/utils/geocode.py
-import requests
 
 def get_lat_lon_from_address(address: str, city: str = None):
     """
@@ -9,6 +8,8 @@ def get_lat_lon_from_address(address: str, city: str = None):
     if not address:
         return None, None
 
+    import requests  # deferred: only property creation needs it
+
     try:
         query = f"{address}, {city}" if city else address
         url = f"https://nominatim.openstreetmap.org/search?q={query}&format=json&limit=1"
@@ -0,0 +1,14 @@
+# app/utils/helpers.py
+from functools import lru_cache
+from typing import Optional, Tuple
+
+GMAP_URL = "https://www.google.com/maps?q={},{}"
+DIRECTIONS_URL = "https://www.google.com/maps/dir/?api=1&destination={},{}"
+
+# Keyed by the coordinates: re-serializing an unchanged row reuses its links, a moved row gets new ones
+@lru_cache(maxsize=4096)
+def map_urls(latitude: Optional[float], longitude: Optional[float]) -> Tuple[Optional[str], Optional[str]]:
+    """Google Maps location and directions links, or (None, None) without coordinates"""
+    if latitude and longitude:
+        return GMAP_URL.format(latitude, longitude), DIRECTIONS_URL.format(latitude, longitude)
+    return None, None
@@ -0,0 +1,114 @@
+# app/utils/serializers.py
+"""
+Fast serialization of ORM objects into response-shaped dicts.
+
+These build exactly the shapes of `PropertyResponse` and
+`PropertyListResponse` straight from attributes, skipping pydantic
+validation. Routes return them through `ORJSONResponse` so FastAPI does
+not validate them against `response_model` a second time; the schemas
+remain the documented contract.
+"""
+from types import SimpleNamespace
+from typing import List, Optional
+from ..models.property import Property, PropertyImage
+from .helpers import map_urls
+
+def serialize_image(image: PropertyImage) -> dict:
+    return {
+        "id": image.id,
+        "url": image.url,
+        "public_id": image.public_id,
+        "caption": image.caption,
+        "order": image.order,
+        "uploaded_at": image.uploaded_at,
+    }
+
+def serialize_property(prop: Property, images: Optional[List[PropertyImage]] = None) -> dict:
+    """Dict in the shape of `PropertyResponse`"""
+    gmap_url, directions_url = map_urls(prop.latitude, prop.longitude)
+    if images is None:
+        images = prop.images
+    return {
+        "id": prop.id,
+        "title": prop.title,
+        "slug": prop.slug,
+        "description": prop.description,
+        "price": float(prop.price),
+        "property_type": prop.property_type,
+        "status": prop.status,
+        "address": prop.address,
+        "city": prop.city,
+        "state": prop.state,
+        "zip_code": prop.zip_code,
+        "bedrooms": prop.bedrooms,
+        "bathrooms": prop.bathrooms,
+        "area": prop.area,
+        "parking": prop.parking,
+        "furnished": prop.furnished,
+        "is_featured": prop.is_featured,
+        "is_special_offer": prop.is_special_offer,
+        "offer_text": prop.offer_text,
+        "latitude": prop.latitude,
+        "longitude": prop.longitude,
+        "images": [serialize_image(image) for image in images],
+        "created_at": prop.created_at,
+        "updated_at": prop.updated_at,
+        "version": prop.version,
+        "gmap_url": gmap_url,
+        "directions_url": directions_url,
+    }
+
+def serialize_archived_property(prop) -> dict:
+    """Dict in the shape of `PropertyResponse` for an `ArchivedProperty`, with `archived_at`"""
+    item = serialize_property(prop)
+    item["archived_at"] = prop.archived_at
+    return item
+
+def serialize_property_row(row: dict) -> dict:
+    """Dict in the shape of `PropertyPatchResponse`, from a row of property columns"""
+    item = serialize_property(SimpleNamespace(**row), images=[])
+    del item["images"]
+    return item
+
+def serialize_property_list_item(prop: Property, thumbnail: Optional[str] = None) -> dict:
+    """Dict in the shape of `PropertyListResponse`"""
+    return {
+        "id": prop.id,
+        "title": prop.title,
+        "slug": prop.slug,
+        "price": float(prop.price),
+        "property_type": prop.property_type,
+        "status": prop.status,
+        "city": prop.city,
+        "bedrooms": prop.bedrooms,
+        "bathrooms": prop.bathrooms,
+        "area": prop.area,
+        "is_featured": prop.is_featured,
+        "thumbnail": thumbnail,
+        "created_at": prop.created_at,
+    }
+
+# Fields of `PropertyListResponse`, in response order; `fields=` picks a subset
+LIST_FIELDS = (
+    "id", "title", "slug", "price", "property_type", "status", "city", "bedrooms",
+    "bathrooms", "area", "is_featured", "thumbnail", "created_at",
+)
+
+def serialize_list_fields(prop: Property, fields, thumbnail: Optional[str] = None) -> dict:
+    """Only `fields` of a listing item, touching no other attribute (they may not be loaded)"""
+    item = {}
+    for field in fields:
+        if field == "thumbnail":
+            item[field] = thumbnail
+        elif field == "price":
+            item[field] = float(prop.price)
+        else:
+            item[field] = getattr(prop, field)
+    return item
+
+def serialize_home_item(prop: Property, thumbnail: Optional[str] = None) -> dict:
+    """Dict in the shape of `HomeListing`: a list item plus its offer"""
+    item = serialize_property_list_item(prop, thumbnail)
+    item["is_special_offer"] = prop.is_special_offer
+    item["offer_text"] = prop.offer_text
+    return item
@@ -0,0 +1,127 @@
+# benchmarks/__main__.py
+"""
+Load and latency benchmarks for the API.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 10000
+    python -m benchmarks run --database-url sqlite:////tmp/bench.db --output run.json
+    python -m benchmarks run --database-url sqlite:////tmp/bench.db --baseline baseline.json
+    python -m benchmarks compare run.json baseline.json
+
+Other benchmarks run as modules: benchmarks.inquiry_ingest,
+benchmarks.serialization, benchmarks.compression, benchmarks.startup,
+benchmarks.similar, benchmarks.listing_index,
+benchmarks.sparse_fields, benchmarks.archival, benchmarks.coalescing.
+"""
+import argparse
+import asyncio
+import platform
+import sys
+from datetime import datetime, timezone
+
+from benchmarks import report
+from benchmarks.common import configure_environment
+
+
+def cmd_seed(args):
+    configure_environment(args.database_url)
+    from benchmarks.seed import seed
+
+    summary = seed(
+        args.database_url,
+        properties=args.properties,
+        images_per_property=args.images,
+        inquiries=args.inquiries,
+        batch_size=args.batch_size,
+        random_seed=args.seed,
+    )
+    print(f"Seeded {summary['properties']} properties, {summary['images']} images and "
+          f"{summary['inquiries']} inquiries in {summary['seconds']} s")
+
+
+def cmd_run(args):
+    overrides = {}
+    if not args.rate_limit:
+        overrides["RATE_LIMIT_ENABLED"] = "false"
+    if args.response_cache:
+        overrides["RESPONSE_CACHE_ENABLED"] = "true"
+    configure_environment(args.database_url, **overrides)
+    from benchmarks.load import run_load
+
+    scenarios = args.scenarios.split(",")
+    results = asyncio.run(run_load(
+        args.database_url,
+        scenarios=scenarios,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        max_requests=args.requests,
+    ))
+    current = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": args.database_url.split(":", 1)[0],
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "python": platform.python_version(),
+        },
+        "scenarios": {result.name: report.summarize(result) for result in results},
+    }
+    report.print_table(current)
+
+    if args.output:
+        report.save(current, args.output)
+    if args.baseline:
+        _check(current, report.load(args.baseline), args.tolerance)
+
+
+def cmd_compare(args):
+    _check(report.load(args.current), report.load(args.baseline), args.tolerance)
+
+
+def _check(current: dict, baseline: dict, tolerance: float):
+    regressions = report.compare(current, baseline, tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {tolerance:.0%} against baseline")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="create and fill a benchmark database")
+    seed.add_argument("--database-url", required=True)
+    seed.add_argument("--properties", type=int, default=10_000)
+    seed.add_argument("--images", type=int, default=4, help="images per property")
+    seed.add_argument("--inquiries", type=int, default=20_000)
+    seed.add_argument("--batch-size", type=int, default=5_000)
+    seed.add_argument("--seed", type=int, default=19)
+    seed.set_defaults(func=cmd_seed)
+
+    run = sub.add_parser("run", help="drive the app in-process and report latency")
+    run.add_argument("--database-url", required=True)
+    run.add_argument("--scenarios", default="list,search,detail,login,inquiry")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    run.add_argument("--requests", type=int, help="stop each scenario after this many requests")
+    run.add_argument("--rate-limit", action="store_true", help="keep the rate limiter enabled")
+    run.add_argument("--response-cache", action="store_true", help="enable the in-process response cache")
+    run.add_argument("--output", help="write results JSON here")
+    run.add_argument("--baseline", help="compare against this results JSON")
+    run.add_argument("--tolerance", type=float, default=0.10)
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="compare two results files")
+    compare.add_argument("current")
+    compare.add_argument("baseline")
+    compare.add_argument("--tolerance", type=float, default=0.10)
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
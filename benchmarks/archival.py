@@ -0,0 +1,82 @@
+# benchmarks/archival.py
+"""
+Listing latency before and after archiving sold and rented listings.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 100000
+    python -m benchmarks.archival --database-url sqlite:////tmp/bench.db --queries 300 --after-days 0
+
+Archives in place: run it against a copy of the benchmark database. The
+same random listing queries run before and after; the archival run itself
+is timed too.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import configure_environment
+from benchmarks.listing_index import random_filters, summary, timed
+
+
+def listing_latencies(session_factory, get_properties, property_types, queries: int) -> list:
+    rng = random.Random(49)
+    latencies = []
+    db = session_factory()
+    try:
+        for _ in range(queries):
+            timed(latencies, get_properties, db, limit=20, **random_filters(rng, property_types))
+            db.expunge_all()
+    finally:
+        db.close()
+    return latencies
+
+
+def table_sizes(session_factory) -> str:
+    from sqlalchemy import func, select
+    from app.models import ArchivedProperty, Property
+
+    db = session_factory()
+    try:
+        live = db.execute(select(func.count(Property.id))).scalar()
+        archived = db.execute(select(func.count(ArchivedProperty.id))).scalar()
+    finally:
+        db.close()
+    return f"{live} live, {archived} archived"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--after-days", type=int, default=0, help="archive listings unchanged this long")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    from app.core.archival import ListingArchiver
+    from app.crud.property import get_properties
+    from app.database import SessionLocal
+    from app.models import PropertyType
+
+    property_types = list(PropertyType)
+    # Warm up the page cache so the first phase is not penalised
+    listing_latencies(SessionLocal, get_properties, property_types, min(args.queries, 50))
+
+    print(f"before: {table_sizes(SessionLocal)}")
+    before = listing_latencies(SessionLocal, get_properties, property_types, args.queries)
+
+    archiver = ListingArchiver()
+    archiver.configure(SessionLocal, after_days=args.after_days, batch_size=args.batch_size)
+    start = time.perf_counter()
+    result = archiver.run()
+    elapsed = time.perf_counter() - start
+    print(f"archived {result['archived']} listings in {result['batches']} batches, {elapsed:.1f} s "
+          f"({result['archived'] / elapsed if elapsed else 0:.0f} listings/s)")
+
+    print(f"after:  {table_sizes(SessionLocal)}")
+    after = listing_latencies(SessionLocal, get_properties, property_types, args.queries)
+    print(f"listings before: {summary(before)}")
+    print(f"listings after:  {summary(after)}")
+
+
+if __name__ == "__main__":
+    main()
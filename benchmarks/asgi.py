@@ -0,0 +1,59 @@
+# benchmarks/asgi.py
+"""A minimal in-process ASGI client, so load runs measure the app rather than an HTTP stack"""
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+class ASGIResponse:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self):
+        self.status = 0
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+
+
+async def call(
+    app,
+    method: str,
+    path: str,
+    params: Optional[dict] = None,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+    body: bytes = b"",
+    client: Tuple[str, int] = ("127.0.0.1", 50000),
+) -> ASGIResponse:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params or {}, doseq=True).encode(),
+        "headers": [(b"host", b"bench")] + list(headers or []),
+        "client": client,
+        "server": ("bench", 80),
+    }
+    response = ASGIResponse()
+    chunks = []
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+            response.headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    response.body = b"".join(chunks)
+    return response
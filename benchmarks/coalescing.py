@@ -0,0 +1,85 @@
+# benchmarks/coalescing.py
+"""
+Bursts of identical concurrent reads with and without request coalescing.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 10000
+    python -m benchmarks.coalescing --database-url sqlite:////tmp/bench.db --burst 200 --rounds 20
+
+Each round sends `burst` simultaneous requests for one listing page and
+one property detail (a different property every round, so the response
+cache is bypassed and every burst starts cold).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.asgi import call
+from benchmarks.common import configure_environment
+from benchmarks.report import percentile
+
+
+async def run_bursts(app, slugs, burst: int) -> dict:
+    latencies, statuses = [], set()
+    start = time.perf_counter()
+    for round_number, slug in enumerate(slugs):
+        for path, params in (
+            (f"/api/v1/properties/slug/{slug}", {}),
+            ("/api/v1/properties/", {"skip": round_number * 20, "limit": 20}),
+        ):
+            sent = time.perf_counter()
+
+            async def one():
+                response = await call(app, "GET", path, params=params, headers=[(b"accept-encoding", b"gzip")])
+                latencies.append(time.perf_counter() - sent)
+                statuses.add(response.status)
+
+            await asyncio.gather(*[one() for _ in range(burst)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    assert statuses == {200}, statuses
+    return {"seconds": elapsed, "p50": percentile(latencies, 50), "p99": percentile(latencies, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--burst", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    configure_environment(args.database_url, RATE_LIMIT_ENABLED="false", RESPONSE_CACHE_ENABLED="false",
+                          SLOW_QUERY_LOG_ENABLED="false")
+    from sqlalchemy import select
+
+    from app.config import get_settings
+    from app.core.coalescing import coalescing_stats
+    from app.core.metrics import registry
+    from app.database import SessionLocal
+    from app.main import create_app
+    from app.models import Property
+
+    db = SessionLocal()
+    try:
+        slugs = db.execute(select(Property.slug).order_by(Property.id).limit(args.rounds * 2)).scalars().all()
+    finally:
+        db.close()
+
+    print(f"{'coalescing':<12}{'seconds':>10}{'p50 ms':>10}{'p99 ms':>10}{'collapse':>10}")
+    for enabled, round_slugs in ((False, slugs[:args.rounds]), (True, slugs[args.rounds:])):
+        os.environ["COALESCING_ENABLED"] = str(enabled).lower()
+        get_settings.cache_clear()
+        coalescing_stats.leaders.clear()
+        coalescing_stats.followers.clear()
+        result = asyncio.run(run_bursts(create_app(), round_slugs, args.burst))
+        leaders = sum(coalescing_stats.leaders.values())
+        served = leaders + sum(coalescing_stats.followers.values())
+        collapse = f"{served / leaders:.1f}x" if leaders else "-"
+        print(f"{'on' if enabled else 'off':<12}{result['seconds']:>10.2f}{result['p50'] * 1000:>10.1f}"
+              f"{result['p99'] * 1000:>10.1f}{collapse:>10}")
+    print()
+    print("\n".join(line for line in registry.render().splitlines() if line.startswith("request_coalescing_collapse")))
+
+
+if __name__ == "__main__":
+    main()
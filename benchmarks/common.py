@@ -0,0 +1,29 @@
+# benchmarks/common.py
+import os
+from typing import Optional
+
+DEFAULT_ENV = {
+    "DATABASE_URL": "sqlite://",
+    "SECRET_KEY": "benchmark",
+    "CLOUDINARY_CLOUD_NAME": "benchmark",
+    "CLOUDINARY_API_KEY": "benchmark",
+    "CLOUDINARY_API_SECRET": "benchmark",
+}
+
+
+def configure_environment(database_url: Optional[str] = None, **overrides):
+    """
+    Point the app's settings at a benchmark database before first use.
+    Values already present in the environment win over the defaults.
+    """
+    for name, value in DEFAULT_ENV.items():
+        os.environ.setdefault(name, value)
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    for name, value in overrides.items():
+        os.environ[name] = str(value)
+
+    from app.config import get_settings
+    from app.database import get_engine
+    get_settings.cache_clear()
+    get_engine.cache_clear()
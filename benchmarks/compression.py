@@ -0,0 +1,49 @@
+# benchmarks/compression.py
+"""
+Compression CPU per request vs. bytes saved, for on-the-fly and cached bodies.
+
+    python -m benchmarks.compression --rounds 200
+"""
+import argparse
+import time
+
+from benchmarks.serialization import make_property, fast_detail, fast_listing
+from app.core.compression import compress
+from app.core.response_cache import CachedBody
+
+
+def cpu_per_call(fn, rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = {
+        "detail": fast_detail(make_property(1)),
+        "listing x100": fast_listing([make_property(i) for i in range(100)]),
+    }
+
+    print(f"{'body':<14}{'mode':<18}{'bytes':>9}{'saved':>8}{'cpu us/req':>12}")
+    for name, body in bodies.items():
+        print(f"{name:<14}{'identity':<18}{len(body):>9}{'0%':>8}{0.0:>12.1f}")
+        for encoding in ("gzip", "br"):
+            for label, cached in (("on the fly", False), ("cached (once)", True)):
+                compressed = compress(body, encoding, cached=cached)
+                cpu = cpu_per_call(lambda: compress(body, encoding, cached=cached), args.rounds)
+                saved = 1 - len(compressed) / len(body)
+                print(f"{name:<14}{encoding + ' ' + label:<18}{len(compressed):>9}{saved:>8.0%}{cpu * 1e6:>12.1f}")
+
+            entry = CachedBody(body)
+            entry.encoded(encoding)
+            cpu = cpu_per_call(lambda: entry.encoded(encoding), args.rounds * 100)
+            print(f"{name:<14}{encoding + ' cache hit':<18}{len(entry.encoded(encoding)):>9}{'':>8}{cpu * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/inquiry_ingest.py
+"""
+Sustained inquiry ingestion: one commit per inquiry vs. the write-behind buffer.
+
+    python -m benchmarks.inquiry_ingest --count 5000 --threads 8
+    python -m benchmarks.inquiry_ingest --database-url postgresql://... --spool /tmp/inquiries.spool
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import configure_environment
+configure_environment()
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import ContactInquiry
+from app.schemas.inquiry import InquiryCreate
+from app.crud.inquiry import create_inquiry
+from app.core.inquiry_buffer import InquiryBuffer
+
+
+def make_inquiry(i: int) -> InquiryCreate:
+    return InquiryCreate(
+        name=f"Buyer {i}",
+        email=f"buyer{i}@example.com",
+        phone="9876543210",
+        message="Interested in this property, please call me back.",
+    )
+
+
+def run_direct(session_factory, inquiries, threads: int) -> float:
+    def work(inquiry):
+        db = session_factory()
+        try:
+            create_inquiry(db, inquiry)
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, inquiries))
+    return time.perf_counter() - start
+
+
+def run_buffered(session_factory, inquiries, threads: int, batch: int, spool_path=None) -> float:
+    buffer = InquiryBuffer()
+    buffer.start(
+        session_factory,
+        max_batch=batch,
+        flush_seconds=0.05,
+        max_pending=len(inquiries),
+        spool_path=spool_path,
+    )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda inquiry: buffer.submit(inquiry.model_dump()), inquiries))
+    # Include the drain so the number reflects rows actually committed
+    buffer.stop()
+    return time.perf_counter() - start
+
+
+def fresh_database(url):
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--count", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--spool", help="spool file path for the durable buffered run")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    inquiries = [make_inquiry(i) for i in range(args.count)]
+
+    runs = [("direct", lambda f: run_direct(f, inquiries, args.threads))]
+    runs.append(("buffered", lambda f: run_buffered(f, inquiries, args.threads, args.batch)))
+    spool = args.spool or os.path.join(tmpdir.name, "inquiries.spool")
+    runs.append(("buffered+spool", lambda f: run_buffered(f, inquiries, args.threads, args.batch, spool)))
+
+    print(f"{'mode':<16}{'seconds':>10}{'inquiries/s':>14}{'rows':>8}")
+    for name, run in runs:
+        engine, session_factory = fresh_database(url)
+        elapsed = run(session_factory)
+        with engine.connect() as conn:
+            rows = conn.execute(select(func.count()).select_from(ContactInquiry)).scalar()
+        print(f"{name:<16}{elapsed:>10.3f}{args.count / elapsed:>14.0f}{rows:>8}")
+        engine.dispose()
+
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
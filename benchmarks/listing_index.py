@@ -0,0 +1,85 @@
+# benchmarks/listing_index.py
+"""
+Listing filters from the in-memory columnar index against the SQL query.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 100000
+    python -m benchmarks.listing_index --database-url sqlite:////tmp/bench.db --queries 300
+
+Both paths return the same page, with images (checked for every query).
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import configure_environment
+from benchmarks.report import percentile
+from benchmarks.seed import CITIES
+
+
+def random_filters(rng: random.Random, property_types) -> dict:
+    filters = {}
+    if rng.random() < 0.5:
+        filters["property_type"] = rng.choice(property_types)
+    if rng.random() < 0.4:
+        filters["min_price"] = rng.randint(5, 50) * 100_000
+    if rng.random() < 0.4:
+        filters["max_price"] = rng.randint(50, 300) * 100_000
+    if rng.random() < 0.4:
+        filters["min_bedrooms"] = rng.randint(1, 4)
+    if rng.random() < 0.5:
+        filters["city"] = rng.choice(CITIES)[0][:5].lower()
+    if rng.random() < 0.2:
+        filters["is_featured"] = True
+    if rng.random() < 0.1:
+        filters["is_special_offer"] = True
+    filters["skip"] = rng.choice([0, 0, 0, 20, 100])
+    return filters
+
+
+def timed(latencies, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    latencies.append(time.perf_counter() - start)
+    return result
+
+
+def summary(latencies) -> str:
+    latencies.sort()
+    return f"p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    from app.core.listing_index import ListingIndex
+    from app.crud.property import get_properties
+    from app.database import SessionLocal
+    from app.models import PropertyType
+
+    rng = random.Random(42)
+    property_types = list(PropertyType)
+    index = ListingIndex()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        index.load(db)
+        print(f"loaded {index.size} listings in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        sql, memory = [], []
+        for _ in range(args.queries):
+            filters = random_filters(rng, property_types)
+            expected = timed(sql, get_properties, db, limit=20, **filters)
+            actual = timed(memory, index.get_properties, db, limit=20, **filters)
+            assert [prop.id for prop in actual] == [prop.id for prop in expected], filters
+    finally:
+        db.close()
+    print(f"SQL:    {summary(sql)}")
+    print(f"index:  {summary(memory)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/load.py
+"""
+Drive the real ASGI app in-process at a fixed concurrency, one scenario at a time.
+
+    python -m benchmarks run --database-url sqlite:////tmp/bench.db --concurrency 16 --duration 10
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.asgi import call
+from benchmarks.seed import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD, CITIES, SEARCH_TERMS
+
+SCENARIOS = ("list", "search", "detail", "login", "inquiry")
+
+API = "/api/v1"
+FORM = [(b"content-type", b"application/x-www-form-urlencoded")]
+JSON = [(b"content-type", b"application/json")]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class Workload:
+    """Builds randomized requests for each scenario from a sample of the seeded data"""
+
+    def __init__(self, database_url: str, rng: random.Random, sample_size: int = 2000):
+        from app.models import Property, PropertyStatus
+
+        engine = create_engine(database_url)
+        with engine.connect() as conn:
+            self.slugs = conn.execute(
+                select(Property.slug)
+                .where(Property.status == PropertyStatus.AVAILABLE)
+                .order_by(func.random())
+                .limit(sample_size)
+            ).scalars().all()
+            self.max_property_id = conn.execute(select(func.max(Property.id))).scalar() or 0
+        engine.dispose()
+        self.rng = rng
+
+    def list(self):
+        params = {"skip": self.rng.choice([0, 0, 0, 20, 40, 100]), "limit": 20}
+        roll = self.rng.random()
+        if roll < 0.4:
+            params["property_type"] = self.rng.choice(["SELL", "RENT", "BUY"])
+        if roll < 0.3:
+            params["min_bedrooms"] = self.rng.randint(1, 4)
+        if roll < 0.2:
+            params["city"] = self.rng.choice(CITIES)[0]
+        if roll < 0.1:
+            params["max_price"] = self.rng.choice([2_000_000, 5_000_000, 10_000_000])
+        return "GET", f"{API}/properties/", params, [], b""
+
+    def search(self):
+        params = {"search": self.rng.choice(SEARCH_TERMS), "limit": 20}
+        return "GET", f"{API}/properties/", params, [], b""
+
+    def detail(self):
+        return "GET", f"{API}/properties/slug/{self.rng.choice(self.slugs)}", None, [], b""
+
+    def login(self):
+        body = f"username={BENCH_ADMIN_EMAIL}&password={BENCH_ADMIN_PASSWORD}".encode()
+        return "POST", f"{API}/auth/login", None, FORM, body
+
+    def inquiry(self):
+        n = self.rng.randint(1, 10**9)
+        body = json.dumps({
+            "property_id": self.rng.randint(1, self.max_property_id) if self.max_property_id else None,
+            "name": f"Load Test {n}",
+            "email": f"load{n}@example.com",
+            "phone": "9876543210",
+            "message": "Please call me back about this listing.",
+        }).encode()
+        return "POST", f"{API}/inquiries/", None, JSON, body
+
+
+async def run_scenario(
+    app,
+    name: str,
+    make_request: Callable,
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int] = None,
+    warmup: int = 20,
+) -> ScenarioResult:
+    result = ScenarioResult(name)
+
+    for _ in range(warmup):
+        method, path, params, headers, body = make_request()
+        await call(app, method, path, params, headers, body)
+
+    deadline = time.perf_counter() + duration
+    remaining = [max_requests if max_requests is not None else float("inf")]
+
+    async def worker(worker_id: int):
+        client = (f"10.0.{worker_id // 250}.{worker_id % 250 + 1}", 40000 + worker_id)
+        while time.perf_counter() < deadline and remaining[0] > 0:
+            remaining[0] -= 1
+            method, path, params, headers, body = make_request()
+            start = time.perf_counter()
+            try:
+                response = await call(app, method, path, params, headers, body, client=client)
+                status = response.status
+            except Exception:
+                status = 599
+            result.latencies.append(time.perf_counter() - start)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+            if status >= 400:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_load(
+    database_url: str,
+    scenarios=SCENARIOS,
+    concurrency: int = 16,
+    duration: float = 10.0,
+    max_requests: Optional[int] = None,
+    random_seed: int = 7,
+) -> List[ScenarioResult]:
+    from app.main import create_app
+
+    app = create_app()
+    workload = Workload(database_url, random.Random(random_seed))
+    results = []
+    async with app.router.lifespan_context(app):
+        for name in scenarios:
+            results.append(await run_scenario(
+                app, name, getattr(workload, name), concurrency, duration, max_requests
+            ))
+    return results
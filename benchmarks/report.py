@@ -0,0 +1,69 @@
+# benchmarks/report.py
+import json
+import math
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(result) -> Dict[str, float]:
+    latencies = sorted(result.latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": result.errors,
+        "statuses": {str(status): n for status, n in sorted(result.statuses.items())},
+        "throughput_rps": round(count / result.elapsed, 1) if result.elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / count * 1000, 2) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if count else 0.0,
+    }
+
+
+def print_table(report: dict):
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["scenarios"].items():
+        print(
+            f"{name:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> List[str]:
+    """
+    Regressions of `current` against `baseline`: a p99 more than `tolerance`
+    slower, or throughput more than `tolerance` lower, per scenario.
+    """
+    regressions = []
+    for name, stats in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if base["p99_ms"] and stats["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {stats['p99_ms']:.2f} ms vs baseline {base['p99_ms']:.2f} ms"
+            )
+        if base["throughput_rps"] and stats["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {stats['throughput_rps']:.1f} rps vs baseline {base['throughput_rps']:.1f} rps"
+            )
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(report: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
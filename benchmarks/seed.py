@@ -0,0 +1,180 @@
+# benchmarks/seed.py
+"""
+Seed a synthetic Tirupur dataset for load benchmarks.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 10000
+    python -m benchmarks seed --database-url postgresql://... --properties 1000000 --images 4
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+
+BENCH_ADMIN_EMAIL = "bench-admin@tirupurhomes.test"
+BENCH_ADMIN_PASSWORD = "bench-password"
+
+CITIES = [
+    ("Tirupur", "641601", 11.1085, 77.3411),
+    ("Avinashi", "641654", 11.1929, 77.2680),
+    ("Palladam", "641664", 10.9917, 77.2869),
+    ("Dharapuram", "638656", 10.7381, 77.5322),
+    ("Kangeyam", "638701", 11.0060, 77.5619),
+    ("Udumalaipettai", "642126", 10.5854, 77.2482),
+    ("Perumanallur", "641666", 11.2094, 77.3662),
+    ("Uthukuli", "638751", 11.1000, 77.4500),
+    ("Vellakoil", "638111", 10.9320, 77.7160),
+]
+
+AREAS = [
+    "Avinashi Road", "Kumaran Road", "Palladam Road", "Kangeyam Road", "PN Road",
+    "Dharapuram Road", "Mangalam Road", "Gandhi Nagar", "Anupparpalayam", "Veerapandi",
+]
+
+KINDS = ["apartment", "independent house", "villa", "plot", "row house", "duplex"]
+
+FEATURES = [
+    "covered car parking", "borewell and corporation water", "vastu compliant",
+    "near schools and hospitals", "gated community", "24x7 security",
+    "modular kitchen", "east facing", "close to the bus stand", "park facing",
+]
+
+# Words that appear in titles/descriptions and so make realistic search terms
+SEARCH_TERMS = ["villa", "apartment", "gated", "vastu", "Avinashi", "plot", "duplex", "park"]
+
+
+def _properties(count: int, start_id: int, rng: random.Random, now: datetime, admin_id: int):
+    for pid in range(start_id, start_id + count):
+        city, zip_code, lat, lon = rng.choice(CITIES)
+        area_name = rng.choice(AREAS)
+        kind = rng.choice(KINDS)
+        bedrooms = rng.randint(1, 5)
+        property_type = rng.choices(["SELL", "RENT", "BUY"], weights=[6, 3, 1])[0]
+        area = rng.randint(500, 4000)
+        if property_type == "RENT":
+            price = round(rng.uniform(6, 25) * area, -2)
+        else:
+            price = round(rng.uniform(2500, 7500) * area, -3)
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 730))
+        title = f"{bedrooms} BHK {kind} on {area_name}, {city}"
+        sentence = ", ".join(rng.sample(FEATURES, 4)).capitalize() + ". "
+        yield {
+            "id": pid,
+            "title": title,
+            "slug": f"{bedrooms}-bhk-{kind.replace(' ', '-')}-{city.lower()}-{pid}",
+            "description": sentence * rng.randint(1, 6),
+            "price": min(price, 99_999_999),
+            "property_type": property_type,
+            "status": rng.choices(["AVAILABLE", "SOLD", "RENTED", "PENDING"], weights=[80, 10, 7, 3])[0],
+            "address": f"{rng.randint(1, 400)} {area_name}",
+            "city": city,
+            "state": "Tamil Nadu",
+            "zip_code": zip_code,
+            "latitude": lat + rng.uniform(-0.05, 0.05),
+            "longitude": lon + rng.uniform(-0.05, 0.05),
+            "bedrooms": bedrooms,
+            "bathrooms": max(1, bedrooms - rng.randint(0, 1)),
+            "area": area,
+            "parking": rng.random() < 0.7,
+            "furnished": rng.random() < 0.3,
+            "is_featured": rng.random() < 0.03,
+            "is_special_offer": rng.random() < 0.02,
+            "offer_text": None,
+            "created_by_id": admin_id,
+            "created_at": created,
+            "updated_at": created + timedelta(days=rng.randint(0, 30)) if rng.random() < 0.3 else None,
+        }
+
+
+def seed(
+    database_url: str,
+    properties: int = 10_000,
+    images_per_property: int = 4,
+    inquiries: int = 20_000,
+    batch_size: int = 5_000,
+    random_seed: int = 19,
+    drop: bool = True,
+) -> dict:
+    """Create the schema and insert a deterministic synthetic dataset"""
+    from app.core.security import get_password_hash
+    from app.database import Base
+    from app.models import Property, PropertyImage, ContactInquiry, User
+
+    rng = random.Random(random_seed)
+    now = datetime.now(timezone.utc)
+    engine = create_engine(database_url)
+    started = time.perf_counter()
+
+    if drop:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        admin_id = conn.execute(
+            insert(User).returning(User.id),
+            {
+                "email": BENCH_ADMIN_EMAIL,
+                "name": "Benchmark Admin",
+                "hashed_password": get_password_hash(BENCH_ADMIN_PASSWORD),
+                "role": "ADMIN",
+                "is_active": True,
+            },
+        ).scalar_one()
+
+    image_id = 1
+    for start in range(1, properties + 1, batch_size):
+        count = min(batch_size, properties + 1 - start)
+        rows = list(_properties(count, start, rng, now, admin_id))
+        images = []
+        for row in rows:
+            for order in range(images_per_property):
+                images.append({
+                    "id": image_id,
+                    "property_id": row["id"],
+                    "url": f"https://res.cloudinary.com/demo/image/upload/tirupur-homes/property-{row['id']}/{order}.jpg",
+                    "public_id": f"tirupur-homes/property-{row['id']}/{order}",
+                    "caption": None,
+                    "order": order,
+                    "uploaded_at": row["created_at"],
+                })
+                image_id += 1
+        with engine.begin() as conn:
+            conn.execute(insert(Property), rows)
+            if images:
+                conn.execute(insert(PropertyImage), images)
+
+    for start in range(0, inquiries, batch_size):
+        count = min(batch_size, inquiries - start)
+        rows = [
+            {
+                "property_id": rng.randint(1, properties) if properties else None,
+                "name": f"Buyer {start + n}",
+                "email": f"buyer{start + n}@example.com",
+                "phone": f"98{rng.randint(10_000_000, 99_999_999)}",
+                "message": "Interested in this property, please share more details.",
+                "is_read": rng.random() < 0.6,
+                "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+            }
+            for n in range(count)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(ContactInquiry), rows)
+
+    if engine.dialect.name == "postgresql":
+        # Explicit ids bypass the sequences; move them past the seeded rows
+        with engine.begin() as conn:
+            for table in ("users", "properties", "property_images", "contact_inquiries"):
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                )
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+    engine.dispose()
+    return {
+        "properties": properties,
+        "images": properties * images_per_property,
+        "inquiries": inquiries,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,135 @@
+# benchmarks/serialization.py
+"""
+Property response serialization: pydantic double validation vs. the fast path.
+
+    python -m benchmarks.serialization --rounds 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from benchmarks.common import configure_environment
+configure_environment()
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Property, PropertyImage, PropertyType, PropertyStatus
+from app.schemas.property import PropertyResponse, PropertyListResponse
+from app.utils.serializers import serialize_property, serialize_property_list_item
+
+
+def make_property(i: int, images: int = 6) -> Property:
+    now = datetime.now(timezone.utc)
+    prop = Property(
+        id=i,
+        title=f"Spacious {i % 4 + 1} BHK independent house near Avinashi Road",
+        slug=f"spacious-house-{i}",
+        description="Vastu compliant home with covered car parking, borewell and corporation water. " * 12,
+        price=4500000 + i * 1000,
+        property_type=PropertyType.SELL,
+        status=PropertyStatus.AVAILABLE,
+        address=f"{i} Kumaran Road",
+        city="Tirupur",
+        state="Tamil Nadu",
+        zip_code="641601",
+        latitude=11.1085 + i * 1e-5,
+        longitude=77.3411 + i * 1e-5,
+        bedrooms=i % 4 + 1,
+        bathrooms=2,
+        area=1200 + i,
+        parking=True,
+        furnished=False,
+        is_featured=i % 10 == 0,
+        is_special_offer=False,
+        offer_text=None,
+        created_at=now,
+        updated_at=now,
+    )
+    prop.images = [
+        PropertyImage(
+            id=i * 100 + n,
+            url=f"https://res.cloudinary.com/demo/image/upload/tirupur-homes/property-{i}/{n}.jpg",
+            public_id=f"tirupur-homes/property-{i}/{n}",
+            caption=None,
+            order=n,
+            uploaded_at=now,
+        )
+        for n in range(images)
+    ]
+    return prop
+
+
+async def legacy_detail(prop, field) -> bytes:
+    response = PropertyResponse(
+        **prop.__dict__,
+        gmap_url=prop.gmap_url,
+        directions_url=prop.directions_url
+    )
+    content = await serialize_response(field=field, response_content=response)
+    return JSONResponse(content).body
+
+
+async def legacy_listing(props, field) -> bytes:
+    result = []
+    for prop in props:
+        prop_dict = PropertyListResponse.model_validate(prop).model_dump()
+        if prop.images:
+            prop_dict['thumbnail'] = prop.images[0].url
+        result.append(PropertyListResponse(**prop_dict))
+    content = await serialize_response(field=field, response_content=result)
+    return JSONResponse(content).body
+
+
+def fast_detail(prop) -> bytes:
+    return ORJSONResponse(serialize_property(prop)).body
+
+
+def fast_listing(props) -> bytes:
+    return ORJSONResponse([
+        serialize_property_list_item(prop, thumbnail=prop.images[0].url if prop.images else None)
+        for prop in props
+    ]).body
+
+
+async def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+    return (time.perf_counter() - start) / rounds
+
+
+async def run(rounds: int):
+    detail = make_property(1)
+    listing = [make_property(i) for i in range(100)]
+    detail_field = create_model_field("Response_get_property", PropertyResponse)
+    listing_field = create_model_field("Response_list_properties", List[PropertyListResponse])
+
+    cases = [
+        ("detail", rounds,
+         lambda: legacy_detail(detail, detail_field), lambda: fast_detail(detail)),
+        ("listing x100", max(1, rounds // 20),
+         lambda: legacy_listing(listing, listing_field), lambda: fast_listing(listing)),
+    ]
+
+    print(f"{'case':<14}{'legacy us':>12}{'fast us':>12}{'speedup':>10}")
+    for name, n, legacy, fast in cases:
+        legacy_s = await timed(legacy, n)
+        fast_s = await timed(fast, n)
+        print(f"{name:<14}{legacy_s * 1e6:>12.1f}{fast_s * 1e6:>12.1f}{legacy_s / fast_s:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/similar.py
+"""
+Similar-listings scoring over a large in-memory feature matrix.
+
+    python -m benchmarks.similar --listings 200000 --queries 500
+"""
+import argparse
+import random
+import time
+from collections import namedtuple
+
+from benchmarks.common import configure_environment
+configure_environment()
+
+from app.core.similar import SimilarityIndex
+from app.models import PropertyStatus, PropertyType
+from benchmarks.report import percentile
+
+Row = namedtuple("Row", "id status property_type price area bedrooms bathrooms furnished parking latitude longitude")
+
+
+def make_rows(count: int, rng: random.Random):
+    types = list(PropertyType)
+    for i in range(1, count + 1):
+        bedrooms = rng.randint(1, 5)
+        yield Row(
+            id=i,
+            status=PropertyStatus.AVAILABLE,
+            property_type=rng.choice(types),
+            price=rng.randint(8, 200) * 50_000 * bedrooms,
+            area=rng.randint(400, 900) * bedrooms,
+            bedrooms=bedrooms,
+            bathrooms=rng.randint(1, bedrooms),
+            furnished=rng.random() < 0.3,
+            parking=rng.random() < 0.6,
+            latitude=11.0 + rng.random() * 0.4 if rng.random() < 0.9 else None,
+            longitude=77.2 + rng.random() * 0.4,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = random.Random(41)
+    rows = list(make_rows(args.listings, rng))
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    index._fit(rows)
+    index._upsert(rows)
+    index.loaded = True
+    print(f"built {args.listings} rows in {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"{index.features.nbytes / 1e6:.1f} MB features")
+
+    latencies = []
+    for _ in range(args.queries):
+        property_id = rng.randint(1, args.listings)
+        start = time.perf_counter()
+        index.similar(property_id, args.limit)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"top-{args.limit} over {args.listings} listings: "
+          f"p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
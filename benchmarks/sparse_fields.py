@@ -0,0 +1,85 @@
+# benchmarks/sparse_fields.py
+"""
+Listing projections: rows/sec read from the database and bytes on the wire.
+
+    python -m benchmarks seed --database-url sqlite:////tmp/bench.db --properties 20000
+    python -m benchmarks.sparse_fields --database-url sqlite:////tmp/bench.db --pages 200
+
+"all columns" is the listing as it was before projections, loading every
+Property column; "default" is the compact listing projection.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.asgi import call
+from benchmarks.common import configure_environment
+
+SPARSE = "title,price,thumbnail"
+PAGE_SIZE = 100
+
+
+def read_rows(session_factory, get_properties, pages: int, total: int, **projection) -> float:
+    """Listing rows per second over `pages` random pages of PAGE_SIZE"""
+    rng = random.Random(46)
+    rows = 0
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        for _ in range(pages):
+            rows += len(get_properties(db, skip=rng.randrange(max(total - PAGE_SIZE, 1)), limit=PAGE_SIZE, **projection))
+            db.expunge_all()
+        return rows / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+async def wire_bytes(app, params: dict, encoding: str = "") -> int:
+    headers = [(b"accept-encoding", encoding.encode())] if encoding else []
+    response = await call(app, "GET", "/api/v1/properties/", params={"limit": PAGE_SIZE, **params}, headers=headers)
+    assert response.status == 200, response.body
+    return len(response.body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    configure_environment(args.database_url, RATE_LIMIT_ENABLED="false", RESPONSE_CACHE_ENABLED="false")
+    from sqlalchemy import func, select
+
+    from app.api.v1.properties import LIST_COLUMNS, _listing_projection
+    from app.crud.property import get_properties
+    from app.database import SessionLocal
+    from app.main import create_app
+    from app.models import Property
+
+    db = SessionLocal()
+    try:
+        total = db.execute(select(func.count(Property.id))).scalar()
+    finally:
+        db.close()
+    _, sparse_columns = _listing_projection(SPARSE)
+
+    print(f"{'projection':<32}{'rows/s':>10}{'bytes':>10}{'gzip':>10}")
+    app = create_app()
+    variants = [
+        ("all columns", {"columns": None}, None),
+        ("default", {"columns": LIST_COLUMNS}, {}),
+        (f"fields={SPARSE}", {"columns": sparse_columns}, {"fields": SPARSE}),
+    ]
+    for name, projection, params in variants:
+        rate = read_rows(SessionLocal, get_properties, args.pages, total, **projection)
+        if params is None:
+            print(f"{name:<32}{rate:>10.0f}{'-':>10}{'-':>10}")
+            continue
+        plain = asyncio.run(wire_bytes(app, params))
+        gzipped = asyncio.run(wire_bytes(app, params, "gzip"))
+        print(f"{name:<32}{rate:>10.0f}{plain:>10}{gzipped:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/startup.py
+"""
+Import and app-construction cost, measured in fresh interpreters.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --max-import-ms 900   # non-zero exit if slower
+
+Every run uses an unreachable database URL, so it also checks that startup
+no longer needs the database.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ENV = {
+    "DATABASE_URL": "postgresql://nobody@127.0.0.1:1/unreachable",
+    "SECRET_KEY": "benchmark",
+    "CLOUDINARY_CLOUD_NAME": "benchmark",
+    "CLOUDINARY_API_KEY": "benchmark",
+    "CLOUDINARY_API_SECRET": "benchmark",
+}
+
+IMPORT_APP = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+BUILD_APP = (
+    "import time; t = time.perf_counter(); from app.main import create_app; "
+    "create_app(); print(time.perf_counter() - t)"
+)
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, **ENV, PYTHONPATH=os.getcwd())
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def timed(code: str, runs: int) -> float:
+    return statistics.median(float(run_python(code).stdout.strip()) for _ in range(runs))
+
+
+def slowest_imports(limit: int):
+    """Top-level and app.* modules by cumulative import time, from -X importtime"""
+    result = run_python("import app.main", "-X", "importtime")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        indent = len(name) - len(name.lstrip())
+        if indent <= 3 or name.strip().startswith("app."):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-import-ms", type=float, help="fail if importing app.main is slower")
+    args = parser.parse_args()
+
+    import_s = timed(IMPORT_APP, args.runs)
+    build_s = timed(BUILD_APP, args.runs)
+    print(f"import app.main          {import_s * 1000:8.1f} ms (median of {args.runs})")
+    print(f"import + create_app()    {build_s * 1000:8.1f} ms (median of {args.runs})")
+    print()
+    print(f"{'cumulative ms':>14}  module")
+    for cumulative_us, name in slowest_imports(args.top):
+        print(f"{cumulative_us / 1000:>14.1f}  {name}")
+
+    if args.max_import_ms and import_s * 1000 > args.max_import_ms:
+        print(f"\nimport time {import_s * 1000:.1f} ms exceeds budget {args.max_import_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# tests/conftest.py
+import os
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("CLOUDINARY_CLOUD_NAME", "test")
+os.environ.setdefault("CLOUDINARY_API_KEY", "test")
+os.environ.setdefault("CLOUDINARY_API_SECRET", "test")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    """A fresh SQLite file per test, with the schema created from the models"""
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.config import get_settings
+    from app.database import Base, get_engine
+
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    get_settings.cache_clear()
+    get_engine.cache_clear()
+    Base.metadata.create_all(get_engine())
+    yield url
+    get_engine().dispose()
+    get_settings.cache_clear()
+    get_engine.cache_clear()
+
+
+@pytest.fixture
+def client(database_url):
+    from fastapi.testclient import TestClient
+    from app.main import create_app
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(client):
+    client.post("/api/v1/auth/register", json={
+        "email": "admin@example.com",
+        "password": "secret-password",
+        "name": "Admin",
+    })
+    response = client.post("/api/v1/auth/login", data={
+        "username": "admin@example.com",
+        "password": "secret-password",
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert a per-endpoint query budget; repeated identical statements fail
+    too, with the call sites that issued them.
+
+        with query_budget(2):
+            client.get("/api/v1/properties/")
+    """
+    from app.core.query_recorder import assert_query_budget
+    return assert_query_budget
@@ -0,0 +1,79 @@
+# tests/test_app.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.config import get_settings
+from app.core.coalescing import CoalescingMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.query_recorder import QueryDebugMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.replicas import ReadYourWritesMiddleware
+from app.core.slow_query import SlowQueryContextMiddleware
+from app.main import create_app
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_create_app_builds_independent_instances():
+    first, second = create_app(), create_app()
+    assert first is not second
+    assert first.router is not second.router
+
+    @first.get("/only-first")
+    def only_first():
+        return {}
+
+    assert "/only-first" in {route.path for route in first.routes}
+    assert "/only-first" not in {route.path for route in second.routes}
+
+
+def test_import_reads_no_settings_and_opens_no_connection(tmp_path):
+    # Run away from .env and without the required settings: reading them would raise
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("SECRET_KEY", "CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET")}
+    env["DATABASE_URL"] = "postgresql://nobody@unreachable.invalid/none"
+    env["PYTHONPATH"] = str(ROOT)
+    code = (
+        "import app.main\n"
+        "from app.config import get_settings\n"
+        "from app.database import get_engine\n"
+        "assert get_settings.cache_info().currsize == 0, 'settings were read'\n"
+        "assert get_engine.cache_info().currsize == 0, 'an engine was created'\n"
+        "assert '_app' in vars(app.main) and app.main._app is None\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    result = subprocess.run([sys.executable, "-c", "import app.main; app.main.app"], cwd=tmp_path, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode != 0 and "SECRET_KEY" in result.stderr
+
+
+def test_middleware_order(monkeypatch):
+    for name in ("RATE_LIMIT_ENABLED", "COMPRESSION_ENABLED", "COALESCING_ENABLED", "QUERY_DEBUG",
+                 "SLOW_QUERY_LOG_ENABLED", "METRICS_ENABLED"):
+        monkeypatch.setenv(name, "true")
+    monkeypatch.setenv("READ_REPLICA_URLS", '["sqlite:///replica.db"]')
+    get_settings.cache_clear()
+    try:
+        app = create_app()
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+    # Outermost first: metrics time everything, CORS headers wrap 429s, coalescing shares compressed bytes
+    assert [middleware.cls for middleware in app.user_middleware] == [
+        MetricsMiddleware,
+        SlowQueryContextMiddleware,
+        CORSMiddleware,
+        QueryDebugMiddleware,
+        ReadYourWritesMiddleware,
+        CoalescingMiddleware,
+        CompressionMiddleware,
+        RateLimitMiddleware,
+    ]
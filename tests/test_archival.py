@@ -0,0 +1,98 @@
+# tests/test_archival.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.archival import listing_archiver
+from app.core.events import property_events
+from app.crud.property import unique_slug
+from app.database import SessionLocal
+from app.models import (
+    ArchivedInquiry, ArchivedProperty, ArchivedPropertyImage, ContactInquiry, Property, PropertyImage,
+    PropertyStatus,
+)
+
+from tests.test_properties import API, seed_properties
+
+NOW = datetime.now(timezone.utc)
+
+
+def age(changes):
+    """Set status and last-change time per property id: {id: (status, days ago)}"""
+    db = SessionLocal()
+    try:
+        for property_id, (status, days) in changes.items():
+            prop = db.get(Property, property_id)
+            prop.status = status
+            prop.created_at = NOW - timedelta(days=days + 30)
+            prop.updated_at = NOW - timedelta(days=days)
+            db.add(ContactInquiry(property_id=property_id, name="Buyer", email="b@example.com", phone="1",
+                                  message="Still available?"))
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def events():
+    received = []
+    property_events.subscribe(received.append)
+    yield received
+    property_events.unsubscribe(received.append)
+
+
+def test_archives_old_sold_and_rented_in_batches(client, events):
+    seed_properties(6, images=2)
+    age({
+        1: (PropertyStatus.SOLD, 400),
+        2: (PropertyStatus.SOLD, 10),         # too recent
+        3: (PropertyStatus.AVAILABLE, 400),   # still on the market
+        4: (PropertyStatus.RENTED, 200),
+        5: (PropertyStatus.PENDING, 400),
+        6: (PropertyStatus.RENTED, 365),
+    })
+    listing_archiver.configure(SessionLocal, after_days=180, batch_size=2)
+    result = listing_archiver.run()
+    assert (result["archived"], result["batches"]) == (3, 2)
+    assert listing_archiver.run()["archived"] == 0
+    assert sorted(event.property_id for event in events if event.action == "deleted") == [1, 4, 6]
+
+    db = SessionLocal()
+    try:
+        assert [p.id for p in db.query(Property).order_by(Property.id)] == [2, 3, 5]
+        assert sorted({i.property_id for i in db.query(PropertyImage)}) == [2, 3, 5]
+        archived = db.get(ArchivedProperty, 4)
+        assert (archived.slug, archived.status, archived.version) == ("villa-3", PropertyStatus.RENTED, 1)
+        assert archived.archived_at is not None
+        assert [image.order for image in archived.images] == [0, 1]
+        assert db.query(ArchivedPropertyImage).count() == 6
+        assert sorted(i.property_id for i in db.query(ArchivedInquiry)) == [1, 4, 6]
+        assert sorted(i.property_id for i in db.query(ContactInquiry)) == [2, 3, 5]
+        # Archived slugs stay taken
+        assert unique_slug(db, "Villa 0") == "villa-0-1"
+    finally:
+        db.close()
+
+    assert [p["id"] for p in client.get(f"{API}/").json()] == [3]
+
+
+def test_archived_slugs_still_resolve(client, admin_headers):
+    seed_properties(2, images=2)
+    age({1: (PropertyStatus.SOLD, 400)})
+    live = client.get(f"{API}/slug/villa-0").json()
+
+    response = client.post("/api/v1/admin/archive", params={"after_days": 30}, headers=admin_headers)
+    assert (response.status_code, response.json()["archived"]) == (200, 1)
+
+    old_link = client.get(f"{API}/slug/villa-0")
+    assert old_link.status_code == 200
+    archived = old_link.json()
+    assert archived["archived_at"] is not None
+    assert old_link.headers["etag"] == '"property-1-1"'
+    assert {key: archived[key] for key in ("id", "title", "status", "images", "price")} == \
+        {key: live[key] for key in ("id", "title", "status", "images", "price")}
+
+    assert "archived_at" not in client.get(f"{API}/slug/villa-1").json()
+    assert client.get(f"{API}/slug/villa-9").status_code == 404
+    assert client.get(f"{API}/1").status_code == 404
+    assert client.post("/api/v1/admin/archive").status_code == 401
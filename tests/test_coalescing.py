@@ -0,0 +1,120 @@
+# tests/test_coalescing.py
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.core.coalescing import CoalescingMiddleware, CoalescingStats, coalescing_stats
+from app.core.metrics import registry
+from app.core.query_recorder import QueryRecorder
+
+from tests.test_properties import API, seed_properties
+
+
+def build_app(stats: CoalescingStats, calls: list, max_body_bytes: int = 1 << 20) -> FastAPI:
+    app = FastAPI()
+    lock = threading.Lock()
+
+    def record(name):
+        with lock:
+            calls.append(name)
+
+    @app.get("/sync/{item}")
+    def sync_item(item: str, size: int = 10):
+        record("sync")
+        time.sleep(0.2)   # a slow query, in the threadpool
+        return {"item": item, "calls": len(calls), "padding": "x" * size}
+
+    @app.get("/async/{item}")
+    async def async_item(item: str):
+        record("async")
+        await asyncio.sleep(0.2)
+        return {"item": item, "calls": len(calls)}
+
+    @app.get("/fails")
+    def fails():
+        record("fails")
+        time.sleep(0.1)
+        raise HTTPException(status_code=503, detail="down") if len(calls) > 1 else RuntimeError("boom")
+
+    @app.get("/events")
+    async def events():
+        record("events")
+
+        async def body():
+            yield b"data: 1\n\n"
+            await asyncio.sleep(0.1)
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    app.add_middleware(CoalescingMiddleware, max_body_bytes=max_body_bytes, stats=stats)
+    return app
+
+
+async def burst(app, path, count=20, headers=None, **params):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*[client.get(path, params=params, headers=headers) for _ in range(count)])
+
+
+@pytest.mark.parametrize("kind", ["sync", "async"])
+def test_identical_requests_share_one_run(kind):
+    stats, calls = CoalescingStats(), []
+    app = build_app(stats, calls)
+    responses = asyncio.run(burst(app, f"/{kind}/a"))
+
+    assert calls == [kind]
+    assert len({response.content for response in responses}) == 1
+    assert responses[0].json()["calls"] == 1
+    assert all(response.status_code == 200 for response in responses)
+    route = f"/{kind}/{{item}}"
+    assert (stats.leaders[route], stats.followers[route], stats.collapse_ratio(route)) == (1, 19, 20.0)
+
+    # Distinct URLs and credentialed requests are never merged
+    calls.clear()
+    asyncio.run(burst(app, f"/{kind}/b", count=3, headers={"Authorization": "Bearer t"}))
+    asyncio.run(burst(app, f"/{kind}/c", count=1))
+    assert calls == [kind] * 4
+
+
+def test_unshareable_responses_release_followers():
+    stats, calls = CoalescingStats(), []
+    app = build_app(stats, calls, max_body_bytes=100)
+
+    streams = asyncio.run(burst(app, "/events", count=3))
+    assert calls == ["events"] * 3 and all(r.text == "data: 1\n\n" for r in streams)
+
+    calls.clear()
+    large = asyncio.run(burst(app, "/sync/big", count=3, size=500))
+    assert calls == ["sync"] * 3 and all(len(r.content) > 500 for r in large)
+
+    # A failed leader does not fail its followers: they run the handler themselves
+    calls.clear()
+    failed = asyncio.run(burst(app, "/fails", count=3))
+    assert sorted(r.status_code for r in failed) == [500, 503, 503] and len(calls) == 3
+    assert stats.followers["/fails"] == 0
+
+
+def test_detail_burst_queries_once(client):
+    seed_properties(1)
+    app = client.app
+    route = "/api/v1/properties/slug/{slug}"
+    leaders, followers = coalescing_stats.leaders[route], coalescing_stats.followers[route]
+
+    with QueryRecorder() as recorder:
+        responses = asyncio.run(burst(app, f"{API}/slug/villa-0", count=25, headers={"Accept-Encoding": "gzip"}))
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert len({r.headers["etag"] for r in responses}) == 1
+    property_selects = [q for q in recorder.queries if "FROM properties" in q.statement]
+    assert len(property_selects) == 1
+
+    assert (coalescing_stats.leaders[route] - leaders, coalescing_stats.followers[route] - followers) == (1, 24)
+
+    scrape = registry.render()
+    assert f'request_coalescing_requests_total{{route="{route}",role="follower"}}' in scrape
+    assert f'request_coalescing_collapse_ratio{{route="{route}"}}' in scrape
@@ -0,0 +1,122 @@
+# tests/test_home_snapshot.py
+import pytest
+
+from app.config import get_settings
+from app.core.home_snapshot import home_snapshot
+from app.database import SessionLocal
+from app.models.property import Property, PropertyType
+from tests.test_properties import API
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot():
+    home_snapshot.entry = None
+    home_snapshot.sections = {}
+    yield
+    home_snapshot.entry = None
+    home_snapshot.sections = {}
+
+
+def seed(*specs):
+    db = SessionLocal()
+    try:
+        for i, (property_type, featured, offer) in enumerate(specs):
+            db.add(Property(title=f"Home {i}", slug=f"home-{i}", description="Home", price=1_000_000,
+                            property_type=property_type, area=1000, is_featured=featured,
+                            is_special_offer=offer, offer_text="10% off" if offer else None))
+        db.commit()
+    finally:
+        db.close()
+
+
+def ids(items):
+    return sorted(item["id"] for item in items)
+
+
+def test_home_sections_and_conditional_get(client, query_budget):
+    seed((PropertyType.SELL, True, False), (PropertyType.RENT, False, True), (PropertyType.RENT, True, True))
+    response = client.get(f"{API}/home")
+    assert response.status_code == 200
+    body = response.json()
+    assert ids(body["featured"]) == [1, 3]
+    assert ids(body["special_offers"]) == [2, 3]
+    assert body["special_offers"][0]["offer_text"] == "10% off"
+    assert ids(body["newest"]["RENT"]) == [2, 3] and ids(body["newest"]["SELL"]) == [1]
+    assert body["newest"]["BUY"] == []
+    assert response.headers["etag"] == f'"home-{body["version"]:x}"'
+
+    with query_budget(0):
+        again = client.get(f"{API}/home", headers={"If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_home_is_updated_incrementally(client, admin_headers):
+    seed((PropertyType.SELL, True, False))
+    first = client.get(f"{API}/home").json()
+    rebuilds = home_snapshot.rebuilds
+
+    payload = {"title": "New villa", "description": "Villa", "price": 2_000_000,
+               "property_type": "SELL", "area": 1500, "is_featured": True}
+    created = client.post(f"{API}/", json=payload, headers=admin_headers).json()
+    client.put(f"{API}/1", json={"price": 900_000}, headers=admin_headers)
+    home = client.get(f"{API}/home").json()
+    assert home_snapshot.rebuilds == rebuilds
+    assert home["version"] != first["version"]
+    assert [item["id"] for item in home["featured"]] == [created["id"], 1]
+    assert home["featured"][1]["price"] == 900_000
+
+    client.put(f"{API}/1", json={"status": "SOLD"}, headers=admin_headers)
+    home = client.get(f"{API}/home").json()
+    assert home_snapshot.rebuilds == rebuilds + 1
+    assert ids(home["featured"]) == [created["id"]]
+    assert ids(home["newest"]["SELL"]) == [created["id"]]
+
+
+def test_special_offer_filter_and_update(client, admin_headers):
+    seed((PropertyType.SELL, False, False), (PropertyType.SELL, False, True))
+    assert ids(client.get(f"{API}/", params={"is_special_offer": True}).json()) == [2]
+
+    client.put(f"{API}/1", json={"is_special_offer": True, "offer_text": "Free parking"}, headers=admin_headers)
+    assert ids(client.get(f"{API}/", params={"is_special_offer": True}).json()) == [1, 2]
+    assert client.get(f"{API}/1").json()["offer_text"] == "Free parking"
+
+
+def test_changes_from_other_workers_are_picked_up(client, monkeypatch):
+    seed((PropertyType.SELL, True, False), (PropertyType.SELL, True, False))
+    assert ids(client.get(f"{API}/home").json()["featured"]) == [1, 2]
+
+    # Written by another process: no event reaches this snapshot
+    db = SessionLocal()
+    try:
+        db.add(Property(title="Elsewhere", slug="elsewhere", description="Home", price=1_000_000,
+                        property_type=PropertyType.SELL, area=1000, is_featured=True))
+        db.delete(db.get(Property, 1))
+        db.commit()
+    finally:
+        db.close()
+    assert ids(client.get(f"{API}/home").json()["featured"]) == [1, 2]
+
+    monkeypatch.setenv("HOME_REFRESH_SECONDS", "0")
+    get_settings.cache_clear()
+    rebuilds = home_snapshot.rebuilds
+    assert ids(client.get(f"{API}/home").json()["featured"]) == [2, 3]
+    assert home_snapshot.rebuilds == rebuilds + 1
+
+    # Nothing changed since: the check is one query and no rebuild
+    client.get(f"{API}/home")
+    assert home_snapshot.rebuilds == rebuilds + 1
+
+
+def test_own_writes_are_not_rebuilt_by_the_sync(client, admin_headers, monkeypatch):
+    seed((PropertyType.SELL, True, False))
+    monkeypatch.setenv("HOME_REFRESH_SECONDS", "0")
+    get_settings.cache_clear()
+    client.get(f"{API}/home")
+    rebuilds = home_snapshot.rebuilds
+
+    payload = {"title": "New villa", "description": "Villa", "price": 2_000_000, "property_type": "SELL", "area": 1500}
+    created = [client.post(f"{API}/", json=payload, headers=admin_headers).json()["id"] for _ in range(5)]
+    for _ in range(2):
+        home = client.get(f"{API}/home").json()
+    assert ids(home["newest"]["SELL"]) == [1] + created
+    assert home_snapshot.rebuilds == rebuilds
@@ -0,0 +1,43 @@
+# tests/test_http_cache.py
+import pytest
+
+from app.core.http_cache import LogPurger, get_purger
+from app.crud.property import add_property_image
+from app.database import SessionLocal
+from tests.test_properties import API, seed_properties
+
+
+@pytest.fixture
+def purger(client):
+    get_purger.cache_clear()
+    purger = get_purger()
+    assert isinstance(purger, LogPurger)
+    yield purger
+    get_purger.cache_clear()
+
+
+def test_listing_and_detail_carry_cache_headers(client):
+    seed_properties(2)
+    listing = client.get(f"{API}/")
+    assert listing.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=600"
+    assert listing.headers["surrogate-key"].split() == ["listing", "property-2", "property-1", "city-tirupur"]
+    assert "Accept-Encoding" in listing.headers["vary"]
+
+    detail = client.get(f"{API}/slug/villa-0")
+    assert detail.headers["cache-control"] == "public, max-age=300, stale-while-revalidate=600"
+    assert detail.headers["surrogate-key"] == "property-1 city-tirupur"
+
+
+def test_writes_purge_surrogate_keys(client, admin_headers, purger):
+    payload = {"title": "Villa", "description": "Villa", "price": 2_500_000, "property_type": "SELL", "area": 1500}
+    property_id = client.post(f"{API}/", json=payload, headers=admin_headers).json()["id"]
+    client.put(f"{API}/{property_id}", json={"price": 2_400_000}, headers=admin_headers)
+    db = SessionLocal()
+    try:
+        add_property_image(db, property_id, "https://img.example.com/1.jpg", "1")
+    finally:
+        db.close()
+    client.delete(f"{API}/{property_id}", headers=admin_headers)
+
+    key = f"property-{property_id}"
+    assert list(purger.purged) == [[key, "listing"]] * 4
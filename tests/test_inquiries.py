@@ -0,0 +1,75 @@
+# tests/test_inquiries.py
+from datetime import timedelta
+
+import pytest
+
+from app.core.archival import listing_archiver
+from app.core.query_recorder import QueryRecorder
+from app.core.unread_counter import unread_inquiries
+from app.database import SessionLocal
+from app.models import ContactInquiry, Property, PropertyStatus
+
+from tests.test_properties import API, seed_properties
+
+INQUIRIES = "/api/v1/inquiries"
+
+
+@pytest.fixture
+def inquiries(client):
+    """Two properties with two unread inquiries each, plus one general inquiry"""
+    seed_properties(2)
+    db = SessionLocal()
+    try:
+        db.add_all([ContactInquiry(property_id=property_id, name="Buyer", email="b@example.com", phone="9876543210",
+                                   message="Is it available?") for property_id in (1, 1, 2, 2, None)])
+        db.commit()
+    finally:
+        db.close()
+    unread_inquiries.reset()
+    # No resync during the test: drift would not be hidden
+    unread_inquiries.resync_seconds = 3600
+    yield
+    unread_inquiries.resync_seconds = None
+    unread_inquiries.reset()
+
+
+def unread(client, headers) -> int:
+    return client.get(f"{INQUIRIES}/unread-count", headers=headers).json()["unread"]
+
+
+def test_bulk_mark_as_read_is_one_update(client, admin_headers, inquiries):
+    assert unread(client, admin_headers) == 5
+    with QueryRecorder() as recorder:
+        response = client.patch(f"{INQUIRIES}/read", json={"ids": [1, 2, 3, 99]}, headers=admin_headers)
+    assert response.json()["updated"] == 3
+    writes = [q.statement for q in recorder.queries if q.statement.lstrip().upper().startswith("UPDATE")]
+    assert len(writes) == 1
+    assert unread(client, admin_headers) == 2
+
+    # Already read rows are not counted twice
+    assert client.patch(f"{INQUIRIES}/read", json={"ids": [1, 4]}, headers=admin_headers).json()["updated"] == 1
+    assert client.patch(f"{INQUIRIES}/1/read", headers=admin_headers).status_code == 200
+    assert client.patch(f"{INQUIRIES}/99/read", headers=admin_headers).status_code == 404
+    assert unread(client, admin_headers) == 1
+
+
+def test_counter_follows_cascaded_deletes(client, admin_headers, inquiries):
+    assert unread(client, admin_headers) == 5
+    client.post(f"{API}/bulk", json={"action": "delete", "ids": [1]}, headers=admin_headers)
+    assert unread(client, admin_headers) == 3
+    client.delete(f"{API}/2", headers=admin_headers)
+    assert unread(client, admin_headers) == 1
+
+
+def test_counter_follows_archival(client, admin_headers, inquiries):
+    assert unread(client, admin_headers) == 5
+    db = SessionLocal()
+    try:
+        prop = db.get(Property, 1)
+        prop.status = PropertyStatus.SOLD
+        prop.updated_at = prop.created_at - timedelta(days=400)
+        db.commit()
+    finally:
+        db.close()
+    assert listing_archiver.run(after_days=180)["archived"] == 1
+    assert unread(client, admin_headers) == 3
@@ -0,0 +1,95 @@
+# tests/test_inquiry_buffer.py
+import pytest
+
+from app.core.inquiry_buffer import InquiryBuffer
+from app.database import SessionLocal
+from app.models import ContactInquiry
+
+from tests.test_properties import seed_properties
+
+
+def inquiry(property_id=None, name="Buyer"):
+    return {"name": name, "email": "buyer@example.com", "phone": "9876543210",
+            "message": "Is this still available?", "property_id": property_id}
+
+
+def stored():
+    db = SessionLocal()
+    try:
+        return sorted((i.name, i.property_id) for i in db.query(ContactInquiry))
+    finally:
+        db.close()
+
+
+class FlakySessions:
+    """Session factory whose first `failures` sessions cannot reach the database"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        return SessionLocal()
+
+
+@pytest.fixture
+def buffer(database_url):
+    buffer = InquiryBuffer()
+    buffer.start(SessionLocal, max_batch=2, flush_seconds=60)
+    yield buffer
+    buffer.stop(retry_seconds=0)
+
+
+def test_poison_rows_do_not_block_the_buffer(buffer):
+    seed_properties(1)
+    for row in (inquiry(1, "a"), inquiry(999, "bad"), inquiry(None, "b"), inquiry(1, "c")):
+        assert buffer.submit(row)
+
+    assert buffer.flush() == 3
+    assert (buffer.pending, buffer.rejected, buffer.failed_flushes) == (0, 1, 0)
+    assert buffer.rejected_rows[0]["property_id"] == 999
+    assert stored() == [("a", 1), ("b", None), ("c", 1)]
+
+    buffer.submit(inquiry(1, "d"))
+    assert buffer.flush() == 1 and buffer.flushed == 4
+
+
+def test_unavailable_database_keeps_rows_pending(buffer):
+    buffer.session_factory = FlakySessions(failures=1)
+    buffer.submit(inquiry(None, "a"))
+    assert buffer.flush() == 0
+    assert (buffer.pending, buffer.failed_flushes) == (1, 1)
+    assert buffer.flush() == 1 and stored() == [("a", None)]
+
+
+def test_stop_drains_pending_rows(buffer):
+    seed_properties(1)
+    for name in "abc":
+        buffer.submit(inquiry(1, name))
+    buffer.submit(inquiry(999, "bad"))
+    # The first shutdown flush fails; the retry writes everything out
+    buffer.session_factory = FlakySessions(failures=1)
+    buffer.stop(retry_seconds=0)
+    assert not buffer.enabled and buffer.pending == 0
+    assert stored() == [("a", 1), ("b", 1), ("c", 1)]
+    assert not buffer.submit(inquiry(1, "late"))
+
+
+def test_spool_replay_skips_poison_rows(database_url, tmp_path):
+    seed_properties(1)
+    spool = str(tmp_path / "inquiries.spool")
+    crashed = InquiryBuffer()
+    crashed.start(FlakySessions(failures=10), max_batch=10, flush_seconds=60, spool_path=spool)
+    crashed.submit(inquiry(1, "a"))
+    crashed.submit(inquiry(999, "bad"))
+    crashed._stopping.set()
+    crashed._wakeup.set()
+    crashed._thread.join()
+    crashed._spool.close()   # a crash: nothing flushed, the spool survives
+
+    replayed = InquiryBuffer()
+    replayed.start(SessionLocal, flush_seconds=60, spool_path=spool)
+    replayed.stop()
+    assert stored() == [("a", 1)] and replayed.rejected == 1
@@ -0,0 +1,121 @@
+# tests/test_listing_index.py
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.listing_index import listing_index
+from app.crud import property as crud_property
+from app.database import SessionLocal
+from app.models.property import Property, PropertyStatus, PropertyType
+
+API = "/api/v1/properties"
+CITIES = ["Tirupur", "Avinashi", "Palladam", None]  # None takes the column default, Tirupur
+
+
+@pytest.fixture(autouse=True)
+def enabled_index(monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("LISTING_INDEX_ENABLED", "true")
+    monkeypatch.setenv("LISTING_INDEX_REFRESH_SECONDS", "0")
+    get_settings.cache_clear()
+    monkeypatch.setattr(listing_index, "loaded", False)
+    yield
+    get_settings.cache_clear()
+
+
+def seed(count: int):
+    db = SessionLocal()
+    created = datetime(2026, 1, 1)
+    try:
+        for i in range(1, count + 1):
+            db.add(Property(
+                id=i, title=f"Home {i}", slug=f"home-{i}", description="Home",
+                price=500_000 * (i % 7 + 1), property_type=list(PropertyType)[i % 2],
+                area=1000, bedrooms=i % 4, city=CITIES[i % 4],
+                is_featured=i % 3 == 0, is_special_offer=i % 5 == 0,
+                status=PropertyStatus.SOLD if i % 11 == 0 else PropertyStatus.AVAILABLE,
+                # Ties on created_at, so the id tie-break is exercised
+                created_at=created + timedelta(hours=i // 2),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def ids(properties):
+    return [prop.id for prop in properties]
+
+
+def test_filters_match_sql(database_url):
+    seed(60)
+    combos = itertools.product(
+        [None, PropertyType.SELL],
+        [None, 1_000_000],
+        [None, 2_500_000],
+        [None, 2],
+        [None, "tiru", "PALL"],
+        [None, True, False],
+        [None, True],
+    )
+    db = SessionLocal()
+    try:
+        for property_type, min_price, max_price, min_bedrooms, city, featured, offer in combos:
+            filters = dict(property_type=property_type, min_price=min_price, max_price=max_price,
+                           min_bedrooms=min_bedrooms, city=city, is_featured=featured,
+                           is_special_offer=offer)
+            for skip, limit in ((0, 20), (5, 7)):
+                expected = crud_property.get_properties(db, skip=skip, limit=limit, **filters)
+                actual = listing_index.get_properties(db, skip=skip, limit=limit, **filters)
+                assert ids(actual) == ids(expected), filters
+    finally:
+        db.close()
+
+
+def test_endpoint_follows_changes(client, admin_headers, query_budget):
+    seed(10)
+    first = client.get(f"{API}/", params={"limit": 100}).json()
+    assert [item["id"] for item in first] == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+    with query_budget(3):
+        client.get(f"{API}/", params={"city": "tirupur"})
+
+    client.put(f"{API}/9", json={"status": "SOLD"}, headers=admin_headers)
+    client.put(f"{API}/8", json={"city": "Tirupur North", "is_featured": True}, headers=admin_headers)
+    client.delete(f"{API}/7", headers=admin_headers)
+    featured = client.get(f"{API}/", params={"city": "tirupur", "is_featured": True}).json()
+    assert [item["id"] for item in featured] == [8, 3]
+    listed = [item["id"] for item in client.get(f"{API}/", params={"limit": 100}).json()]
+    assert 9 not in listed and 7 not in listed
+
+
+def test_picks_up_rows_written_elsewhere(database_url):
+    seed(5)
+    db = SessionLocal()
+    try:
+        assert ids(listing_index.get_properties(db, limit=100)) == [5, 4, 3, 2, 1]
+        # Changes that bypassed this process's event bus (another worker)
+        db.query(Property).filter(Property.id == 4).delete()
+        db.query(Property).filter(Property.id == 2).update({"status": PropertyStatus.RENTED})
+        db.add(Property(id=6, title="New", slug="new", description="New", price=100,
+                        property_type=PropertyType.RENT, area=500, created_at=datetime(2027, 1, 1)))
+        db.commit()
+        assert ids(listing_index.get_properties(db, limit=100)) == [6, 5, 3, 1]
+    finally:
+        db.close()
+
+
+def test_rows_sold_or_repriced_elsewhere_leave_the_page(database_url, monkeypatch):
+    seed(5)
+    db = SessionLocal()
+    try:
+        assert ids(listing_index.get_properties(db, limit=3, max_price=3_000_000)) == [5, 4, 3]
+        # Another worker, seen before this index's next watermark refresh
+        monkeypatch.setattr(listing_index, "refresh", lambda db: None)
+        db.query(Property).filter(Property.id == 4).update({"status": PropertyStatus.SOLD})
+        db.query(Property).filter(Property.id == 3).update({"price": 9_000_000})
+        db.commit()
+        assert ids(listing_index.get_properties(db, limit=3, max_price=3_000_000)) == [5, 2, 1]
+        assert listing_index.search(limit=3, max_price=3_000_000) == [5, 2, 1]
+    finally:
+        db.close()
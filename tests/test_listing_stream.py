@@ -0,0 +1,127 @@
+# tests/test_listing_stream.py
+import asyncio
+import time
+
+import orjson
+import pytest
+
+from app.core.events import PropertyEvent
+from app.core.listing_stream import ListingBroker, StreamFilter, listing_broker
+from app.models.property import PropertyStatus, PropertyType
+
+API = "/api/v1/properties"
+
+
+def event(property_id, action="created", city="Tirupur", price=2_000_000, **changes):
+    data = {"id": property_id, "slug": f"home-{property_id}", "title": "Home", "price": price,
+            "property_type": PropertyType.SELL, "status": PropertyStatus.AVAILABLE, "city": city,
+            "bedrooms": 2, "is_featured": False, "is_special_offer": False, "updated_at": None}
+    return PropertyEvent(action, property_id, None if action == "deleted" else data, tuple(changes))
+
+
+def parse(frame: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+    return {"id": fields.get("id"), "event": fields["event"], "data": orjson.loads(fields["data"])}
+
+
+async def publish(broker, *events):
+    # Events are emitted from the threadpool that ran the write
+    for item in events:
+        await asyncio.to_thread(broker.handle, item)
+    await asyncio.sleep(0)
+
+
+async def receive(stream, timeout=1.0) -> dict:
+    return parse(await asyncio.wait_for(stream.__anext__(), timeout))
+
+
+async def opened(broker, stream_filter=StreamFilter(), last_event_id=None):
+    stream = broker.stream(stream_filter, last_event_id)
+    assert (await stream.__anext__()).startswith(b"retry: ")
+    return stream
+
+
+def test_filtered_fan_out_and_resume():
+    async def scenario():
+        broker = ListingBroker()
+        everything = await opened(broker)
+        tirupur = await opened(broker, StreamFilter(city="tiru", max_price=5_000_000))
+
+        await publish(broker, event(1), event(2, city="Avinashi"), event(1, "updated", status=None),
+                      event(3, price=9_000_000), event(1, "deleted"))
+        kinds = [(item["event"], item["data"]["id"]) for item in [await receive(everything) for _ in range(5)]]
+        assert kinds == [("created", 1), ("created", 2), ("status", 1), ("created", 3), ("deleted", 1)]
+
+        first = await receive(tirupur)
+        assert (first["event"], first["data"]["price"]) == ("created", 2_000_000.0)
+        assert [(await receive(tirupur))["event"] for _ in range(2)] == ["status", "deleted"]
+
+        # Resume after the first event: only the missed, matching ones
+        resumed = await opened(broker, StreamFilter(city="tiru", max_price=5_000_000), first["id"])
+        assert [(await receive(resumed))["event"] for _ in range(2)] == ["status", "deleted"]
+        # Unknown or foreign ids cannot be resumed
+        reset = await opened(broker, StreamFilter(), "0000-1")
+        assert (await receive(reset))["event"] == "reset"
+
+        for stream in (everything, tirupur, resumed, reset):
+            await stream.aclose()
+        assert broker.count == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumers_are_dropped(monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("STREAM_QUEUE_SIZE", "3")
+    get_settings.cache_clear()
+
+    async def scenario():
+        broker = ListingBroker()
+        slow = await opened(broker)
+        await publish(broker, *[event(n) for n in range(1, 6)])
+        assert broker.dropped == 1 and broker.count == 0
+        # The queued events are delivered, then the stream ends
+        frames = [parse(frame) async for frame in slow]
+        assert [item["data"]["id"] for item in frames] == [1, 2, 3]
+        resumed = await opened(broker, StreamFilter(), frames[-1]["id"])
+        assert [(await receive(resumed))["data"]["id"] for _ in range(2)] == [4, 5]
+        await resumed.aclose()
+
+    asyncio.run(scenario())
+    get_settings.cache_clear()
+
+
+def test_idle_subscribers_cost_negligible_cpu():
+    async def scenario():
+        broker = ListingBroker()
+        streams = [await opened(broker) for _ in range(5000)]
+        pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0.1)
+
+        cpu, wall = time.process_time(), time.monotonic()
+        await asyncio.sleep(1.0)
+        idle_cpu = time.process_time() - cpu
+        assert time.monotonic() - wall >= 1.0
+        assert idle_cpu < 0.05, f"{idle_cpu:.3f} s CPU for 5000 idle subscribers"
+
+        start = time.perf_counter()
+        await publish(broker, event(1))
+        frames = await asyncio.wait_for(asyncio.gather(*pending), 5)
+        assert all(parse(frame)["data"]["id"] == 1 for frame in frames)
+        assert time.perf_counter() - start < 2.0
+
+        for stream in streams:
+            await stream.aclose()
+        assert broker.count == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("change, kind", [({"status": "SOLD"}, "status"), ({"price": 1_500_000}, "updated")])
+def test_writes_are_published(client, admin_headers, change, kind):
+    created = client.post(f"{API}/", json={"title": "Villa", "description": "Villa", "price": 2_500_000,
+                                           "property_type": "SELL", "area": 1500}, headers=admin_headers)
+    assert parse(listing_broker.log[-1].frame)["event"] == "created"
+    client.put(f"{API}/{created.json()['id']}", json=change, headers=admin_headers)
+    assert parse(listing_broker.log[-1].frame)["event"] == kind
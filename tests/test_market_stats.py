@@ -0,0 +1,151 @@
+# tests/test_market_stats.py
+import pytest
+
+from app.config import get_settings
+from app.core.events import PropertyEvent
+from app.core.market_stats import MarketStats, market_stats
+from app.database import SessionLocal
+from app.models.property import Property, PropertyStatus, PropertyType
+
+API = "/api/v1/stats/market"
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(market_stats, "loaded", False)
+
+
+def seed(*rows):
+    db = SessionLocal()
+    try:
+        for i, (city, bedrooms, price, area) in enumerate(rows):
+            db.add(Property(title=f"Home {i}", slug=f"home-{i}", description="Home", price=price,
+                            property_type=PropertyType.SELL, city=city, bedrooms=bedrooms, area=area))
+        db.commit()
+    finally:
+        db.close()
+
+
+def groups(client):
+    return {(g["city"], g["bedrooms"]): g for g in client.get(API).json()["groups"]}
+
+
+def test_market_groups(client):
+    seed(("Tirupur", 2, 3_000_000, 1000), ("Tirupur", 2, 4_000_000, 1000), ("Tirupur", 2, 8_000_000, 2000),
+         ("Avinashi", 3, 5_000_000, 1250))
+    stats = groups(client)
+    assert stats[("Tirupur", 2)] == {
+        "city": "Tirupur", "property_type": "SELL", "bedrooms": 2, "count": 3,
+        "avg_price": 5_000_000.0, "median_price": 4_000_000.0, "price_per_sqft": 3750.0,
+    }
+    assert stats[("Avinashi", 3)]["price_per_sqft"] == 4000.0
+
+
+def test_changes_are_applied_without_rescans(client, admin_headers, query_budget):
+    seed(("Tirupur", 2, 3_000_000, 1000), ("Tirupur", 2, 4_000_000, 1000))
+    groups(client)
+
+    client.put("/api/v1/properties/1", json={"price": 5_000_000}, headers=admin_headers)
+    client.put("/api/v1/properties/2", json={"bedrooms": 3}, headers=admin_headers)
+    with query_budget(0):
+        stats = groups(client)
+    assert stats[("Tirupur", 2)]["median_price"] == 5_000_000.0
+    assert stats[("Tirupur", 3)]["count"] == 1
+
+    client.put("/api/v1/properties/1", json={"status": "SOLD"}, headers=admin_headers)
+    client.delete("/api/v1/properties/2", headers=admin_headers)
+    assert client.get(API).json() == {"version": market_stats.version, "total": 0, "groups": []}
+
+
+def test_consistency_checker_reports_and_repairs_drift(client, admin_headers):
+    seed(("Tirupur", 2, 3_000_000, 1000))
+    groups(client)
+    assert client.get(f"{API}/check", headers=admin_headers).json()["consistent"]
+
+    # A change made behind the application's back
+    db = SessionLocal()
+    db.query(Property).filter(Property.id == 1).update({"bedrooms": 4})
+    db.commit()
+    db.close()
+
+    report = client.get(f"{API}/check", headers=admin_headers).json()
+    assert not report["consistent"]
+    assert {tuple(d["group"]) for d in report["drift"]} == {("Tirupur", "SELL", 2), ("Tirupur", "SELL", 4)}
+
+    assert client.get(f"{API}/check", params={"repair": True}, headers=admin_headers).json()["repaired"]
+    assert client.get(f"{API}/check", headers=admin_headers).json()["consistent"]
+    assert list(groups(client)) == [("Tirupur", 4)]
+
+
+def racing_scan(stats: MarketStats, event: PropertyEvent) -> list:
+    """Make the next scan deliver `event` halfway through, as a concurrent write would; returns the scan calls"""
+    compute, calls = stats._compute, []
+
+    def racing_compute(db):
+        result = compute(db)
+        calls.append(1)
+        if len(calls) == 1:
+            stats.handle(event)
+        return result
+
+    stats._compute = racing_compute
+    return calls
+
+
+def repriced(price):
+    data = {"status": PropertyStatus.AVAILABLE, "property_type": PropertyType.SELL, "city": "Tirupur",
+            "bedrooms": 2, "price": price, "area": 1000}
+    return PropertyEvent("updated", 1, data=data, changed=("price",))
+
+
+def test_events_during_a_load_are_applied_once(database_url):
+    seed(("Tirupur", 2, 3_000_000, 1000))
+    stats = MarketStats()
+    calls = racing_scan(stats, repriced(6_000_000))
+    db = SessionLocal()
+    try:
+        stats.load(db)
+    finally:
+        db.close()
+    assert len(calls) == 1 and stats.loaded
+    assert stats.groups[("Tirupur", "SELL", 2)].median == 6_000_000
+
+
+def test_events_during_a_repair_are_not_lost(database_url):
+    seed(("Tirupur", 2, 3_000_000, 1000))
+    stats = MarketStats()
+    db = SessionLocal()
+    try:
+        stats.load(db)
+        racing_scan(stats, repriced(6_000_000))
+        report = stats.check(db, repair=True)
+    finally:
+        db.close()
+    assert report["consistent"] and not report["repaired"]
+    assert stats.groups[("Tirupur", "SELL", 2)].median == 6_000_000
+
+
+def test_changes_from_other_workers_are_picked_up(client, monkeypatch):
+    seed(("Tirupur", 2, 3_000_000, 1000), ("Tirupur", 2, 4_000_000, 1000), ("Avinashi", 3, 5_000_000, 1250))
+    groups(client)
+
+    # Written by another process: no event reaches this one
+    db = SessionLocal()
+    try:
+        db.query(Property).filter(Property.id == 1).update({"price": 3_500_000})
+        db.delete(db.get(Property, 3))
+        db.add(Property(title="Elsewhere", slug="elsewhere", description="Home", price=2_000_000,
+                        property_type=PropertyType.SELL, city="Palladam", bedrooms=1, area=500))
+        db.commit()
+    finally:
+        db.close()
+    assert ("Palladam", 1) not in groups(client)
+
+    monkeypatch.setenv("MARKET_STATS_REFRESH_SECONDS", "0")
+    get_settings.cache_clear()
+    stats = groups(client)
+    assert set(stats) == {("Tirupur", 2), ("Palladam", 1)}
+    assert stats[("Tirupur", 2)]["avg_price"] == 3_750_000.0
+    version = market_stats.version
+    groups(client)
+    assert market_stats.version == version
@@ -0,0 +1,86 @@
+# tests/test_metrics.py
+import re
+
+from app.config import get_settings
+from app.core.metrics import REQUESTS, registry
+from app.database import get_engine
+
+from tests.test_properties import API, seed_properties
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? -?[0-9.e+-]+$')
+
+
+def scrape(client) -> str:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def families(text: str) -> dict:
+    """Metric family name -> TYPE, checking every line on the way"""
+    types, declared = {}, None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            declared = line.split()[2]
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert name == declared and name not in types, f"duplicate or undeclared family {name}"
+            types[name] = kind
+        else:
+            assert SAMPLE.match(line), f"malformed sample: {line!r}"
+            assert line.split("{")[0].split()[0].startswith(declared), f"sample outside its family: {line!r}"
+    return types
+
+
+def test_exposition_format(client):
+    seed_properties(1)
+    client.get(f"{API}/")
+    text = scrape(client)
+    assert text.endswith("\n")
+    types = families(text)
+    assert types["http_requests_total"] == "counter"
+    assert types["http_request_duration_seconds"] == "histogram"
+    assert types["inquiry_buffer_pending"] == "gauge"
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/properties/",le="+Inf"}' in text
+
+
+def test_requests_are_labelled_by_route_template(client):
+    seed_properties(2)
+    detail = ("GET", "/api/v1/properties/slug/{slug}", 200)
+    before = REQUESTS._values.get(detail, 0)
+    client.get(f"{API}/slug/villa-0")
+    client.get(f"{API}/slug/villa-1")
+    client.get("/no/such/page")
+    text = scrape(client)
+    assert REQUESTS._values[detail] - before == 2
+    assert 'http_requests_total{method="GET",route="/api/v1/properties/slug/{slug}",status="200"}' in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert "villa-0" not in text and "/no/such/page" not in text
+
+
+def test_failing_collector_does_not_break_the_scrape(client):
+    def broken_component():
+        raise ImportError("cannot import name 'stats'")
+
+    registry.add_collector(broken_component)
+    try:
+        scrape(client)
+        text = scrape(client)   # the second scrape reports both failures
+    finally:
+        registry.collectors.remove(broken_component)
+    families(text)
+    assert 'metrics_collector_errors_total{collector="broken_component"} 2' in text
+    assert "rate_limit_backend_errors_total" in text and "request_coalescing_requests_total" in text
+
+
+def test_ready_reports_an_unreachable_database(client, tmp_path, monkeypatch):
+    assert client.get("/ready").json()["status"] == "ready"
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/missing/dir/app.db")
+    get_settings.cache_clear()
+    get_engine.cache_clear()
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "database": "database unavailable: OperationalError"}
+    get_engine().dispose()
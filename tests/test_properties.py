@@ -0,0 +1,118 @@
+# tests/test_properties.py
+import pytest
+
+from app.core.query_recorder import QueryBudgetExceeded, QueryRecorder
+from app.database import SessionLocal
+from app.models.property import Property, PropertyImage, PropertyType
+
+API = "/api/v1/properties"
+
+
+def seed_properties(count: int, images: int = 2):
+    db = SessionLocal()
+    try:
+        for i in range(count):
+            prop = Property(
+                title=f"Villa {i}",
+                slug=f"villa-{i}",
+                description="Spacious villa",
+                price=1_000_000 + i,
+                property_type=PropertyType.SELL,
+                area=1200,
+            )
+            prop.images = [
+                PropertyImage(url=f"https://img.example.com/{i}/{n}.jpg", public_id=f"{i}-{n}", order=n)
+                for n in range(images)
+            ]
+            db.add(prop)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_list_properties_query_budget(client, query_budget):
+    seed_properties(10)
+    with query_budget(2):
+        response = client.get(f"{API}/")
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert all(item["thumbnail"] for item in response.json())
+
+
+def test_property_detail_query_budget(client, query_budget):
+    seed_properties(1, images=3)
+    with query_budget(2):
+        response = client.get(f"{API}/slug/villa-0")
+    assert response.status_code == 200
+    assert len(response.json()["images"]) == 3
+
+
+def test_slug_collisions_use_one_probe(client, admin_headers, query_budget):
+    seed_properties(5)
+    payload = {"title": "Villa", "description": "Another villa", "price": 2_500_000,
+               "property_type": "SELL", "area": 1500}
+    client.post(f"{API}/", json=payload, headers=admin_headers)
+    with query_budget(6):
+        response = client.post(f"{API}/", json=payload, headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json()["slug"] == "villa-5"
+
+
+def test_repeated_statements_are_reported_with_call_site(database_url, query_budget):
+    seed_properties(3)
+    db = SessionLocal()
+    try:
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            with query_budget(10):
+                for prop in db.query(Property).all():
+                    prop.images
+    finally:
+        db.close()
+    assert "repeated 3x" in str(excinfo.value)
+    assert "property_images" in str(excinfo.value)
+
+
+def test_query_debug_headers(database_url, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.main import create_app
+
+    monkeypatch.setenv("QUERY_DEBUG", "true")
+    get_settings.cache_clear()
+    seed_properties(2)
+    with TestClient(create_app()) as client, QueryRecorder() as recorder:
+        response = client.get(f"{API}/")
+    assert response.headers["x-query-count"] == str(recorder.count) == "2"
+    assert float(response.headers["x-db-time"]) >= 0
+
+
+def test_listing_reads_only_listed_columns(client):
+    seed_properties(3)
+    with QueryRecorder() as recorder:
+        response = client.get(f"{API}/")
+    assert set(response.json()[0]) >= {"title", "city", "thumbnail", "created_at"}
+    select_properties = recorder.queries[0].statement
+    assert "properties.title" in select_properties
+    assert "properties.description" not in select_properties
+    assert "property_images.caption" not in recorder.queries[1].statement
+
+
+def test_sparse_fieldsets(client):
+    seed_properties(3)
+    with QueryRecorder() as recorder:
+        response = client.get(f"{API}/", params={"fields": "price,thumbnail,title"})
+    assert recorder.count == 2
+    assert list(response.json()[0]) == ["id", "title", "price", "thumbnail"]
+    assert response.json()[0]["thumbnail"].endswith("/0.jpg")
+    assert "properties.slug" not in recorder.queries[0].statement
+    assert response.headers["surrogate-key"].split()[-1] == "city-tirupur"
+
+    # No thumbnail, no images query
+    with QueryRecorder() as recorder:
+        response = client.get(f"{API}/", params={"fields": "slug"})
+    assert recorder.count == 1
+    assert response.json()[0] == {"id": 3, "slug": "villa-2"}
+
+    response = client.get(f"{API}/", params={"fields": "title,description"})
+    assert response.status_code == 400
+    assert "description" in response.json()["detail"]
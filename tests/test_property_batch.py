@@ -0,0 +1,50 @@
+# tests/test_property_batch.py
+from app.database import SessionLocal
+from app.models.property import PropertyImage
+
+from tests.test_properties import seed_properties
+
+API = "/api/v1/properties/batch"
+
+
+def test_batch_by_ids_keeps_order_and_reports_missing(client, query_budget):
+    seed_properties(4, images=3)
+    with query_budget(2):
+        response = client.get(API, params={"ids": "3,1,99"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [prop["id"] for prop in body["properties"]] == [3, 1]
+    assert body["missing"] == [99]
+    assert [image["order"] for image in body["properties"][0]["images"]] == [0, 1, 2]
+    assert response.headers["surrogate-key"].split() == ["property-3", "city-tirupur", "property-1"]
+
+    repeated = client.get(f"{API}?ids=2&ids=4,2")
+    assert [prop["id"] for prop in repeated.json()["properties"]] == [2, 4]
+    reversed_order = client.get(f"{API}?ids=4&ids=2")
+    assert [prop["id"] for prop in reversed_order.json()["properties"]] == [4, 2]
+
+
+def test_batch_by_slugs_orders_images(client):
+    seed_properties(2, images=2)
+    db = SessionLocal()
+    try:
+        # Added last but ordered first
+        db.add(PropertyImage(property_id=1, url="https://img.example.com/cover.jpg", order=-1))
+        db.commit()
+    finally:
+        db.close()
+    body = client.get(API, params={"slugs": "villa-1,villa-0,gone"}).json()
+    assert [prop["slug"] for prop in body["properties"]] == ["villa-1", "villa-0"]
+    assert body["missing"] == ["gone"]
+    assert body["properties"][1]["images"][0]["url"].endswith("cover.jpg")
+
+
+def test_batch_validation(client, monkeypatch):
+    from app.config import get_settings
+
+    assert client.get(API).status_code == 400
+    assert client.get(API, params={"ids": "1", "slugs": "a"}).status_code == 400
+    assert client.get(API, params={"ids": "1,x"}).status_code == 400
+    monkeypatch.setenv("PROPERTY_BATCH_MAX_SIZE", "2")
+    get_settings.cache_clear()
+    assert client.get(API, params={"ids": "1,2,3"}).status_code == 400
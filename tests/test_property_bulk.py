@@ -0,0 +1,114 @@
+# tests/test_property_bulk.py
+import pytest
+
+from app.core.events import property_events
+from app.core.query_recorder import QueryRecorder
+from app.database import SessionLocal
+from app.models import ContactInquiry, Property, PropertyImage
+
+from tests.test_properties import API, seed_properties
+
+
+@pytest.fixture
+def events():
+    received = []
+    property_events.subscribe(received.append)
+    yield received
+    property_events.unsubscribe(received.append)
+
+
+def statements(recorder):
+    return [q.statement for q in recorder.queries]
+
+
+def test_bulk_status_by_ids(client, admin_headers, events):
+    seed_properties(4)
+    with QueryRecorder() as recorder:
+        response = client.post(f"{API}/bulk", json={"action": "status", "status": "SOLD", "ids": [1, 3, 9]},
+                               headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {"action": "status", "affected": 2, "ids": [1, 3]}
+    writes = [s for s in statements(recorder) if s.lstrip().upper().startswith("UPDATE")]
+    assert len(writes) == 1 and "RETURNING" in writes[0]
+    assert sorted((e.action, e.property_id, e.changed) for e in events) == [
+        ("updated", 1, ("status",)), ("updated", 3, ("status",)),
+    ]
+    assert client.get(f"{API}/1").json()["version"] == 2
+
+    # Rows already holding the value are not touched again
+    again = client.post(f"{API}/bulk", json={"action": "status", "status": "SOLD", "ids": [1, 2]},
+                        headers=admin_headers)
+    assert again.json()["ids"] == [2]
+    assert client.get(f"{API}/1").json()["version"] == 2
+
+
+def test_bulk_featured_by_filter(client, admin_headers):
+    seed_properties(3)
+    client.post(f"{API}/bulk", json={"action": "status", "status": "RENTED", "ids": [2]}, headers=admin_headers)
+    response = client.post(f"{API}/bulk", json={"action": "featured", "is_featured": True,
+                                                "filter": {"status": "AVAILABLE", "min_price": 1_000_000}},
+                           headers=admin_headers)
+    assert response.json() == {"action": "featured", "affected": 2, "ids": [1, 3]}
+    assert [p["id"] for p in client.get(f"{API}/", params={"is_featured": True}).json()] == [3, 1]
+
+
+def test_bulk_delete_cascades_without_loading_children(client, admin_headers, events):
+    seed_properties(3, images=3)
+    db = SessionLocal()
+    try:
+        db.add_all([ContactInquiry(property_id=n, name="Buyer", email="b@example.com", phone="1", message="Hi")
+                    for n in (1, 2, 3)])
+        db.commit()
+    finally:
+        db.close()
+
+    with QueryRecorder() as recorder:
+        response = client.post(f"{API}/bulk", json={"action": "delete", "ids": [1, 2]}, headers=admin_headers)
+    assert response.json()["ids"] == [1, 2]
+    assert not [s for s in statements(recorder) if "property_images" in s or "contact_inquiries" in s]
+    assert sorted((e.action, e.property_id) for e in events) == [("deleted", 1), ("deleted", 2)]
+
+    db = SessionLocal()
+    try:
+        assert [p.id for p in db.query(Property)] == [3]
+        assert {i.property_id for i in db.query(PropertyImage)} == {3}
+        assert [i.property_id for i in db.query(ContactInquiry)] == [3]
+    finally:
+        db.close()
+
+    # The single delete is set-based too
+    assert client.delete(f"{API}/3", headers=admin_headers).status_code == 204
+    assert client.delete(f"{API}/3", headers=admin_headers).status_code == 404
+
+
+@pytest.mark.parametrize("body", [
+    {"action": "delete"},
+    {"action": "delete", "ids": [1], "filter": {"city": "Tirupur"}},
+    {"action": "delete", "filter": {}},
+    {"action": "delete", "ids": []},
+    {"action": "status", "ids": [1]},
+    {"action": "featured", "ids": [1]},
+    {"action": "archive", "ids": [1]},
+])
+def test_bulk_validation(client, admin_headers, body):
+    seed_properties(1)
+    assert client.post(f"{API}/bulk", json=body, headers=admin_headers).status_code == 422
+    assert client.get(f"{API}/1").status_code == 200
+
+
+def test_bulk_requires_admin(client):
+    assert client.post(f"{API}/bulk", json={"action": "delete", "ids": [1]}).status_code == 401
+
+
+def test_bulk_update_reaches_null_columns(client, admin_headers):
+    seed_properties(2)
+    db = SessionLocal()
+    try:
+        # Legacy rows written before the column had a default
+        db.query(Property).filter(Property.id == 1).update({"is_featured": None})
+        db.commit()
+    finally:
+        db.close()
+    response = client.post(f"{API}/bulk", json={"action": "featured", "is_featured": False, "ids": [1, 2]},
+                           headers=admin_headers)
+    assert response.json()["ids"] == [1]
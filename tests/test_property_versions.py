@@ -0,0 +1,41 @@
+# tests/test_property_versions.py
+from app.core.query_recorder import QueryRecorder
+
+from tests.test_properties import API, seed_properties
+
+
+def test_patch_is_one_conditional_update(client, admin_headers):
+    seed_properties(1)
+    etag = client.get(f"{API}/1").headers["etag"]
+    assert etag == '"property-1-1"'
+
+    with QueryRecorder() as recorder:
+        response = client.patch(f"{API}/1", json={"price": 1_250_000, "status": "SOLD"},
+                                headers={**admin_headers, "If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"property-1-2"'
+    assert (response.json()["version"], response.json()["price"], response.json()["status"]) == (2, 1_250_000, "SOLD")
+    writes = [q.statement for q in recorder.queries if not q.statement.lstrip().upper().startswith("SELECT")]
+    assert len(writes) == 1
+    assert "WHERE properties.id = ? AND properties.version = ?" in writes[0] and "RETURNING" in writes[0]
+
+    detail = client.get(f"{API}/1")
+    assert (detail.json()["price"], detail.headers["etag"]) == (1_250_000, '"property-1-2"')
+
+
+def test_stale_versions_conflict(client, admin_headers):
+    seed_properties(1)
+    # Another admin saved in between, through PUT
+    assert client.put(f"{API}/1", json={"title": "Villa renamed"}, headers=admin_headers).headers["etag"] == '"property-1-2"'
+
+    stale = client.patch(f"{API}/1", json={"price": 1}, headers={**admin_headers, "If-Match": '"property-1-1"'})
+    assert stale.status_code == 409
+    assert stale.headers["etag"] == '"property-1-2"'
+    assert client.patch(f"{API}/1", json={"price": 1, "version": 1}, headers=admin_headers).status_code == 409
+    assert client.patch(f"{API}/1", json={"price": 1}, headers={**admin_headers, "If-Match": '"property-7-2"'}).status_code == 409
+    assert client.get(f"{API}/1").json()["price"] == 1_000_000
+
+    assert client.patch(f"{API}/1", json={"price": 1}, headers=admin_headers).status_code == 428
+    assert client.patch(f"{API}/1", json={"price": 2, "version": 2}, headers=admin_headers).json()["version"] == 3
+    assert client.patch(f"{API}/1", json={"price": 3}, headers={**admin_headers, "If-Match": "*"}).json()["version"] == 4
+    assert client.patch(f"{API}/9", json={"price": 3, "version": 1}, headers=admin_headers).status_code == 404
@@ -0,0 +1,83 @@
+# tests/test_rate_limit.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import (
+    BucketBackend, InMemoryBucketBackend, RateLimitMiddleware, RateLimitRule, RateLimitStats,
+)
+
+RULE = RateLimitRule(name="login", method="POST", path="/login", ip_rate=0.5, ip_burst=2,
+                     route_rate=0.5, route_burst=3)
+
+
+class RecordingBackend(BucketBackend):
+    """In-memory buckets that remember which keys were consumed, in order"""
+
+    def __init__(self, fail: bool = False):
+        self.inner = InMemoryBucketBackend()
+        self.keys = []
+        self.fail = fail
+
+    def consume(self, key, rate, burst, now):
+        self.keys.append(key)
+        if self.fail:
+            raise ConnectionError("store unavailable")
+        return self.inner.consume(key, rate, burst, now)
+
+
+def limited_client(backend: BucketBackend, stats: RateLimitStats) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/login")
+    def login_form():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, rules=[RULE], backend=backend, trust_forwarded=True, stats=stats)
+    return TestClient(app)
+
+
+def post(client, ip):
+    return client.post("/login", headers={"X-Forwarded-For": f"{ip}, 10.0.0.1"})
+
+
+def test_ip_bucket_rejects_with_retry_after():
+    stats = RateLimitStats()
+    client = limited_client(InMemoryBucketBackend(), stats)
+    assert [post(client, "1.1.1.1").status_code for _ in range(2)] == [200, 200]
+
+    rejected = post(client, "1.1.1.1")
+    assert rejected.status_code == 429
+    assert rejected.json() == {"detail": "Too many requests"}
+    # One token refills in 2 s at 0.5 tokens/s
+    assert rejected.headers["retry-after"] == "2"
+    assert stats.rejected == {("login", "ip"): 1}
+
+    # Other methods and paths are not limited
+    assert all(client.get("/login").status_code == 200 for _ in range(5))
+
+
+def test_route_bucket_caps_many_ips():
+    stats = RateLimitStats()
+    client = limited_client(InMemoryBucketBackend(), stats)
+    assert [post(client, f"2.2.2.{n}").status_code for n in range(4)] == [200, 200, 200, 429]
+    assert stats.rejected == {("login", "route"): 1}
+
+
+def test_ip_bucket_is_checked_before_the_route_bucket():
+    backend = RecordingBackend()
+    client = limited_client(backend, RateLimitStats())
+    for _ in range(3):
+        post(client, "3.3.3.3")
+    # The third request fails on its IP bucket and never spends a route token
+    assert backend.keys == ["login:ip:3.3.3.3", "login:route"] * 2 + ["login:ip:3.3.3.3"]
+
+
+def test_backend_failures_allow_requests():
+    stats = RateLimitStats()
+    client = limited_client(RecordingBackend(fail=True), stats)
+    assert all(post(client, "4.4.4.4").status_code == 200 for _ in range(5))
+    assert stats.backend_errors == 5
@@ -0,0 +1,94 @@
+# tests/test_read_replicas.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core import replicas
+from app.core.replicas import STICKY_COOKIE
+from app.database import Base
+from app.models.property import Property, PropertyType
+
+API = "/api/v1/properties"
+
+
+def add_property(url: str, title: str):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Property(id=1, title=title, slug="villa", description="Villa", price=1_000_000,
+                        property_type=PropertyType.SELL, area=1200))
+        db.commit()
+    engine.dispose()
+
+
+@pytest.fixture
+def replica_client(tmp_path, database_url, monkeypatch):
+    """Primary and replica are separate SQLite files holding different titles for property 1"""
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.database import get_replica_router
+    from app.main import create_app
+
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    add_property(database_url, "Primary villa")
+    add_property(replica_url, "Replica villa")
+    monkeypatch.setenv("READ_REPLICA_URLS", f'["{replica_url}"]')
+    get_settings.cache_clear()
+    get_replica_router.cache_clear()
+    with TestClient(create_app()) as client:
+        yield client
+    get_replica_router.cache_clear()
+
+
+def login(client) -> dict:
+    client.post("/api/v1/auth/register", json={"email": "admin@example.com", "password": "secret", "name": "Admin"})
+    token = client.post("/api/v1/auth/login", data={"username": "admin@example.com", "password": "secret"})
+    return {"Authorization": f"Bearer {token.json()['access_token']}"}
+
+
+def test_reads_go_to_replica(replica_client):
+    assert replica_client.get(f"{API}/1").json()["title"] == "Replica villa"
+    assert replica_client.get(f"{API}/").json()[0]["title"] == "Replica villa"
+
+
+def test_reads_follow_writes_to_primary(replica_client):
+    headers = login(replica_client)
+    response = replica_client.put(f"{API}/1", json={"price": 1_100_000}, headers=headers)
+    assert response.status_code == 200
+    assert STICKY_COOKIE in response.cookies
+
+    pinned = replica_client.get(f"{API}/1")
+    assert pinned.json()["price"] == 1_100_000
+    assert pinned.headers["cache-control"] == "private, no-store"
+    replica_client.cookies.clear()
+    assert replica_client.get(f"{API}/1").json()["title"] == "Replica villa"
+
+
+def test_anonymous_writes_are_not_sticky(replica_client):
+    response = replica_client.post("/api/v1/inquiries/", json={
+        "name": "Buyer", "email": "buyer@example.com", "phone": "9876543210", "message": "Please call me back"})
+    assert response.status_code < 400
+    assert STICKY_COOKIE not in response.cookies
+
+
+def test_unreachable_replica_falls_back_to_primary(tmp_path, database_url, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.database import get_replica_router
+    from app.main import create_app
+
+    add_property(database_url, "Primary villa")
+    monkeypatch.setenv("READ_REPLICA_URLS", f'["sqlite:///{tmp_path}/missing/replica.db"]')
+    get_settings.cache_clear()
+    get_replica_router.cache_clear()
+    with TestClient(create_app()) as client:
+        assert client.get(f"{API}/1").json()["title"] == "Primary villa"
+    router = get_replica_router()
+    assert router.replicas[0].failures == 1
+    assert router.fallbacks == 1
+    get_replica_router.cache_clear()
+
+
+def test_lagging_replica_falls_back_to_primary(replica_client, monkeypatch):
+    monkeypatch.setattr(replicas, "replica_lag", lambda conn: 60.0)
+    assert replica_client.get(f"{API}/1").json()["title"] == "Primary villa"
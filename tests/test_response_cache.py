@@ -0,0 +1,90 @@
+# tests/test_response_cache.py
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.config import Settings, get_settings
+from app.core.events import PropertyEvent, property_events
+from app.core.query_recorder import QueryRecorder
+from app.core.response_cache import ResponseCache, cache_key, response_cache
+
+from tests.test_properties import API, seed_properties
+
+
+@pytest.fixture
+def cached_client(client, monkeypatch):
+    monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "true")
+    get_settings.cache_clear()
+    response_cache.clear()
+    yield client
+    response_cache.clear()
+
+
+def property_queries(recorder) -> int:
+    return sum("FROM properties" in q.statement for q in recorder.queries)
+
+
+def test_hits_misses_and_expiry(monkeypatch):
+    cache = ResponseCache(max_entries=10, ttl_seconds=30)
+    assert cache.get("/a?") is None
+    cache.set("/a?", b"[]")
+    assert cache.get("/a?").body == b"[]"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.core.response_cache.time.monotonic", lambda: now + 31)
+    assert cache.get("/a?") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def key(query_string: bytes) -> str:
+    return cache_key(Request({"type": "http", "path": "/api/v1/properties/", "query_string": query_string,
+                              "headers": []}))
+
+
+def test_cache_key_normalizes_order_but_not_escaping():
+    assert key(b"limit=2&city=Tirupur") == key(b"city=Tirupur&limit=2")
+    assert key(b"tag=b&tag=a") != key(b"tag=a&tag=b")
+    # A city literally named "a&search=b" is not a city plus a search
+    assert key(b"city=a%26search%3Db") != key(b"city=a&search=b")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, ttl_seconds=30)
+    cache.set("/a?", b"a")
+    cache.set("/b?", b"b")
+    cache.get("/a?")
+    cache.set("/c?", b"c")
+    assert cache.get("/b?") is None
+    assert [cache.get(key).body for key in ("/a?", "/c?")] == [b"a", b"c"]
+
+
+def test_property_events_clear_the_cache():
+    response_cache.set("/api/v1/properties/?", b"[]")
+    property_events.emit(PropertyEvent("updated", 1, changed=("price",)))
+    assert response_cache.get("/api/v1/properties/?") is None
+
+
+def test_repeated_reads_are_served_from_the_cache(cached_client, admin_headers):
+    seed_properties(3)
+    first = cached_client.get(f"{API}/", params={"limit": 2, "skip": 0})
+    with QueryRecorder() as recorder:
+        # Same parameters in another order share the entry
+        again = cached_client.get(f"{API}/", params={"skip": 0, "limit": 2})
+    assert property_queries(recorder) == 0
+    assert again.content == first.content
+    assert cached_client.get(f"{API}/", params={"limit": 3}).json() != first.json()
+
+    # A write clears the cache; the next read sees it
+    version = cached_client.get(f"{API}/3").json()["version"]
+    cached_client.patch(f"{API}/3", json={"title": "Renamed villa", "version": version}, headers=admin_headers)
+    cached_client.cookies.clear()   # drop the read-your-writes cookie, which bypasses the cache
+    with QueryRecorder() as recorder:
+        titles = [item["title"] for item in cached_client.get(f"{API}/", params={"limit": 2}).json()]
+    assert property_queries(recorder) > 0 and "Renamed villa" in titles
+
+
+def test_disabled_by_default():
+    # Other workers' writes do not clear this worker's cache, so it is opt-in
+    assert Settings.model_fields["RESPONSE_CACHE_ENABLED"].default is False
@@ -0,0 +1,137 @@
+# tests/test_saved_searches.py
+import random
+
+import pytest
+
+from app.core.events import PropertyEvent
+from app.core.search_alerts import INF, IntervalTree, SearchAlerts, search_alerts
+from app.database import SessionLocal
+from app.models.property import PropertyStatus, PropertyType
+
+API = "/api/v1"
+
+
+@pytest.fixture(autouse=True)
+def fresh_alerts(monkeypatch):
+    monkeypatch.setattr(search_alerts, "signature", None)
+
+
+def listing(**overrides):
+    payload = {"title": "Garden villa", "description": "Quiet street", "price": 4_000_000,
+               "property_type": "SELL", "area": 1500, "bedrooms": 3, "city": "Tirupur"}
+    payload.update(overrides)
+    return payload
+
+
+def notified(client, headers, **params):
+    search_alerts.flush()   # wait for the background matcher
+    response = client.get(f"{API}/saved-searches/notifications", params=params, headers=headers)
+    assert response.status_code == 200
+    return [(item["saved_search_id"], item["property"]["id"]) for item in response.json()]
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(43)
+    intervals = []
+    for n in range(300):
+        low = rng.choice([-INF, rng.randint(0, 100)])
+        high = rng.choice([INF, low + rng.randint(0, 30) if low != -INF else rng.randint(0, 100)])
+        intervals.append((low, high, n))
+    tree = IntervalTree(intervals)
+    for point in [rng.uniform(-10, 140) for _ in range(200)] + [0, 50, 100]:
+        expected = {n for low, high, n in intervals if low <= point <= high}
+        assert set(tree.stab(point)) == expected
+
+
+def test_new_listings_queue_notifications(client, admin_headers):
+    def save(**filters):
+        response = client.post(f"{API}/saved-searches/", json=filters, headers=admin_headers)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    budget = save(name="Budget", max_price=5_000_000, city="tiru")
+    family = save(property_type="SELL", min_bedrooms=3, search="garden")
+    rentals = save(property_type="RENT")
+    save(min_price=9_000_000)
+    # Searches in unrelated buckets are never looked at
+    for n in range(16):
+        save(property_type="BUY", city=f"elsewhere {n}")
+
+    villa = client.post(f"{API}/properties/", json=listing(), headers=admin_headers).json()["id"]
+    rental = client.post(f"{API}/properties/", json=listing(property_type="RENT", price=15_000, bedrooms=1),
+                         headers=admin_headers).json()["id"]
+    search_alerts.flush()
+    # Only the candidates from matching buckets and price ranges were checked
+    assert search_alerts.index.evaluated == 4
+    assert sorted(notified(client, admin_headers)) == sorted(
+        [(budget, villa), (family, villa), (budget, rental), (rentals, rental)]
+    )
+
+    # An edit that still matches is not announced again; one that newly matches is
+    client.put(f"{API}/properties/{villa}", json={"price": 12_000_000}, headers=admin_headers)
+    assert len(notified(client, admin_headers)) == 5
+
+    read = client.patch(f"{API}/saved-searches/notifications/read", json={}, headers=admin_headers)
+    assert read.json()["updated"] == 5
+    assert notified(client, admin_headers, is_read=False) == []
+
+    assert client.delete(f"{API}/saved-searches/{budget}", headers=admin_headers).status_code == 204
+    assert client.delete(f"{API}/saved-searches/{budget}", headers=admin_headers).status_code == 404
+    client.post(f"{API}/properties/", json=listing(title="Another garden home", price=3_000_000), headers=admin_headers)
+    assert len(notified(client, admin_headers, is_read=False)) == 1
+
+
+def test_saved_searches_are_private_and_capped(client, admin_headers, monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("SAVED_SEARCHES_PER_USER", "1")
+    get_settings.cache_clear()
+    assert client.post(f"{API}/saved-searches/", json={"city": "Avinashi"}, headers=admin_headers).status_code == 201
+    assert client.post(f"{API}/saved-searches/", json={"city": "Palladam"}, headers=admin_headers).status_code == 400
+    assert client.post(f"{API}/saved-searches/", json={"min_price": 10, "max_price": 5},
+                       headers=admin_headers).status_code == 422
+    assert client.get(f"{API}/saved-searches/").status_code == 401
+    assert [s["city"] for s in client.get(f"{API}/saved-searches/", headers=admin_headers).json()] == ["Avinashi"]
+
+
+def test_matching_failures_never_reach_the_write(client, admin_headers, monkeypatch):
+    client.post(f"{API}/saved-searches/", json={"name": "Any"}, headers=admin_headers)
+
+    def broken(db, notifications):
+        raise RuntimeError("notifications table locked")
+
+    monkeypatch.setattr("app.crud.saved_search.queue_notifications", broken)
+    failed = search_alerts.failed_batches
+    response = client.post(f"{API}/properties/", json=listing(), headers=admin_headers)
+    assert response.status_code == 201
+    search_alerts.flush()
+    assert search_alerts.failed_batches == failed + 1
+
+    monkeypatch.undo()
+    client.post(f"{API}/properties/", json=listing(title="Second villa"), headers=admin_headers)
+    assert len(notified(client, admin_headers)) == 1
+
+
+def test_bulk_writes_are_matched_in_one_batch(database_url):
+    sessions = []
+
+    def session_factory():
+        sessions.append(1)
+        return SessionLocal()
+
+    def available(price):
+        return {"status": PropertyStatus.AVAILABLE, "property_type": PropertyType.SELL, "city": "Tirupur",
+                "price": price, "bedrooms": 2, "title": "Villa"}
+
+    alerts = SearchAlerts(session_factory)
+    alerts.start()
+    try:
+        with alerts._flush_lock:   # the worker is busy with an earlier batch
+            for property_id in range(1, 51):
+                alerts.handle(PropertyEvent("updated", property_id, data=available(1_000_000 + property_id)))
+            alerts.handle(PropertyEvent("updated", 7, data={**available(1), "status": PropertyStatus.SOLD}))
+            assert alerts.pending == 49
+        alerts.flush()
+    finally:
+        alerts.stop()
+    assert len(sessions) == 1 and alerts.matched == 49 and alerts.pending == 0
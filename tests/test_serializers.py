@@ -0,0 +1,58 @@
+# tests/test_serializers.py
+from app.database import SessionLocal
+from app.models import Property
+from app.schemas.property import HomeListing, PropertyListResponse, PropertyResponse
+from app.utils.helpers import map_urls
+from app.utils.serializers import LIST_FIELDS
+
+from tests.test_properties import API, seed_properties
+
+
+def set_location(property_id, latitude, longitude):
+    db = SessionLocal()
+    try:
+        prop = db.get(Property, property_id)
+        prop.latitude, prop.longitude = latitude, longitude
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_detail_matches_property_response(client):
+    seed_properties(1)
+    item = client.get(f"{API}/slug/villa-0").json()
+    # Every documented field; archived_at only on archived listings
+    assert set(item) == set(PropertyResponse.model_fields) - {"archived_at"}
+    assert PropertyResponse.model_validate(item).model_dump(mode="json", exclude={"archived_at"}) == item
+    assert list(item["images"][0]) == ["id", "url", "public_id", "caption", "order", "uploaded_at"]
+    assert (item["gmap_url"], item["directions_url"]) == (None, None)
+
+
+def test_list_items_match_list_response(client):
+    seed_properties(2)
+    items = client.get(f"{API}/").json()
+    assert list(items[0]) == list(LIST_FIELDS) == list(PropertyListResponse.model_fields)
+    assert PropertyListResponse.model_validate(items[0]).model_dump(mode="json") == items[0]
+    assert list(client.get(f"{API}/", params={"fields": "price,id"}).json()[0]) == ["id", "price"]
+
+
+def test_home_items_match_home_listing(client):
+    seed_properties(1)
+    snapshot = client.get(f"{API}/home").json()
+    items = snapshot["newest"]["SELL"]
+    assert list(items[0]) == list(HomeListing.model_fields)
+
+
+def test_map_links_follow_the_coordinates(client):
+    seed_properties(1)
+    set_location(1, 11.1085, 77.3411)
+    item = client.get(f"{API}/slug/villa-0").json()
+    assert item["gmap_url"] == "https://www.google.com/maps?q=11.1085,77.3411"
+    assert item["directions_url"] == "https://www.google.com/maps/dir/?api=1&destination=11.1085,77.3411"
+
+    # Unchanged coordinates reuse the cached links; moving the property builds new ones
+    hits = map_urls.cache_info().hits
+    client.get(f"{API}/slug/villa-0")
+    assert map_urls.cache_info().hits > hits
+    set_location(1, 11.2, 77.4)
+    assert client.get(f"{API}/slug/villa-0").json()["gmap_url"] == "https://www.google.com/maps?q=11.2,77.4"
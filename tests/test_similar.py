@@ -0,0 +1,95 @@
+# tests/test_similar.py
+import pytest
+
+from app.core.similar import SimilarityIndex, similarity_index
+from app.database import SessionLocal
+from app.models.property import Property, PropertyStatus, PropertyType
+
+API = "/api/v1/properties"
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(similarity_index, "loaded", False)
+
+
+def seed(*rows):
+    db = SessionLocal()
+    try:
+        for i, (property_type, price, bedrooms, lat) in enumerate(rows, start=1):
+            db.add(Property(id=i, title=f"Home {i}", slug=f"home-{i}", description="Home", price=price,
+                            property_type=property_type, area=1000 * bedrooms, bedrooms=bedrooms,
+                            latitude=lat, longitude=77.34 if lat else None))
+        db.commit()
+    finally:
+        db.close()
+
+
+def similar_ids(client, property_id, **params):
+    response = client.get(f"{API}/{property_id}/similar", params=params)
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+
+def test_ranks_by_features_and_keeps_to_type(client):
+    seed(
+        (PropertyType.SELL, 5_000_000, 2, 11.10),   # 1: query
+        (PropertyType.SELL, 5_200_000, 2, 11.11),   # 2: near twin
+        (PropertyType.SELL, 9_000_000, 4, 11.10),   # 3: bigger and pricier
+        (PropertyType.SELL, 5_100_000, 2, 11.20),   # 4: similar, ~11 km away
+        (PropertyType.RENT, 5_000_000, 2, 11.10),   # 5: other type
+    )
+    assert similar_ids(client, 1) == [2, 4, 3]
+    assert similar_ids(client, 1, limit=1) == [2]
+    assert client.get(f"{API}/99/similar").status_code == 404
+
+
+def test_index_follows_changes(client, admin_headers):
+    seed((PropertyType.SELL, 5_000_000, 2, 11.10), (PropertyType.SELL, 5_200_000, 2, 11.11),
+         (PropertyType.SELL, 9_000_000, 4, 11.10))
+    assert similar_ids(client, 1) == [2, 3]
+
+    client.put(f"{API}/2", json={"status": "SOLD"}, headers=admin_headers)
+    assert similar_ids(client, 1) == [3]
+    client.put(f"{API}/3", json={"price": 5_000_000, "bedrooms": 2, "area": 2000}, headers=admin_headers)
+    client.delete(f"{API}/3", headers=admin_headers)
+    assert similar_ids(client, 1) == []
+    # A sold property can still be the query
+    assert similar_ids(client, 2) == [1]
+
+
+def test_refresh_picks_up_rows_changed_elsewhere(database_url):
+    seed((PropertyType.SELL, 5_000_000, 2, 11.10))
+    index = SimilarityIndex(capacity=1)
+    db = SessionLocal()
+    try:
+        index.refresh(db)
+        assert index.similar(1, 5) == []
+
+        # Written by "another worker": no event reaches this index
+        db.add(Property(id=2, title="Home 2", slug="home-2", description="Home", price=5_100_000,
+                        property_type=PropertyType.SELL, area=2000, bedrooms=2))
+        db.add(Property(id=3, title="Home 3", slug="home-3", description="Home", price=5_100_000,
+                        property_type=PropertyType.SELL, area=2000, bedrooms=2, status=PropertyStatus.SOLD))
+        db.commit()
+        index.refresh(db, force=True)
+    finally:
+        db.close()
+    assert index.similar(1, 5) == [2]
+    assert 3 not in index.rows
+
+
+def test_listings_sold_elsewhere_are_never_suggested(client):
+    seed((PropertyType.SELL, 5_000_000, 2, 11.10), (PropertyType.SELL, 5_200_000, 2, 11.11),
+         (PropertyType.SELL, 9_000_000, 4, 11.10), (PropertyType.SELL, 9_500_000, 4, 11.10))
+    assert similar_ids(client, 1, limit=2) == [2, 3]
+
+    # Sold by "another worker" before this index refreshes
+    db = SessionLocal()
+    try:
+        db.query(Property).filter(Property.id == 2).update({"status": PropertyStatus.SOLD})
+        db.commit()
+    finally:
+        db.close()
+    assert similar_ids(client, 1, limit=2) == [3, 4]
+    assert 2 not in similarity_index.similar(1, 5)
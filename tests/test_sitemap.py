@@ -0,0 +1,123 @@
+# tests/test_sitemap.py
+import pytest
+
+from app.core.sitemap import sitemap
+from app.database import SessionLocal
+from app.models.property import Property, PropertyStatus, PropertyType
+
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    from app.config import get_settings
+
+    sitemap.clear()
+    monkeypatch.setenv("SITEMAP_SHARD_SIZE", "10")
+    monkeypatch.setenv("SITE_URL", "https://homes.example.com")
+    monkeypatch.setenv("SITEMAP_BASE_URL", "https://api.homes.example.com")
+    get_settings.cache_clear()
+    yield
+    sitemap.clear()
+
+
+def seed(count: int):
+    db = SessionLocal()
+    try:
+        for i in range(1, count + 1):
+            db.add(Property(id=i, title=f"Home {i}", slug=f"home-{i}", description="Home", price=1_000_000,
+                            property_type=PropertyType.SELL, area=1000,
+                            status=PropertyStatus.SOLD if i == 3 else PropertyStatus.AVAILABLE))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_index_lists_one_sitemap_per_shard(client):
+    seed(25)
+    response = client.get("/sitemap.xml")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/xml")
+    for shard in (0, 1, 2):
+        assert f"<loc>https://api.homes.example.com/sitemap-{shard}.xml</loc>" in response.text
+    assert "sitemap-3.xml" not in response.text
+    assert client.get("/sitemap-3.xml").status_code == 404
+
+
+def test_shards_are_streamed_then_cached(client, query_budget):
+    seed(25)
+    first = client.get("/sitemap-0.xml")
+    assert first.text.count("<url>") == 9  # ids 1-10 without the sold one
+    assert "<loc>https://homes.example.com/properties/home-1</loc>" in first.text
+    assert "home-3<" not in first.text
+
+    renders = sitemap.renders
+    with query_budget(0):
+        again = client.get("/sitemap-0.xml")
+    assert again.content == first.content
+    assert sitemap.renders == renders
+
+
+def test_updates_regenerate_only_the_touched_shard(client, admin_headers):
+    seed(25)
+    for shard in (0, 1, 2):
+        client.get(f"/sitemap-{shard}.xml")
+    renders = sitemap.renders
+
+    client.put("/api/v1/properties/15", json={"status": "SOLD"}, headers=admin_headers)
+    for shard in (0, 1, 2):
+        client.get(f"/sitemap-{shard}.xml")
+    assert sitemap.renders == renders + 1
+    assert "home-15<" not in client.get("/sitemap-1.xml").text
+
+
+def test_host_header_does_not_reach_the_sitemap(client, query_budget):
+    seed(5)
+    first = client.get("/sitemap.xml")
+    with query_budget(0):
+        spoofed = client.get("/sitemap.xml", headers={"Host": "evil.example.com"})
+    assert spoofed.content == first.content
+    assert "evil" not in spoofed.text
+
+
+@pytest.fixture
+def always_sync(monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setenv("SITEMAP_REFRESH_SECONDS", "0")
+    get_settings.cache_clear()
+
+
+def render_all(client, shards=(0, 1, 2)):
+    return {shard: client.get(f"/sitemap-{shard}.xml").text for shard in shards}
+
+
+def test_changes_from_other_workers_drop_only_their_shards(client, always_sync):
+    seed(25)
+    render_all(client)
+    renders = sitemap.renders
+
+    # Changed by another process: no event reaches this one. No sleep, so on
+    # SQLite the update shares its timestamp second with the seed
+    db = SessionLocal()
+    try:
+        db.query(Property).filter(Property.id == 2).update(
+            {"status": PropertyStatus.SOLD, "version": Property.version + 1})
+        db.delete(db.get(Property, 25))
+        db.commit()
+    finally:
+        db.close()
+    texts = render_all(client)
+    assert sitemap.renders == renders + 2
+    assert "home-2<" not in texts[0] and "home-25<" not in texts[2] and "home-15<" in texts[1]
+
+    render_all(client)
+    assert sitemap.renders == renders + 2
+
+
+def test_local_updates_regenerate_one_shard_with_syncing(client, admin_headers, always_sync):
+    seed(25)
+    render_all(client)
+    renders = sitemap.renders
+    client.put("/api/v1/properties/5", json={"price": 2_000_000}, headers=admin_headers)
+    render_all(client)
+    render_all(client)
+    assert sitemap.renders == renders + 1
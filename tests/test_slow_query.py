@@ -0,0 +1,87 @@
+# tests/test_slow_query.py
+import pytest
+
+from app.core.query_recorder import QueryRecorder
+from app.core.slow_query import explain, redact, slow_query_log
+
+
+@pytest.fixture
+def slow_log(client):
+    """Treat every statement as slow (after create_app has applied the settings)"""
+    saved = (slow_query_log.threshold, slow_query_log.samples_per_minute)
+    slow_query_log.clear()
+    slow_query_log.threshold = 0.0
+    yield slow_query_log
+    slow_query_log.threshold, slow_query_log.samples_per_minute = saved
+    slow_query_log.clear()
+
+
+def test_redact_keeps_numbers_and_hides_strings():
+    assert redact(("%villa%", 3, 2500000.0, None, True)) == ["<redacted str(7)>", 3, 2500000.0, None, True]
+    assert redact({"email": "a@b.co"}) == {"email": "<redacted str(6)>"}
+
+
+def test_slow_queries_are_sampled_with_route_and_plan(client, admin_headers, slow_log):
+    slow_log.samples_per_minute = 6000
+    client.get("/api/v1/properties/", params={"search": "villa", "min_bedrooms": 2})
+
+    response = client.get("/api/v1/admin/slow-queries", headers=admin_headers)
+    assert response.status_code == 200
+    listing = [s for s in response.json()["samples"] if s["route"] == "GET /api/v1/properties/"]
+    assert listing
+    sample = listing[0]
+    assert "FROM properties" in sample["statement"]
+    assert "<redacted str(7)>" in sample["parameters"]
+    assert 2 in sample["parameters"]
+    assert any("properties" in line for line in sample["plan"])
+
+
+def test_sampling_is_rate_limited(client, slow_log):
+    slow_log.samples_per_minute = 6  # burst of one
+    for _ in range(5):
+        client.get("/api/v1/properties/")
+    assert slow_log.slow >= 5
+    assert len(slow_log.samples) == 1
+    assert slow_log.suppressed == slow_log.slow - 1
+
+
+def test_slow_queries_require_admin(client):
+    assert client.get("/api/v1/admin/slow-queries").status_code == 401
+
+
+class FakeCursor:
+    def __init__(self):
+        self.connection = self
+        self.executed = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters):
+        self.executed.append(statement)
+
+    def fetchall(self):
+        return [("Seq Scan on properties",)]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("statement, prefix", [
+    ("SELECT id FROM properties", "EXPLAIN (ANALYZE, BUFFERS) "),
+    ("WITH moved AS (DELETE FROM properties RETURNING id) SELECT id FROM moved", "EXPLAIN "),
+    ("UPDATE properties SET price = 1", "EXPLAIN "),
+])
+def test_only_plain_selects_are_analyzed_on_postgres(statement, prefix):
+    cursor = FakeCursor()
+    assert explain(cursor, "postgresql", statement, ()) == ["Seq Scan on properties"]
+    assert cursor.executed == [prefix + statement]
+
+
+def test_statements_are_timed_once_for_every_feature(client, slow_log):
+    slow_log.samples_per_minute = 6000
+    with QueryRecorder() as recorder:
+        client.get("/api/v1/properties/")
+    durations = [round(query.seconds * 1000, 2) for query in recorder.queries]
+    sampled = [sample.duration_ms for sample in slow_log.samples if sample.route == "GET /api/v1/properties/"]
+    assert sampled and sampled == durations[-len(sampled):]